@@ -0,0 +1 @@
+"""Shannon performance benchmarks"""
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Scale Benchmarks
+
+Sweeps waves x tasks x concurrency and measures, for each case:
+
+- throughput: tasks per second of a run whose tasks do no work (pure
+  orchestration overhead)
+- HALT latency p50/p99: request-to-quiesce time over repeated HALTs
+- resume cost: time from resume() until the next task starts
+- rollback cost: rollback to the previous and to the middle snapshot
+- snapshot memory: bytes held by retained snapshots after the run
+- get_status cost: full and incremental (no changes) status
+
+It also checks that default tracing (wave-level spans) costs at most
+TRACING_OVERHEAD_LIMIT of a simulated run whose tasks do no work.
+
+Results are written as JSON and compared against a stored baseline;
+a metric that is worse than the baseline by more than the threshold is a
+regression and the script exits with status 1. Everything runs in-process
+on the standard library event loop, so no network or services are needed.
+
+Usage:
+    python -m benchmarks.orchestrator_bench --quick
+    python -m benchmarks.orchestrator_bench --output results.json
+    python -m benchmarks.orchestrator_bench --update-baseline
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from orchestration.orchestrator import Orchestrator, Wave
+from orchestration.executors import AsyncTaskExecutor
+from orchestration.simulation import DurationModel, simulate, synthetic_plan
+from orchestration.tracing import TraceRecorder
+from orchestration.stats import percentile
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.5
+
+FULL_SWEEP = {"waves": (10, 100, 1000), "tasks": (1, 10, 100), "concurrency": (1, 8)}
+QUICK_SWEEP = {"waves": (10, 100), "tasks": (1, 10), "concurrency": (1, 8)}
+
+# Default tracing may add at most this fraction to run time
+TRACING_OVERHEAD_LIMIT = 0.05
+
+# Metric name -> True if higher is better
+METRICS = {
+    "throughput_tasks_per_s": True,
+    "halt_latency_p50_ms": False,
+    "halt_latency_p99_ms": False,
+    "resume_ms": False,
+    "rollback_previous_ms": False,
+    "rollback_middle_ms": False,
+    "snapshot_bytes": False,
+    "status_full_ms": False,
+    "status_incremental_ms": False,
+}
+
+# Differences below this many milliseconds are timer noise, not regressions
+NOISE_FLOOR_MS = 1.0
+
+HALTS_PER_RUN = 20
+STATUS_CALLS = 20
+
+
+class _TaskProbe:
+    """No-op task handler counting completions and timing the first start after a mark"""
+
+    def __init__(self):
+        self.completed = 0
+        self.marked_at: Optional[float] = None
+        self.first_start: Optional[float] = None
+
+    def mark(self) -> None:
+        self.marked_at = time.perf_counter()
+        self.first_start = None
+
+    async def handler(self, task: str) -> None:
+        if self.first_start is None and self.marked_at is not None:
+            self.first_start = time.perf_counter()
+        await asyncio.sleep(0)
+        self.completed += 1
+
+
+def _plan(waves: int, tasks: int) -> List[Wave]:
+    """Independent waves, so wave concurrency is exercised"""
+    return [Wave(f"wave{i}", f"agent{i % 4}", [f"task{i}.{j}" for j in range(tasks)], depends_on=[])
+            for i in range(waves)]
+
+
+def _orchestrator(probe: _TaskProbe, waves: int, tasks: int, concurrency: int) -> Orchestrator:
+    orchestrator = Orchestrator(
+        max_concurrent_waves=concurrency,
+        executors={"async": AsyncTaskExecutor(probe.handler, max_concurrency=concurrency)}
+    )
+    orchestrator.add_waves(_plan(waves, tasks))
+    return orchestrator
+
+
+async def _measure_throughput(waves: int, tasks: int, concurrency: int) -> float:
+    orchestrator = _orchestrator(_TaskProbe(), waves, tasks, concurrency)
+    started = time.perf_counter()
+    await orchestrator.execute()
+    return waves * tasks / (time.perf_counter() - started)
+
+
+async def _measure_halts(waves: int, tasks: int, concurrency: int) -> Dict[str, Any]:
+    """Run with evenly spaced HALT/RESUME cycles, then probe rollback and status"""
+    probe = _TaskProbe()
+    orchestrator = _orchestrator(probe, waves, tasks, concurrency)
+    # Completed tasks between HALTs, spreading them over the run
+    step = max(1, waves * tasks // HALTS_PER_RUN)
+    resume_ms: List[float] = []
+
+    execution = asyncio.create_task(orchestrator.execute())
+    while True:
+        target = probe.completed + step
+        while probe.completed < target and not execution.done():
+            await asyncio.sleep(0)
+        if execution.done():
+            break
+        orchestrator.halt()
+        await execution
+        if probe.first_start is not None:
+            resume_ms.append((probe.first_start - probe.marked_at) * 1000)
+        if orchestrator.state.value != "halted":
+            break
+        probe.mark()
+        execution = asyncio.create_task(orchestrator.resume())
+    await execution
+
+    snapshot_bytes = orchestrator.state_manager.get_memory_usage()
+
+    started = time.perf_counter()
+    for _ in range(STATUS_CALLS):
+        status = orchestrator.get_status()
+    status_full_ms = (time.perf_counter() - started) * 1000 / STATUS_CALLS
+    started = time.perf_counter()
+    for _ in range(STATUS_CALLS):
+        orchestrator.get_status(since_version=status["version"])
+    status_incremental_ms = (time.perf_counter() - started) * 1000 / STATUS_CALLS
+
+    rollback_ms: Dict[str, Optional[float]] = {"previous": None, "middle": None}
+    snapshots = orchestrator.state_manager.get_snapshot_count()
+    if snapshots >= 3:
+        started = time.perf_counter()
+        orchestrator.rollback(1)
+        rollback_ms["previous"] = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        orchestrator.rollback((snapshots - 1) // 2)
+        rollback_ms["middle"] = (time.perf_counter() - started) * 1000
+
+    latencies = list(orchestrator.halt_latencies)
+    return {
+        "halts": len(latencies),
+        "halt_latency_p50_ms": percentile(latencies, 50),
+        "halt_latency_p99_ms": percentile(latencies, 99),
+        "resume_ms": percentile(resume_ms, 50),
+        "rollback_previous_ms": rollback_ms["previous"],
+        "rollback_middle_ms": rollback_ms["middle"],
+        "snapshot_bytes": snapshot_bytes,
+        "status_full_ms": status_full_ms,
+        "status_incremental_ms": status_incremental_ms,
+    }
+
+
+def run_case(waves: int, tasks: int, concurrency: int, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Benchmark one configuration.
+
+    Timings take the best of repeat runs (least disturbed by other load);
+    HALT latency percentiles take the median run.
+    """
+    runs = []
+    for _ in range(repeat):
+        throughput = asyncio.run(_measure_throughput(waves, tasks, concurrency))
+        result = asyncio.run(_measure_halts(waves, tasks, concurrency))
+        result["throughput_tasks_per_s"] = throughput
+        runs.append(result)
+
+    case: Dict[str, Any] = {"waves": waves, "tasks": tasks, "concurrency": concurrency,
+                            "halts": runs[0]["halts"]}
+    for metric, higher_is_better in METRICS.items():
+        values = [run[metric] for run in runs if run[metric] is not None]
+        if not values:
+            case[metric] = None
+        elif metric.startswith("halt_latency"):
+            case[metric] = percentile(values, 50)
+        else:
+            case[metric] = max(values) if higher_is_better else min(values)
+    return case
+
+
+def case_key(case: Dict[str, Any]) -> str:
+    return f"waves={case['waves']},tasks={case['tasks']},concurrency={case['concurrency']}"
+
+
+def run_sweep(sweep: Dict[str, Sequence[int]], repeat: int = 3,
+              log=print) -> Dict[str, Any]:
+    """Run every combination in sweep and return the results document"""
+    cases = []
+    for waves, tasks, concurrency in itertools.product(sweep["waves"], sweep["tasks"],
+                                                       sweep["concurrency"]):
+        case = run_case(waves, tasks, concurrency, repeat)
+        log(f"{case_key(case):40} {case['throughput_tasks_per_s']:>12,.0f} tasks/s  "
+            f"HALT p99 {_format_ms(case['halt_latency_p99_ms'])}  "
+            f"status {_format_ms(case['status_full_ms'])}")
+        cases.append(case)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "cases": cases,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Metrics worse than the baseline by more than threshold (a fraction).
+
+    Only cases and metrics present in both documents are compared;
+    millisecond differences below NOISE_FLOOR_MS are ignored.
+    """
+    baseline_cases = {case_key(case): case for case in baseline.get("cases", [])}
+    regressions = []
+    for case in results["cases"]:
+        reference = baseline_cases.get(case_key(case))
+        if reference is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            value, expected = case.get(metric), reference.get(metric)
+            if value is None or expected is None or expected == 0:
+                continue
+            if metric.endswith("_ms") and abs(value - expected) < NOISE_FLOOR_MS:
+                continue
+            change = (expected - value) / expected if higher_is_better else (value - expected) / expected
+            if change > threshold:
+                regressions.append({"case": case_key(case), "metric": metric,
+                                    "baseline": expected, "value": value,
+                                    "change": round(change, 3)})
+    return regressions
+
+
+def tracing_overhead(task_spans: bool = False, waves: int = 200, tasks: int = 100,
+                     pairs: int = 11) -> float:
+    """
+    Relative run-time cost of a TraceRecorder.
+
+    Runs a simulated plan of no-op tasks (every task is pure framework
+    overhead, the worst case) with and without a tracer, alternating, and
+    returns the median ratio of process CPU times minus one. CPU time and
+    pairing keep other processes' load out of the measurement.
+    """
+    def run(tracer: Optional[TraceRecorder]) -> float:
+        plan = synthetic_plan(waves, tasks, independent=True)
+        gc.collect()
+        started = time.process_time()
+        simulate(plan, DurationModel.constant(0.0), task_concurrency=8,
+                 max_concurrent_waves=8, tracer=tracer)
+        return time.process_time() - started
+
+    ratios = []
+    for _ in range(pairs):
+        untraced = run(None)
+        ratios.append(run(TraceRecorder(task_spans=task_spans)) / untraced - 1)
+    return statistics.median(ratios)
+
+
+def _format_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}ms"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Shannon orchestrator scale benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Run the reduced sweep")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (default 3)")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown before failing (default 0.5)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write the results to the baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    results = run_sweep(QUICK_SWEEP if args.quick else FULL_SWEEP, args.repeat)
+    results["tracing_overhead"] = tracing_overhead()
+    results["task_tracing_overhead"] = tracing_overhead(task_spans=True)
+    print(f"Tracing overhead: {results['tracing_overhead']:+.1%} "
+          f"(limit {TRACING_OVERHEAD_LIMIT:.0%}), with task spans "
+          f"{results['task_tracing_overhead']:+.1%}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    if results["tracing_overhead"] > TRACING_OVERHEAD_LIMIT:
+        print(f"\nTracing overhead {results['tracing_overhead']:.1%} exceeds "
+              f"{TRACING_OVERHEAD_LIMIT:.0%}")
+        return 1
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for r in regressions:
+            print(f"  {r['case']:40} {r['metric']:24} {r['baseline']:.4g} -> {r['value']:.4g} "
+                  f"(+{r['change']:.0%})")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
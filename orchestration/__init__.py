@@ -1,6 +1,20 @@
 """Shannon Orchestration Module"""
 
 from .orchestrator import Orchestrator, Wave, ExecutionState
-from .state_manager import StateManager, StateSnapshot
+from .state_manager import StateManager, StateSnapshot, WaveTable
+from .scheduler import WaveScheduler
+from .durations import DurationHistory
+from .retry import RetryPolicy
+from .tracing import TraceRecorder
+from .journal import SnapshotJournal
+from .executors import (
+    TaskExecutor, AsyncTaskExecutor, ThreadPoolTaskExecutor, ProcessPoolTaskExecutor
+)
+from .sharding import ShardedTaskExecutor
+from .simulation import VirtualClockEventLoop, DurationModel, simulate
 
-__all__ = ["Orchestrator", "Wave", "ExecutionState", "StateManager", "StateSnapshot"]
+__all__ = ["Orchestrator", "Wave", "ExecutionState", "StateManager", "StateSnapshot",
+           "WaveTable", "SnapshotJournal", "WaveScheduler", "DurationHistory", "RetryPolicy",
+           "TraceRecorder", "TaskExecutor", "AsyncTaskExecutor", "ThreadPoolTaskExecutor",
+           "ProcessPoolTaskExecutor", "ShardedTaskExecutor", "VirtualClockEventLoop",
+           "DurationModel", "simulate"]
@@ -0,0 +1,266 @@
+"""
+Confidence Calibration - Per-category auto-approve thresholds
+
+Fits how often humans pick an option against the confidence it was given,
+per decision category (the "category" context entry), and suggests the
+lowest auto-approve threshold whose error rate stays within a target: the
+share of decisions at or above it where the top option is not what a human
+chose. Lower thresholds mean more auto-approvals and fewer blocking waits.
+
+Offline: fit() over DecisionEngine.iter_history() (archive included) and
+apply() the thresholds. Online: pass the calibrator to DecisionEngine,
+which feeds it every human resolution; it refits every refit_every samples.
+
+Only human answers are learned from. Decisions auto-approved at the current
+threshold never reach a human, so by default refits can lower a threshold
+but not raise it. With holdout set, the engine sends that random share of
+them to humans instead (Decision.held_out); held-out answers are weighted
+by 1 / holdout, so refits see the confidence range above the threshold as
+often as it occurs and can raise a threshold too. The price is extra
+blocking human waits: holdout x the decisions that would have been
+auto-approved, including those at the default 0.95 threshold.
+
+Requires NumPy.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+import logging
+import random
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from .decision_engine import Decision, DecisionEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CalibrationCurve:
+    """Reliability curve: observed pick rate per confidence bin"""
+    bin_edges: "np.ndarray"
+    mean_confidence: "np.ndarray"  # NaN for empty bins
+    pick_rate: "np.ndarray"  # share of options in the bin a human picked
+    counts: "np.ndarray"
+
+    @property
+    def expected_calibration_error(self) -> float:
+        """Sample-weighted mean gap between confidence and pick rate"""
+        total = self.counts.sum()
+        if not total:
+            return 0.0
+        filled = self.counts > 0
+        gaps = np.abs(self.mean_confidence[filled] - self.pick_rate[filled])
+        return float((gaps * self.counts[filled]).sum() / total)
+
+
+@dataclass
+class ThresholdSuggestion:
+    """Suggested auto-approve threshold for one category"""
+    category: str
+    threshold: Optional[float]  # None: too few samples or target unreachable
+    samples: int
+    auto_approvals: int = 0  # samples at or above threshold
+    error_rate: float = 0.0  # among those auto-approvals
+
+    @property
+    def auto_approve_rate(self) -> float:
+        return self.auto_approvals / self.samples if self.samples else 0.0
+
+
+def suggest_threshold(confidences: "np.ndarray", correct: "np.ndarray",
+                      target_error_rate: float,
+                      weights: Optional["np.ndarray"] = None) -> Tuple[Optional[float], int, float]:
+    """
+    Lowest threshold whose auto-approvals stay within target_error_rate.
+
+    Args:
+        confidences: Top option confidence per decision
+        correct: Whether the human picked that top option
+        weights: Decisions each sample stands for in the error rate
+            (default 1 each)
+
+    Returns:
+        (threshold, auto_approvals, error_rate); threshold is None when no
+        threshold meets the target
+    """
+    order = np.argsort(-confidences, kind="stable")
+    ranked = confidences[order]
+    weights = np.ones(len(ranked)) if weights is None else weights[order]
+    errors = np.cumsum(weights * ~correct[order])
+    approvals = np.arange(1, len(ranked) + 1)
+    rates = errors / np.cumsum(weights)
+    # A threshold admits every tied confidence, so only cut after a tie group
+    cut = np.append(ranked[1:] != ranked[:-1], True)
+    feasible = np.flatnonzero(cut & (rates <= target_error_rate))
+    if not len(feasible):
+        return None, 0, 0.0
+    k = feasible[-1]
+    return float(ranked[k]), int(approvals[k]), float(rates[k])
+
+
+class ConfidenceCalibrator:
+    """
+    Learns per-category auto-approve thresholds from human answers.
+
+    Samples per category are kept in a sliding window, so online
+    calibration follows drift in how confidences are assigned.
+    """
+
+    def __init__(self, target_error_rate: float = 0.05, min_samples: int = 30,
+                 bins: int = 10, window: int = 10000, refit_every: Optional[int] = None,
+                 holdout: float = 0.0, rng: Optional[random.Random] = None):
+        """
+        Args:
+            target_error_rate: Acceptable share of auto-approvals that a
+                human would have answered differently
+            min_samples: Human answers needed before a category gets a threshold
+            bins: Confidence bins of calibration curves
+            window: Most recent decisions kept per category
+            refit_every: Online mode: refit after this many observed
+                decisions (None = only when fit() is called)
+            holdout: Share of decisions reaching the threshold that the
+                engine sends to a human anyway, so refits can raise
+                thresholds (0 = none). Each held-out decision is a human
+                wait that would otherwise have been auto-approved.
+            rng: Random source of the holdout (tests)
+        """
+        if np is None:
+            raise ImportError("ConfidenceCalibrator requires numpy (pip install numpy)")
+        if not 0 <= target_error_rate < 1:
+            raise ValueError("target_error_rate must be in [0, 1)")
+        if min_samples < 1:
+            raise ValueError("min_samples must be at least 1")
+        if bins < 1 or window < 1:
+            raise ValueError("bins and window must be at least 1")
+        if refit_every is not None and refit_every < 1:
+            raise ValueError("refit_every must be at least 1")
+        if not 0 <= holdout < 1:
+            raise ValueError("holdout must be in [0, 1)")
+        self.target_error_rate = target_error_rate
+        self.min_samples = min_samples
+        self.bins = bins
+        self.window = window
+        self.refit_every = refit_every
+        self.holdout = holdout
+        self._random = (rng or random.Random()).random
+        # Per category: (top confidence, top picked, weight) per decision and
+        # (option confidences, picked flags) per decision for curves
+        self._top: Dict[str, Deque[Tuple[float, bool, float]]] = {}
+        self._options: Dict[str, Deque[Tuple[Tuple[float, ...], Tuple[bool, ...]]]] = {}
+        self._since_fit = 0
+        self.suggestions: Dict[str, ThresholdSuggestion] = {}
+
+    @staticmethod
+    def is_human_answer(decision: Decision) -> bool:
+        """Whether decision was resolved by a human (not auto, cache or timeout)"""
+        if decision.status == "approved":
+            return not decision.auto_approved and \
+                decision.approved_by not in DecisionEngine.NON_HUMAN_APPROVERS
+        return decision.status == "rejected" and decision.context.get("rejection_reason") != "timeout"
+
+    def hold_out(self) -> bool:
+        """Whether to send a decision reaching its threshold to a human"""
+        return self.holdout > 0 and self._random() < self.holdout
+
+    def observe(self, decision: Decision) -> bool:
+        """
+        Record a resolved decision (non-human resolutions are ignored).
+
+        Returns:
+            Whether this observation triggered a refit
+        """
+        if not decision.options or not self.is_human_answer(decision):
+            return False
+        category = DecisionEngine.category_of(decision.context)
+        if category not in self._top:
+            self._top[category] = deque(maxlen=self.window)
+            self._options[category] = deque(maxlen=self.window)
+        picked_id = decision.selected_option_id if decision.status == "approved" else None
+        top = max(decision.options, key=lambda opt: opt.confidence)
+        weight = 1 / self.holdout if decision.held_out and self.holdout else 1.0
+        self._top[category].append((top.confidence, top.id == picked_id, weight))
+        self._options[category].append((
+            tuple(opt.confidence for opt in decision.options),
+            tuple(opt.id == picked_id for opt in decision.options)
+        ))
+        self._since_fit += 1
+        if self.refit_every is not None and self._since_fit >= self.refit_every:
+            self.fit()
+            return True
+        return False
+
+    def fit(self, history: Optional[Iterable[Decision]] = None) -> Dict[str, ThresholdSuggestion]:
+        """
+        Refit thresholds, first observing history if given.
+
+        Args:
+            history: Resolved decisions, e.g. DecisionEngine.iter_history()
+        """
+        if history is not None:
+            refit_every, self.refit_every = self.refit_every, None
+            try:
+                for decision in history:
+                    self.observe(decision)
+            finally:
+                self.refit_every = refit_every
+        self.suggestions = {category: self._suggest(category) for category in self._top}
+        self._since_fit = 0
+        for suggestion in self.suggestions.values():
+            logger.info(f"Calibrated '{suggestion.category}': threshold {suggestion.threshold} "
+                        f"({suggestion.auto_approvals}/{suggestion.samples} auto, "
+                        f"error {suggestion.error_rate:.3f})")
+        return self.suggestions
+
+    def _suggest(self, category: str) -> ThresholdSuggestion:
+        samples = self._top[category]
+        if len(samples) < self.min_samples:
+            return ThresholdSuggestion(category, None, len(samples))
+        confidences = np.fromiter((s[0] for s in samples), dtype=float, count=len(samples))
+        correct = np.fromiter((s[1] for s in samples), dtype=bool, count=len(samples))
+        weights = np.fromiter((s[2] for s in samples), dtype=float, count=len(samples))
+        threshold, approvals, error_rate = suggest_threshold(confidences, correct,
+                                                             self.target_error_rate, weights)
+        return ThresholdSuggestion(category, threshold, len(samples), approvals, error_rate)
+
+    def thresholds(self) -> Dict[str, float]:
+        """Fitted threshold per category (categories without one are left out)"""
+        return {category: s.threshold for category, s in self.suggestions.items()
+                if s.threshold is not None}
+
+    def apply(self, engine: DecisionEngine) -> Dict[str, float]:
+        """
+        Install fitted thresholds on engine; returns them.
+
+        Categories whose refit found no threshold go back to the default.
+        """
+        for category, suggestion in self.suggestions.items():
+            if suggestion.threshold is None:
+                engine.thresholds.pop(category, None)
+        thresholds = self.thresholds()
+        engine.thresholds.update(thresholds)
+        return thresholds
+
+    def curve(self, category: str = DecisionEngine.DEFAULT_CATEGORY) -> CalibrationCurve:
+        """Reliability curve of every option confidence in category"""
+        entries = self._options.get(category, ())
+        confidences = np.fromiter((c for conf, _ in entries for c in conf), dtype=float)
+        picked = np.fromiter((p for _, flags in entries for p in flags), dtype=bool)
+        edges = np.linspace(0.0, 1.0, self.bins + 1)
+        index = np.clip(np.digitize(confidences, edges[1:-1]), 0, self.bins - 1)
+        counts = np.bincount(index, minlength=self.bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_confidence = np.bincount(index, weights=confidences, minlength=self.bins) / counts
+            pick_rate = np.bincount(index, weights=picked, minlength=self.bins) / counts
+        return CalibrationCurve(edges, mean_confidence, pick_rate, counts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "categories": {category: len(samples) for category, samples in self._top.items()},
+            "thresholds": self.thresholds(),
+            "pending_observations": self._since_fit
+        }
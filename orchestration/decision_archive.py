@@ -0,0 +1,152 @@
+"""
+Decision Archive - On-disk history of resolved decisions
+
+Resolved decisions that age out of DecisionEngine memory are appended to a
+SQLite database, indexed by status, creation time and approver. Queries
+page through the archive with a cursor (the decision sequence number), so
+reading history never loads it all into memory.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import logging
+
+from .decision_engine import Decision, DecisionOption
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    sequence INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    approved_by TEXT,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS decisions_status ON decisions (status, sequence);
+CREATE INDEX IF NOT EXISTS decisions_created_at ON decisions (created_at);
+CREATE INDEX IF NOT EXISTS decisions_approved_by ON decisions (approved_by, sequence);
+"""
+
+
+def decision_to_record(decision: Decision) -> Dict[str, Any]:
+    """JSON-compatible dict of a decision (shallow; dataclasses.asdict deep-copies)"""
+    record = dict(vars(decision))
+    record["options"] = [vars(option) for option in decision.options]
+    record["created_at"] = decision.created_at.isoformat()
+    record["approved_at"] = decision.approved_at.isoformat() if decision.approved_at else None
+    return record
+
+
+def decision_from_record(record: Dict[str, Any]) -> Decision:
+    """Rebuild a decision from decision_to_record output"""
+    record = dict(record)
+    record["options"] = [DecisionOption(**option) for option in record["options"]]
+    record["created_at"] = datetime.fromisoformat(record["created_at"])
+    if record.get("approved_at"):
+        record["approved_at"] = datetime.fromisoformat(record["approved_at"])
+    return Decision(**record)
+
+
+class DecisionArchive:
+    """
+    SQLite store of resolved decisions.
+
+    Use ":memory:" as path for a throwaway archive (tests).
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        # WAL with NORMAL sync: appends do not wait for an fsync per batch
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def append(self, decisions: Iterable[Decision]) -> int:
+        """
+        Archive decisions in one transaction; returns the number written.
+
+        Context values JSON cannot represent are stored as their str();
+        decisions that still cannot be encoded (e.g. a context containing
+        itself) are logged and skipped.
+        """
+        rows = []
+        for d in decisions:
+            try:
+                record = json.dumps(decision_to_record(d), separators=(",", ":"), default=str)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Not archiving decision {d.id}: {e}")
+                continue
+            rows.append((d.sequence, d.id, d.status, d.created_at.timestamp(), d.approved_by, record))
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO decisions "
+                "(sequence, id, status, created_at, approved_by, record) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+        return len(rows)
+
+    def get(self, decision_id: str) -> Optional[Decision]:
+        row = self._db.execute("SELECT record FROM decisions WHERE id = ?", (decision_id,)).fetchone()
+        return decision_from_record(json.loads(row[0])) if row else None
+
+    def query(self, status: Optional[str] = None, approved_by: Optional[str] = None,
+              since: Optional[datetime] = None, until: Optional[datetime] = None,
+              after: Optional[int] = None, limit: int = 100) -> List[Decision]:
+        """
+        Archived decisions in sequence order.
+
+        Args:
+            status: Only decisions with this status
+            approved_by: Only decisions resolved by this approver
+            since: Only decisions created at or after this time
+            until: Only decisions created before this time
+            after: Only decisions with a sequence above this (page cursor)
+            limit: Maximum decisions returned
+        """
+        sql, params = self._where(status, approved_by, since, until, after)
+        rows = self._db.execute(f"SELECT record FROM decisions{sql} ORDER BY sequence LIMIT ?",
+                                (*params, limit)).fetchall()
+        return [decision_from_record(json.loads(row[0])) for row in rows]
+
+    def count(self, status: Optional[str] = None, approved_by: Optional[str] = None,
+              since: Optional[datetime] = None, until: Optional[datetime] = None) -> int:
+        sql, params = self._where(status, approved_by, since, until, None)
+        return self._db.execute(f"SELECT COUNT(*) FROM decisions{sql}", params).fetchone()[0]
+
+    def max_sequence(self) -> int:
+        """Highest archived sequence number (0 when empty)"""
+        return self._db.execute("SELECT COALESCE(MAX(sequence), 0) FROM decisions").fetchone()[0]
+
+    @staticmethod
+    def _where(status: Optional[str], approved_by: Optional[str], since: Optional[datetime],
+               until: Optional[datetime], after: Optional[int]) -> Tuple[str, Tuple[Any, ...]]:
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if approved_by is not None:
+            clauses.append("approved_by = ?")
+            params.append(approved_by)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until.timestamp())
+        if after is not None:
+            clauses.append("sequence > ?")
+            params.append(after)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def close(self) -> None:
+        self._db.close()
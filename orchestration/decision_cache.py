@@ -0,0 +1,103 @@
+"""
+Decision Cache - Reuse prior human answers for repeated questions
+
+Decisions are fingerprinted from the question, the option ids and labels,
+and selected context keys. When a human approves a decision, the chosen
+option is remembered under its fingerprint; a later request with the same
+fingerprint is auto-resolved from that answer (flagged from_cache on the
+Decision) instead of waiting for a human again.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+class CachedAnswer(NamedTuple):
+    """A remembered human choice"""
+    option_id: str
+    decision_id: str  # decision the answer came from
+    stored_at: float
+
+
+class DecisionCache:
+    """
+    LRU cache of human answers keyed by decision fingerprint.
+
+    Entries older than ttl seconds are treated as missing and dropped.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None,
+                 context_keys: Iterable[str] = (), clock: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            max_entries: Answers remembered; least recently used are evicted
+            ttl: Seconds an answer stays valid (None = until evicted)
+            context_keys: Context entries that distinguish otherwise equal
+                questions (e.g. "wave_id", "environment")
+            clock: Time source for ttl (defaults to time.monotonic)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.context_keys = tuple(sorted(context_keys))
+        self._clock = clock or time.monotonic
+        self._entries: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, question: str, options: List[Any],
+                    context: Optional[Dict[str, Any]] = None) -> str:
+        """Canonical hash of the question, option ids/labels and selected context"""
+        context = context or {}
+        canonical = json.dumps(
+            [" ".join(question.split()),
+             sorted((option.id, option.label) for option in options),
+             [[key, context.get(key)] for key in self.context_keys]],
+            separators=(",", ":"), sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def lookup(self, fingerprint: str) -> Optional[CachedAnswer]:
+        """Remembered answer for fingerprint, or None"""
+        answer = self._entries.get(fingerprint)
+        if answer is not None and self.ttl is not None \
+                and self._clock() - answer.stored_at > self.ttl:
+            del self._entries[fingerprint]
+            answer = None
+        if answer is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(fingerprint)
+        self.hits += 1
+        return answer
+
+    def store(self, fingerprint: str, option_id: str, decision_id: str) -> None:
+        """Remember a human answer"""
+        self._entries[fingerprint] = CachedAnswer(option_id, decision_id, self._clock())
+        self._entries.move_to_end(fingerprint)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, fingerprint: str) -> bool:
+        """Forget one answer; returns whether it was cached"""
+        return self._entries.pop(fingerprint, None) is not None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
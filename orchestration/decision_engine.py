@@ -4,10 +4,23 @@ Decision Engine - Human-in-the-Loop Decision Making
 Enables Shannon to request decisions from humans during execution.
 Auto-approves high-confidence decisions (>= 0.95) to maintain flow.
 """
+import asyncio
+import heapq
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, Mapping, Optional, Tuple
 from datetime import datetime
 import uuid
+import logging
+
+from .metrics import DecisionMetrics
+
+if TYPE_CHECKING:
+    from .decision_archive import DecisionArchive
+    from .decision_cache import DecisionCache, CachedAnswer
+    from .calibration import ConfidenceCalibrator
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -35,6 +48,10 @@ class Decision:
     created_at: datetime = field(default_factory=datetime.now)
     approved_at: Optional[datetime] = None
     approved_by: Optional[str] = None  # "auto" or user identifier
+    sequence: int = 0  # creation order, the history cursor
+    from_cache: bool = False  # audit: resolved from a prior human answer
+    cached_from: Optional[str] = None  # decision whose answer was reused
+    held_out: bool = False  # reached the threshold but was sent to a human (calibration)
 
 
 class DecisionEngine:
@@ -43,16 +60,65 @@ class DecisionEngine:
 
     Features:
     - Request decisions with multiple options
-    - Auto-approve high confidence decisions (>= 0.95)
+    - Request and approve decisions in batches, all-or-nothing
+    - Auto-approve high confidence decisions (>= 0.95, or a calibrated
+      per-category threshold), optionally holding out a sample for
+      humans while calibrating
+    - Optionally auto-resolve repeated questions from cached human answers
     - Track pending decisions
-    - Maintain decision history
+    - Await pending decisions (resolved by approve/reject, no polling)
+    - Maintain decision history, optionally bounded in memory with older
+      resolved decisions archived to disk
+    - Track time-to-decision, auto-approve ratio, rejection rate and
+      pending depth in fixed memory (decision_metrics)
     """
 
     AUTO_APPROVE_THRESHOLD = 0.95
-
-    def __init__(self):
+    ARCHIVE_BATCH = 256
+    # Approvers whose answers are not reused by the cache
+    NON_HUMAN_APPROVERS = ("auto", "cache", "fallback")
+    # Context entry naming the decision category (per-category thresholds)
+    CATEGORY_KEY = "category"
+    DEFAULT_CATEGORY = "default"
+
+    def __init__(self, max_resolved: Optional[int] = None,
+                 archive: Optional["DecisionArchive"] = None,
+                 cache: Optional["DecisionCache"] = None,
+                 calibrator: Optional["ConfidenceCalibrator"] = None,
+                 metrics: Optional[DecisionMetrics] = None):
+        """
+        Args:
+            max_resolved: Resolved decisions kept in memory; older ones move
+                to the archive (or are forgotten without one). None keeps
+                every decision in memory.
+            archive: DecisionArchive receiving decisions that age out
+            cache: DecisionCache of human answers; repeated questions are
+                approved from it without waiting for a human
+            calibrator: ConfidenceCalibrator fed every human resolution;
+                its refits replace the per-category thresholds, and its
+                (opt-in) holdout share of decisions at the threshold goes
+                to humans
+            metrics: DecisionMetrics to record into (e.g. on a shared
+                registry). Defaults to a private one.
+        """
+        if max_resolved is not None and max_resolved < 0:
+            raise ValueError("max_resolved must not be negative")
         self.decisions: Dict[str, Decision] = {}
         self.pending_decisions: Dict[str, Decision] = {}
+        # Resolution future per pending decision, set by approve/reject
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self.max_resolved = max_resolved
+        self.archive = archive
+        # Resolved decision ids, oldest first (only tracked with max_resolved)
+        self._resolved: "OrderedDict[str, None]" = OrderedDict()
+        self._archive_buffer: List[Decision] = []
+        self._sequence = archive.max_sequence() if archive is not None else 0
+        self.cache = cache
+        self.calibrator = calibrator
+        # Auto-approve threshold per category (others use AUTO_APPROVE_THRESHOLD)
+        self.thresholds: Dict[str, float] = {}
+        self.metrics = metrics or DecisionMetrics()
+        self.metrics.bind(self)
 
     async def request_decision(
         self,
@@ -63,7 +129,11 @@ class DecisionEngine:
         """
         Request a decision from the human operator.
 
-        Auto-approves if any option has confidence >= 0.95.
+        Auto-approves if any option reaches the category's threshold
+        (threshold_for), or from the cache if a human already answered the
+        same question. With a calibrator whose holdout is set, that random
+        share of decisions reaching the threshold stays pending (held_out)
+        so calibration keeps seeing human answers above the threshold.
         Otherwise, creates pending decision for human approval.
 
         Args:
@@ -74,12 +144,17 @@ class DecisionEngine:
         Returns:
             Decision object (may be auto-approved or pending)
         """
+        if not options:
+            raise ValueError("Decision needs at least one option")
         decision_id = str(uuid.uuid4())
+        self._sequence += 1
 
         # Check for high-confidence option (auto-approve)
         highest_confidence_option = max(options, key=lambda opt: opt.confidence)
+        confident = highest_confidence_option.confidence >= self.threshold_for(context)
+        held_out = confident and self.calibrator is not None and self.calibrator.hold_out()
 
-        if highest_confidence_option.confidence >= self.AUTO_APPROVE_THRESHOLD:
+        if confident and not held_out:
             # Auto-approve
             decision = Decision(
                 id=decision_id,
@@ -90,7 +165,24 @@ class DecisionEngine:
                 auto_approved=True,
                 context=context or {},
                 approved_at=datetime.now(),
-                approved_by="auto"
+                approved_by="auto",
+                sequence=self._sequence
+            )
+        elif not held_out and (cached := self._cached_answer(question, options, context)) is not None:
+            # Repeat of a question a human already answered
+            decision = Decision(
+                id=decision_id,
+                question=question,
+                options=options,
+                status="approved",
+                selected_option_id=cached.option_id,
+                auto_approved=True,
+                context=context or {},
+                approved_at=datetime.now(),
+                approved_by="cache",
+                sequence=self._sequence,
+                from_cache=True,
+                cached_from=cached.decision_id
             )
         else:
             # Requires human approval
@@ -100,15 +192,56 @@ class DecisionEngine:
                 options=options,
                 status="pending",
                 auto_approved=False,
-                context=context or {}
+                context=context or {},
+                sequence=self._sequence,
+                held_out=held_out
             )
             self.pending_decisions[decision_id] = decision
+            self._waiters[decision_id] = asyncio.get_running_loop().create_future()
 
         # Store in history
         self.decisions[decision_id] = decision
+        self.metrics.record_request(decision.auto_approved, len(self.pending_decisions))
+        if decision.auto_approved:
+            self._retire(decision)
 
         return decision
 
+    @classmethod
+    def category_of(cls, context: Optional[Dict[str, Any]]) -> str:
+        """Category of a decision from its context"""
+        return str((context or {}).get(cls.CATEGORY_KEY, cls.DEFAULT_CATEGORY))
+
+    def threshold_for(self, context: Optional[Dict[str, Any]] = None) -> float:
+        """Auto-approve threshold for a decision with this context"""
+        return self.thresholds.get(self.category_of(context), self.AUTO_APPROVE_THRESHOLD)
+
+    async def request_decisions(
+        self,
+        requests: Iterable[Tuple[Any, ...]]
+    ) -> List[Decision]:
+        """
+        Request several decisions at once.
+
+        Args:
+            requests: (question, options) or (question, options, context)
+                tuples
+
+        Returns:
+            Decisions in request order (each auto-approved or pending)
+
+        Raises:
+            ValueError: If any request is malformed; no decision is created
+        """
+        requests = [tuple(request) for request in requests]
+        for request in requests:
+            if len(request) not in (2, 3):
+                raise ValueError("Each request must be (question, options[, context])")
+            if not request[1]:
+                raise ValueError(f"Decision '{request[0]}' needs at least one option")
+        # request_decision never suspends, so the batch lands in one step
+        return [await self.request_decision(*request) for request in requests]
+
     async def approve_decision(
         self,
         decision_id: str,
@@ -129,6 +262,48 @@ class DecisionEngine:
         Raises:
             ValueError: If decision not found or invalid option
         """
+        decision = self._validate_approval(decision_id, selected_option_id)
+        self._apply_approval(decision, selected_option_id, approved_by)
+        return decision
+
+    async def approve_decisions(
+        self,
+        approvals: Mapping[str, str],
+        approved_by: str = "human"
+    ) -> List[Decision]:
+        """
+        Approve several decisions at once.
+
+        Args:
+            approvals: Selected option ID per decision ID
+            approved_by: Identifier of who approved
+
+        Returns:
+            Updated Decision objects in approvals order
+
+        Raises:
+            ValueError: If any decision is not found or any option is
+                invalid; no decision is changed
+        """
+        decisions = self.validate_approvals(approvals)
+        for decision, option_id in zip(decisions, approvals.values()):
+            self._apply_approval(decision, option_id, approved_by)
+        return decisions
+
+    def validate_approvals(self, approvals: Mapping[str, str]) -> List[Decision]:
+        """
+        Check approvals without applying them.
+
+        Returns:
+            The decisions in approvals order
+
+        Raises:
+            ValueError: If any decision is not found or any option is invalid
+        """
+        return [self._validate_approval(decision_id, option_id)
+                for decision_id, option_id in approvals.items()]
+
+    def _validate_approval(self, decision_id: str, selected_option_id: str) -> Decision:
         if decision_id not in self.decisions:
             raise ValueError(f"Decision {decision_id} not found")
 
@@ -137,31 +312,194 @@ class DecisionEngine:
         # Validate option exists
         if not any(opt.id == selected_option_id for opt in decision.options):
             raise ValueError(f"Option {selected_option_id} not found in decision")
+        return decision
 
-        # Update decision
+    def _apply_approval(self, decision: Decision, selected_option_id: str, approved_by: str) -> None:
+        """Approve a validated decision; cannot raise, so batches apply fully"""
         decision.status = "approved"
         decision.selected_option_id = selected_option_id
         decision.approved_at = datetime.now()
         decision.approved_by = approved_by
 
         # Remove from pending
-        if decision_id in self.pending_decisions:
-            del self.pending_decisions[decision_id]
+        if self.pending_decisions.pop(decision.id, None) is not None:
+            self._record_resolution(decision)
+        self._resolve(decision)
+        self._retire(decision)
+        self._learn(decision)
 
-        return decision
+    async def wait_for_decision(self, decision_id: str, timeout: Optional[float] = None) -> Decision:
+        """
+        Wait until a decision is approved or rejected.
+
+        Args:
+            decision_id: ID of the decision to wait for
+            timeout: Seconds to wait (None = no limit)
+
+        Returns:
+            The resolved Decision (immediately if already resolved)
+
+        Raises:
+            ValueError: If decision not found
+            asyncio.TimeoutError: If still pending after timeout; the
+                decision stays pending
+        """
+        decision = self.decisions.get(decision_id)
+        if decision is None:
+            raise ValueError(f"Decision {decision_id} not found")
+        waiter = self._waiters.get(decision_id)
+        if waiter is None:
+            return decision
+        # Shielded so a timed-out or cancelled waiter leaves the future for others
+        return await asyncio.wait_for(asyncio.shield(waiter), timeout)
+
+    def _resolve(self, decision: Decision) -> None:
+        """Wake everything waiting for decision"""
+        waiter = self._waiters.pop(decision.id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(decision)
+
+    def _cached_answer(self, question: str, options: List[DecisionOption],
+                       context: Optional[Dict[str, Any]]) -> Optional["CachedAnswer"]:
+        """Cached human answer for this question, if it is still one of the options"""
+        if self.cache is None:
+            return None
+        answer = self.cache.lookup(self.cache.fingerprint(question, options, context))
+        if answer is None or not any(opt.id == answer.option_id for opt in options):
+            return None
+        return answer
+
+    def _record_resolution(self, decision: Decision) -> None:
+        """Record how long a pending decision waited"""
+        waited = ((decision.approved_at or datetime.now()) - decision.created_at).total_seconds()
+        self.metrics.record_resolution(decision.status == "approved", waited,
+                                       len(self.pending_decisions))
+
+    def _learn(self, decision: Decision) -> None:
+        """
+        Feed a resolution to the cache and the calibrator (installing
+        refitted thresholds). The decision is already resolved, so their
+        errors are logged, not raised.
+        """
+        if self.cache is not None and decision.status == "approved" and not decision.auto_approved \
+                and decision.approved_by not in self.NON_HUMAN_APPROVERS:
+            try:
+                fingerprint = self.cache.fingerprint(decision.question, decision.options, decision.context)
+                self.cache.store(fingerprint, decision.selected_option_id, decision.id)
+            except Exception as e:
+                logger.error(f"Failed to cache decision {decision.id}: {e}")
+        if self.calibrator is not None:
+            try:
+                if self.calibrator.observe(decision):
+                    self.calibrator.apply(self)
+            except Exception as e:
+                logger.error(f"Failed to calibrate on decision {decision.id}: {e}")
+
+    def _retire(self, decision: Decision) -> None:
+        """Track a resolved decision, aging the oldest out of memory"""
+        if self.max_resolved is None:
+            return
+        self._resolved[decision.id] = None
+        self._resolved.move_to_end(decision.id)
+        while len(self._resolved) > self.max_resolved:
+            oldest_id, _ = self._resolved.popitem(last=False)
+            oldest = self.decisions.pop(oldest_id)
+            if self.archive is not None:
+                self._archive_buffer.append(oldest)
+        if len(self._archive_buffer) >= self.ARCHIVE_BATCH:
+            self.flush_archive()
+
+    def flush_archive(self) -> int:
+        """
+        Write decisions waiting to be archived; returns the number written.
+
+        Archive errors are logged, not raised, so they never fail the
+        approval or request that triggered the flush; the batch is dropped.
+        """
+        if not self._archive_buffer:
+            return 0
+        batch, self._archive_buffer = self._archive_buffer, []
+        try:
+            return self.archive.append(batch)
+        except Exception as e:
+            logger.error(f"Failed to archive {len(batch)} decisions: {e}")
+            return 0
+
+    def close(self) -> None:
+        """Archive buffered decisions and close the archive"""
+        if self.archive is not None:
+            self.flush_archive()
+            self.archive.close()
 
     def get_decision(self, decision_id: str) -> Optional[Decision]:
-        """Get a decision by ID"""
-        return self.decisions.get(decision_id)
+        """Get a decision by ID (including archived decisions)"""
+        decision = self.decisions.get(decision_id)
+        if decision is not None or self.archive is None:
+            return decision
+        for archived in self._archive_buffer:
+            if archived.id == decision_id:
+                return archived
+        return self.archive.get(decision_id)
+
+    def decision_metrics(self) -> Dict[str, Any]:
+        """Decision counts, ratios, time-to-decision quantiles and pending depth over time"""
+        return self.metrics.snapshot()
 
     def get_pending_decisions(self) -> List[Decision]:
         """Get all pending decisions"""
         return list(self.pending_decisions.values())
 
     def get_decision_history(self) -> List[Decision]:
-        """Get all decisions (pending and resolved)"""
+        """Get the decisions held in memory (pending and recently resolved)"""
         return list(self.decisions.values())
 
+    def query_history(self, status: Optional[str] = None, approved_by: Optional[str] = None,
+                      since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      cursor: Optional[int] = None,
+                      limit: int = 100) -> Tuple[List[Decision], Optional[int]]:
+        """
+        One page of decision history (archived and in memory) in creation order.
+
+        Args:
+            status: Only decisions with this status
+            approved_by: Only decisions resolved by this approver
+            since: Only decisions created at or after this time
+            until: Only decisions created before this time
+            cursor: next_cursor of the previous page (None = first page)
+            limit: Maximum decisions per page
+
+        Returns:
+            (decisions, next_cursor); next_cursor is None on the last page
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        after = cursor or 0
+        archived: List[Decision] = []
+        if self.archive is not None:
+            self.flush_archive()
+            archived = self.archive.query(status, approved_by, since, until, after, limit)
+
+        in_memory = (
+            d for d in self.decisions.values()
+            if d.sequence > after
+            and (status is None or d.status == status)
+            and (approved_by is None or d.approved_by == approved_by)
+            and (since is None or d.created_at >= since)
+            and (until is None or d.created_at < until)
+        )
+        page = heapq.nsmallest(limit, [*archived, *in_memory], key=lambda d: d.sequence)
+        next_cursor = page[-1].sequence if len(page) == limit else None
+        return page, next_cursor
+
+    def iter_history(self, page_size: int = 100, **filters: Any) -> Iterator[Decision]:
+        """Iterate over all matching history a page at a time (filters as in query_history)"""
+        cursor = None
+        while True:
+            page, cursor = self.query_history(cursor=cursor, limit=page_size, **filters)
+            yield from page
+            if cursor is None:
+                return
+
     def reject_decision(self, decision_id: str, reason: str = "") -> Decision:
         """
         Reject a decision (execution should halt or retry)
@@ -181,7 +519,10 @@ class DecisionEngine:
         decision.context["rejection_reason"] = reason
 
         # Remove from pending
-        if decision_id in self.pending_decisions:
-            del self.pending_decisions[decision_id]
+        if self.pending_decisions.pop(decision_id, None) is not None:
+            self._record_resolution(decision)
+        self._resolve(decision)
+        self._retire(decision)
+        self._learn(decision)
 
         return decision
@@ -0,0 +1,114 @@
+"""
+Duration History - Learned task and wave durations
+
+Records how long tasks and waves take (exponentially weighted moving
+averages) and persists them across runs, so the orchestrator can estimate
+wave durations and prioritise the critical path of a plan.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DurationHistory:
+    """
+    Moving-average durations keyed by task string and wave id.
+
+    Entries are kept in least-recently-updated order and the oldest are
+    dropped beyond max_entries. With a path, history is loaded on creation
+    and written atomically by save().
+    """
+
+    DEFAULT_TASK_SECONDS = 1.0
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, alpha: float = 0.3,
+                 max_entries: int = 100000):
+        """
+        Args:
+            path: JSON file to load from and save to (None = in memory only)
+            alpha: Weight of the newest sample in the moving average
+            max_entries: Maximum tasks (and waves) remembered
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.path = Path(path) if path is not None else None
+        self.alpha = alpha
+        self.max_entries = max_entries
+        self._tasks: Dict[str, float] = {}
+        self._waves: Dict[str, float] = {}
+        self._task_mean: Optional[float] = None
+        if self.path is not None and self.path.exists():
+            self.load()
+
+    def record_task(self, task: str, seconds: float) -> None:
+        """Fold one task duration into its moving average"""
+        self._record(self._tasks, task, seconds)
+        self._task_mean = None
+
+    def record_wave(self, wave_id: str, seconds: float) -> None:
+        """Fold one uninterrupted wave duration into its moving average"""
+        self._record(self._waves, wave_id, seconds)
+
+    def _record(self, table: Dict[str, float], key: str, seconds: float) -> None:
+        previous = table.pop(key, None)
+        table[key] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+        if len(table) > self.max_entries:
+            del table[next(iter(table))]
+
+    def estimate_task(self, task: str) -> float:
+        """Expected task duration; unknown tasks get the mean of known tasks"""
+        if task in self._tasks:
+            return self._tasks[task]
+        if not self._tasks:
+            return self.DEFAULT_TASK_SECONDS
+        if self._task_mean is None:
+            self._task_mean = sum(self._tasks.values()) / len(self._tasks)
+        return self._task_mean
+
+    def estimate_wave(self, wave: Any, concurrency: int = 1) -> float:
+        """
+        Expected duration of a wave's remaining tasks.
+
+        A wave with no progress uses its own recorded duration if there is
+        one; otherwise task estimates are spread over the workers that will
+        run them.
+        """
+        if not wave.completed_tasks and wave.wave_id in self._waves:
+            return self._waves[wave.wave_id]
+        remaining = [task for i, task in enumerate(wave.tasks) if i not in wave.completed_tasks]
+        if not remaining:
+            return 0.0
+        return sum(self.estimate_task(task) for task in remaining) / min(concurrency, len(remaining))
+
+    def save(self) -> None:
+        """Atomically write the history to path (no-op without a path)"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"tasks": self._tasks, "waves": self._waves}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> None:
+        """Replace in-memory history with the contents of path"""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable duration history {self.path}: {e}")
+            return
+        self._tasks = {k: float(v) for k, v in data.get("tasks", {}).items()}
+        self._waves = {k: float(v) for k, v in data.get("waves", {}).items()}
+        self._task_mean = None
+
+    def __len__(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,125 @@
+"""
+Task Executors - Pluggable backends for running wave tasks
+
+Each backend wraps a task handler (called with the task string) and carries
+its own concurrency limit, applied to the tasks of a single wave, and an
+optional RetryPolicy overriding the orchestrator's default:
+- AsyncTaskExecutor: native coroutine handlers on the event loop
+- ThreadPoolTaskExecutor: blocking I/O handlers on a thread pool
+- ProcessPoolTaskExecutor: CPU-bound handlers on a process pool
+"""
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+import logging
+
+from .retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+
+async def simulate_task(task: str) -> None:
+    """Default task handler: simulate a short unit of work"""
+    await asyncio.sleep(0.01)
+
+
+class TaskExecutor(ABC):
+    """Base class for task executor backends"""
+
+    name = "base"
+
+    def __init__(self, handler: Callable[[str], Any], max_concurrency: int,
+                 retry_policy: Optional[RetryPolicy] = None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy
+
+    @abstractmethod
+    async def run(self, task: str) -> Any:
+        """Run a single task and return the handler's result"""
+
+    def halt(self) -> None:
+        """Stop backend work that is queued but not yet started (HALT requested)"""
+
+    def shutdown(self) -> None:
+        """Release backend resources"""
+
+
+class AsyncTaskExecutor(TaskExecutor):
+    """Runs coroutine handlers directly on the event loop"""
+
+    name = "async"
+    DEFAULT_MAX_CONCURRENCY = 10
+
+    def __init__(self, handler: Optional[Callable[[str], Any]] = None,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 retry_policy: Optional[RetryPolicy] = None):
+        handler = handler or simulate_task
+        if not asyncio.iscoroutinefunction(handler):
+            raise TypeError("AsyncTaskExecutor requires a coroutine function handler")
+        super().__init__(handler, max_concurrency, retry_policy)
+
+    async def run(self, task: str) -> Any:
+        return await self.handler(task)
+
+
+class _PoolTaskExecutor(TaskExecutor):
+    """Shared logic for concurrent.futures pool backends"""
+
+    def __init__(self, handler: Callable[[str], Any], max_concurrency: int,
+                 retry_policy: Optional[RetryPolicy] = None):
+        super().__init__(handler, max_concurrency, retry_policy)
+        self._pool: Optional[Executor] = None
+
+    @abstractmethod
+    def _create_pool(self) -> Executor:
+        """Create the underlying pool"""
+
+    async def run(self, task: str) -> Any:
+        if self._pool is None:
+            self._pool = self._create_pool()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self.handler, task)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info(f"Shut down {self.name} executor pool")
+
+
+class ThreadPoolTaskExecutor(_PoolTaskExecutor):
+    """Runs blocking handlers on a thread pool"""
+
+    name = "thread"
+
+    def __init__(self, handler: Callable[[str], Any], max_concurrency: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        super().__init__(handler, max_concurrency or min(32, (os.cpu_count() or 1) + 4),
+                         retry_policy)
+
+    def _create_pool(self) -> Executor:
+        return ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                  thread_name_prefix="shannon-task")
+
+
+class ProcessPoolTaskExecutor(_PoolTaskExecutor):
+    """
+    Runs CPU-bound handlers on a process pool.
+
+    The handler must be picklable (a module-level function).
+    """
+
+    name = "process"
+
+    def __init__(self, handler: Callable[[str], Any], max_concurrency: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None):
+        super().__init__(handler, max_concurrency or os.cpu_count() or 1, retry_policy)
+
+    def _create_pool(self) -> Executor:
+        return ProcessPoolExecutor(max_workers=self.max_concurrency)
@@ -0,0 +1,334 @@
+"""
+Snapshot Journal - Durable append-only log of orchestration state
+
+StateManager writes snapshot deltas, execution-history records and
+rollbacks to this journal so a restarted orchestrator can recover its
+progress after a crash.
+
+Format: one compact JSON object per line. Writes are buffered and flushed
+with a single fsync per batch; the log is periodically compacted into a
+single checkpoint record; reload memory-maps the file and parses it in one
+pass. A torn final line (crash mid-write) is ignored.
+
+Nothing slow runs on the caller's (event loop) thread. Batches are written
+and fsynced by a writer thread. Compaction encodes and fsyncs the
+checkpoint on a compaction thread while appends continue; records written
+meanwhile are copied behind the checkpoint just before the swap. Only an
+explicit sync() waits for the disk.
+"""
+
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Items encoded per json.dumps call while writing a checkpoint; bounds how
+# long the compaction thread holds the GIL at a time
+CHECKPOINT_CHUNK = 1000
+
+
+class SnapshotJournal:
+    """
+    Append-only on-disk journal with fsync batching and compaction.
+
+    Record ops:
+    - snapshot: wave deltas [[index, record], ...] plus snapshot position
+    - history: one execution-history entry (which names the wave index and
+      status) plus the wave's [started_at, completed_at, completed_tasks],
+      where completed_tasks is null once every task finished
+    - rollback: steps, truncated history length and restored wave records
+    - checkpoint: full wave records and history (written by compaction)
+
+    The journal mirrors the latest wave records and history (by reference)
+    so compaction does not need to re-read the log.
+    """
+
+    def __init__(self, path: Union[str, Path], fsync_every: int = 64,
+                 fsync_interval: float = 0.05, compact_every: int = 10000):
+        if fsync_every < 1:
+            raise ValueError("fsync_every must be at least 1")
+        if compact_every < 1:
+            raise ValueError("compact_every must be at least 1")
+
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+        self._file: Optional[BinaryIO] = None
+        self._buffer: List[bytes] = []
+        # Guards the log file: batch writes and the compaction swap
+        self._lock = threading.Lock()
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._compactor: Optional[ThreadPoolExecutor] = None
+        self._last_write: Optional[Future] = None
+        self._compaction: Optional[Future] = None
+        # Batches written since the running compaction's checkpoint
+        self._tail: Optional[List[bytes]] = None
+        self._last_sync = time.monotonic()
+        self._records_since_checkpoint = 0
+        self._waves: Dict[int, Dict[str, Any]] = {}
+        self._progress: Dict[int, List[Any]] = {}
+        self._history: List[Dict[str, Any]] = []
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Buffer a record; hand the batch to the writer once its size or interval is reached"""
+        self._apply(record)
+        self._buffer.append(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+        self._records_since_checkpoint += 1
+
+        if (len(self._buffer) >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._flush()
+        if self._records_since_checkpoint >= self.compact_every and self._compaction is None:
+            self._start_compaction()
+
+    def sync(self) -> None:
+        """Write buffered records and wait until they are fsynced to disk"""
+        self._flush()
+        if self._last_write is not None:
+            self._last_write.result()
+
+    def compact(self) -> None:
+        """Replace the log with a single checkpoint of the current state and wait for it"""
+        # A compaction already running checkpoints an older state; let it
+        # finish, then checkpoint what was appended since
+        self._wait_for_compaction()
+        self._start_compaction()
+        self._wait_for_compaction()
+
+    def _flush(self) -> None:
+        """Queue buffered records for the writer thread"""
+        self._last_sync = time.monotonic()
+        if not self._buffer:
+            return
+        data = b"".join(self._buffer)
+        self._buffer.clear()
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-writer")
+        self._last_write = self._writer.submit(self._write, data)
+        self._last_write.add_done_callback(self._log_failure)
+
+    def _write(self, data: bytes) -> None:
+        """Writer thread: append a batch and fsync it"""
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "ab")
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if self._tail is not None:
+                self._tail.append(data)
+
+    def _start_compaction(self) -> None:
+        """Capture the state to checkpoint and compact it on the compaction thread"""
+        # Everything queued before the mark is covered by the checkpoint;
+        # batches written after it are collected into the tail
+        self._flush()
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-writer")
+        marked = self._writer.submit(self._begin_tail)
+        waves = self.latest_state()["waves"]
+        history = list(self._history)
+        self._records_since_checkpoint = 0
+        if self._compactor is None:
+            self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-compactor")
+        self._compaction = self._compactor.submit(self._compact, waves, history, time.time(), marked)
+        self._compaction.add_done_callback(self._log_failure)
+
+    def _begin_tail(self) -> None:
+        with self._lock:
+            self._tail = []
+
+    def _compact(self, waves: List[Dict[str, Any]], history: List[Dict[str, Any]],
+                 timestamp: float, marked: Future) -> None:
+        """Compaction thread: write the checkpoint, then swap it in with the tail"""
+        tmp_path = self.path.with_name(self.path.name + ".compact")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(b'{"op":"checkpoint","waves":')
+                _write_json_array(f, waves)
+                f.write(b',"history":')
+                _write_json_array(f, history)
+                f.write(b',"timestamp":' + json.dumps(timestamp).encode() + b"}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            marked.result()
+
+            with self._lock:
+                if self._tail:
+                    with open(tmp_path, "ab") as f:
+                        f.write(b"".join(self._tail))
+                        f.flush()
+                        os.fsync(f.fileno())
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                os.replace(tmp_path, self.path)
+                self._tail = None
+        except BaseException:
+            with self._lock:
+                self._tail = None
+            raise
+        self._fsync_directory()
+        logger.info(f"Compacted journal {self.path} ({len(history)} history entries)")
+
+    def _wait_for_compaction(self) -> None:
+        compaction, self._compaction = self._compaction, None
+        if compaction is not None:
+            compaction.result()
+
+    def _log_failure(self, future: Future) -> None:
+        if self._compaction is future:
+            self._compaction = None
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Journal {self.path} write failed: {future.exception()!r}")
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Read every durable record and rebuild the in-memory mirror.
+
+        Returns:
+            Records in write order
+        """
+        self._wait_for_compaction()
+        self.sync()
+        self._waves = {}
+        self._progress = {}
+        self._history = []
+        records = self._read_records()
+        for record in records:
+            self._apply(record)
+        self._records_since_checkpoint = len(records)
+        return records
+
+    def latest_state(self) -> Dict[str, Any]:
+        """Latest durable wave records (in index order) and history"""
+        if self._progress:
+            for index, (status, started_at, completed_at, completed_tasks) in self._progress.items():
+                record = dict(self._waves[index])
+                record["status"] = status
+                record["started_at"] = started_at
+                record["completed_at"] = completed_at
+                record["completed_tasks"] = (list(range(len(record["tasks"])))
+                                             if completed_tasks is None else completed_tasks)
+                self._waves[index] = record
+            self._progress = {}
+        return {
+            "waves": [self._waves[i] for i in sorted(self._waves)],
+            "history": self._history
+        }
+
+    def clear(self) -> None:
+        """Discard all journaled state"""
+        self._buffer.clear()
+        self._drain()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self.path.exists():
+                self.path.unlink()
+        self._waves = {}
+        self._progress = {}
+        self._history = []
+        self._records_since_checkpoint = 0
+
+    def close(self) -> None:
+        """Flush pending records, finish compaction and close the file"""
+        self._drain()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        for executor in (self._writer, self._compactor):
+            if executor is not None:
+                executor.shutdown()
+        self._writer = self._compactor = None
+
+    def _drain(self) -> None:
+        """Wait for queued writes and any running compaction"""
+        try:
+            self._wait_for_compaction()
+        finally:
+            self.sync()
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Update the mirror of latest wave records and history"""
+        op = record["op"]
+        if op == "history":
+            entry = record["entry"]
+            self._history.append(entry)
+            self._progress[entry["wave_index"]] = [entry["status"], *record["wave"]]
+            return
+        if op == "checkpoint":
+            self._waves = dict(enumerate(record["waves"]))
+            self._progress = {}
+            self._history = list(record["history"])
+            return
+        if op == "rollback":
+            del self._history[record["history_length"]:]
+        for index, wave_record in record["waves"]:
+            self._waves[index] = wave_record
+            self._progress.pop(index, None)
+
+    def _read_records(self) -> List[Dict[str, Any]]:
+        """Memory-map the log and parse every complete line"""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return []
+
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(b"\n") + 1
+            torn = end < len(mm)
+            body = mm[:end]
+
+        if torn:
+            # Drop the partial record so later appends start on a clean line
+            logger.warning(f"Discarding torn record at end of journal {self.path}")
+            os.truncate(self.path, end)
+
+        if not body:
+            return []
+        try:
+            # Parse all lines in one pass: JSON never contains raw newlines
+            return json.loads(b"[" + body[:-1].replace(b"\n", b",") + b"]")
+        except json.JSONDecodeError:
+            logger.warning(f"Corrupt record in journal {self.path}, recovering line by line")
+            records = []
+            for line in body.splitlines():
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+            return records
+
+    def _fsync_directory(self) -> None:
+        """Make the compaction rename durable"""
+        try:
+            fd = os.open(self.path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _write_json_array(f: BinaryIO, items: List[Any]) -> None:
+    """Write a JSON array a chunk at a time"""
+    f.write(b"[")
+    for start in range(0, len(items), CHECKPOINT_CHUNK):
+        if start:
+            f.write(b",")
+        f.write(json.dumps(items[start:start + CHECKPOINT_CHUNK], separators=(",", ":"))[1:-1].encode())
+    f.write(b"]")
@@ -0,0 +1,325 @@
+"""
+Metrics - Prometheus-style counters, gauges and histograms
+
+Metrics are plain attribute updates with no locks: every writer runs on the
+event loop, and a scrape reading a histogram mid-update at worst sees a
+count and sum one observation apart. Gauges can be backed by a callback
+evaluated only at scrape time, so state that is already tracked elsewhere
+(snapshot count, pending decisions) costs nothing between scrapes.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+# Default buckets (seconds) for latency histograms
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Buckets (seconds) for time decisions wait on a human
+DECISION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base class: a named metric with help text"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """(name suffix, label string, value) triples"""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self.value += amount
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [("", "", self.value)]
+
+
+class Gauge(Metric):
+    """Value that can go up and down, optionally read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, function: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text)
+        self.value = 0
+        self.function = function
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]) -> None:
+        """Read the value from function at scrape time (None = use set values)"""
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [("", "", self.get())]
+
+
+class Histogram(Metric):
+    """Distribution of observations over fixed upper-bound buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        bounds = sorted(buckets)
+        if not bounds:
+            raise ValueError("Histogram needs at least one bucket")
+        self.bounds: Tuple[float, ...] = tuple(bounds)
+        self.counts = [0] * (len(bounds) + 1)  # last slot: above every bound
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimated q-quantile, interpolated linearly within its bucket
+        (None without observations). Observations above the highest bound
+        report that bound.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be in [0, 1]")
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        lower = min(0.0, self.bounds[0])
+        for bound, count in zip(self.bounds, self.counts):
+            if count and cumulative + count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return self.bounds[-1]
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            samples.append(("_bucket", f'{{le="{_format_value(bound)}"}}', cumulative))
+        samples.append(("_sum", "", self.sum))
+        samples.append(("_count", "", self.count))
+        return samples
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered in Prometheus text format"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: dict = {}
+
+    def register(self, metric: Metric) -> Any:
+        """Add a metric; returns it for chaining"""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self.register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str,
+              function: Optional[Callable[[], float]] = None) -> Gauge:
+        return self.register(Gauge(name, help_text, function))
+
+    def histogram(self, name: str, help_text: str,
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, buckets))
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric"""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+class OrchestratorMetrics:
+    """Standard orchestrator metrics on a registry"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        self.waves_completed = self.registry.counter(
+            "shannon_waves_completed_total", "Waves that completed all their tasks")
+        self.waves_failed = self.registry.counter(
+            "shannon_waves_failed_total", "Waves that failed")
+        self.task_latency = self.registry.histogram(
+            "shannon_task_latency_seconds", "Task run time including retries")
+        self.halt_latency = self.registry.histogram(
+            "shannon_halt_latency_seconds", "Time from HALT request to quiescence")
+        self.snapshots = self.registry.gauge(
+            "shannon_snapshots", "Rollback snapshots retained")
+        self.snapshot_bytes = self.registry.gauge(
+            "shannon_snapshot_bytes", "Approximate bytes held by retained snapshots")
+
+    def bind(self, orchestrator: Any) -> None:
+        """Read snapshot gauges from an orchestrator's state manager at scrape time"""
+        state_manager = orchestrator.state_manager
+        self.snapshots.set_function(state_manager.get_snapshot_count)
+        self.snapshot_bytes.set_function(state_manager.get_memory_usage)
+
+
+class DepthTimeline:
+    """
+    Queue depth over time in fixed memory.
+
+    Time is split into intervals; the last `slots` intervals keep their
+    peak depth and how many items were resolved in them (throughput).
+    Intervals without events carry the depth over.
+    """
+
+    def __init__(self, interval: float = 10.0, slots: int = 360,
+                 clock: Optional[Callable[[], float]] = None):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        self.interval = interval
+        self._clock = clock or time.time
+        self._slots: Deque[List[int]] = deque(maxlen=slots)  # [interval index, peak, resolved]
+        self.depth = 0
+
+    def record(self, depth: int, resolved: int = 0) -> None:
+        index = int(self._clock() // self.interval)
+        last = self._slots[-1][0] if self._slots else index - 1
+        if index > last:
+            # Fill skipped intervals (at most a full window) with the carried depth
+            for skipped in range(max(last + 1, index - self._slots.maxlen + 1), index):
+                self._slots.append([skipped, self.depth, 0])
+            self._slots.append([index, self.depth, 0])
+        slot = self._slots[-1]
+        slot[1] = max(slot[1], depth)
+        slot[2] += resolved
+        self.depth = depth
+
+    def series(self) -> List[Dict[str, float]]:
+        """Per interval: start time, peak depth and items resolved"""
+        return [{"start": index * self.interval, "peak": peak, "resolved": resolved}
+                for index, peak, resolved in self._slots]
+
+
+class DecisionMetrics:
+    """
+    Decision flow metrics on a registry: requests, auto-approvals,
+    resolutions, time waited for a human and pending depth over time.
+    Every structure has fixed size.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None, interval: float = 10.0,
+                 slots: int = 360, clock: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            registry: Registry to add the metrics to (default: a new one)
+            interval: Seconds per pending-depth timeline interval
+            slots: Timeline intervals kept
+            clock: Wall clock for the timeline (defaults to time.time)
+        """
+        self.registry = registry or MetricsRegistry()
+        self.requested = self.registry.counter(
+            "shannon_decisions_requested_total", "Decisions requested")
+        self.auto_approved = self.registry.counter(
+            "shannon_decisions_auto_approved_total",
+            "Decisions approved without waiting (confidence threshold or cache)")
+        self.approved = self.registry.counter(
+            "shannon_decisions_approved_total", "Pending decisions approved")
+        self.rejected = self.registry.counter(
+            "shannon_decisions_rejected_total", "Pending decisions rejected")
+        self.pending = self.registry.gauge(
+            "shannon_pending_decisions", "Decisions waiting for approval")
+        self.wait_seconds = self.registry.histogram(
+            "shannon_decision_wait_seconds", "Time pending decisions waited to be resolved",
+            buckets=DECISION_BUCKETS)
+        self.depth = DepthTimeline(interval, slots, clock)
+
+    def bind(self, engine: Any) -> None:
+        """Read the pending gauge from a DecisionEngine at scrape time"""
+        self.pending.set_function(lambda: len(engine.pending_decisions))
+
+    def record_request(self, auto_approved: bool, pending: int) -> None:
+        self.requested.inc()
+        if auto_approved:
+            self.auto_approved.inc()
+        self.depth.record(pending)
+
+    def record_resolution(self, approved: bool, waited: float, pending: int) -> None:
+        """A pending decision resolved after waiting `waited` seconds"""
+        (self.approved if approved else self.rejected).inc()
+        self.wait_seconds.observe(waited)
+        self.depth.record(pending, resolved=1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-compatible summary"""
+        requested = self.requested.value
+        resolved = self.approved.value + self.rejected.value
+        wait = self.wait_seconds
+        return {
+            "requested": requested,
+            "auto_approved": self.auto_approved.value,
+            "approved": self.approved.value,
+            "rejected": self.rejected.value,
+            "pending": self.pending.get(),
+            "auto_approve_ratio": self.auto_approved.value / requested if requested else None,
+            "rejection_rate": self.rejected.value / resolved if resolved else None,
+            "time_to_decision": {
+                "count": wait.count,
+                "mean": wait.sum / wait.count if wait.count else None,
+                "p50": wait.quantile(0.5),
+                "p90": wait.quantile(0.9),
+                "p99": wait.quantile(0.99),
+                "bounds": list(wait.bounds),
+                "counts": list(wait.counts)  # last: above the highest bound
+            },
+            "pending_depth": {
+                "interval": self.depth.interval,
+                "series": self.depth.series()
+            }
+        }
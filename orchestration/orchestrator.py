@@ -6,15 +6,29 @@ capabilities for interactive debugging and development.
 """
 
 import asyncio
+import heapq
+import sys
 import time
-from typing import Dict, List, Optional, Any
+from collections import Counter, OrderedDict, deque
+from functools import partial
+from typing import AsyncIterable, Callable, Deque, Dict, Iterable, List, Optional, Any, Set, Tuple
 from enum import Enum
 import logging
 from .state_manager import StateManager
 from .decision_engine import DecisionEngine, DecisionOption
+from .scheduler import WaveScheduler
+from .durations import DurationHistory
+from .stats import percentile
+from .retry import RetryPolicy
+from .tracing import TraceRecorder
+from .metrics import OrchestratorMetrics
+from .executors import TaskExecutor, AsyncTaskExecutor
 
 logger = logging.getLogger(__name__)
 
+# Intake queue marker: the wave source is exhausted
+_END_OF_STREAM = object()
+
 
 class ExecutionState(Enum):
     """Execution states for the orchestrator"""
@@ -25,25 +39,101 @@ class ExecutionState(Enum):
     FAILED = "failed"
 
 
+# Shared empty cursor for waves that have not completed any task yet
+_NO_TASKS_COMPLETED: frozenset = frozenset()
+
+
 class Wave:
-    """Represents a wave of execution"""
-    def __init__(self, wave_id: str, agent_id: str, tasks: List[str]):
+    """
+    Represents a wave of execution.
+
+    depends_on lists the wave ids that must complete before this wave starts.
+    None keeps the sequential default (depend on the preceding wave); an empty
+    list marks the wave as independent. executor names the Orchestrator
+    backend that runs the wave's tasks. An empty agent_id means the wave has
+    no agent affinity and may run in any free slot.
+
+    completed_tasks holds the indices of tasks that already finished, so a
+    halted or rolled-back wave restarts exactly where it stopped.
+
+    Changes to public attributes are reported to the owning Orchestrator so
+    snapshots only need to capture waves that actually changed.
+
+    Waves are slotted and cache their to_dict() record until the next change,
+    so plans with 100k+ waves stay compact and status/snapshot calls on
+    unchanged waves allocate nothing. Records are shared and must be treated
+    as read-only.
+    """
+
+    __slots__ = ("_listener", "_position", "_record", "wave_id", "agent_id", "tasks",
+                 "depends_on", "executor", "status", "started_at", "completed_at",
+                 "completed_tasks")
+
+    def __init__(self, wave_id: str, agent_id: str, tasks: List[str],
+                 depends_on: Optional[List[str]] = None, executor: str = "async"):
+        self._listener: Optional[Callable[["Wave"], None]] = None
+        self._position = -1
+        self._record: Optional[Dict[str, Any]] = None
         self.wave_id = wave_id
         self.agent_id = agent_id
         self.tasks = tasks
+        self.depends_on = depends_on
+        self.executor = executor
         self.status = "pending"
         self.started_at: Optional[float] = None
         self.completed_at: Optional[float] = None
+        self.completed_tasks: Set[int] = _NO_TASKS_COMPLETED
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name[0] != "_":
+            object.__setattr__(self, "_record", None)
+            if self._listener is not None:
+                self._listener(self)
+
+    def mark_task_completed(self, task_index: int) -> None:
+        """Record that the task at task_index finished"""
+        if self.completed_tasks is _NO_TASKS_COMPLETED:
+            object.__setattr__(self, "completed_tasks", set())
+        self.completed_tasks.add(task_index)
+        object.__setattr__(self, "_record", None)
+        if self._listener is not None:
+            self._listener(self)
+
+    def restore(self, record: Dict[str, Any]) -> None:
+        """Restore progress fields from a to_dict() record"""
+        status = record["status"]
+        # Waves in flight when the record was taken restart from pending
+        self.status = "pending" if status == "running" else sys.intern(status)
+        self.started_at = record.get("started_at")
+        self.completed_at = record.get("completed_at")
+        completed_tasks = record.get("completed_tasks")
+        self.completed_tasks = set(completed_tasks) if completed_tasks else _NO_TASKS_COMPLETED
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "Wave":
+        """Rebuild a wave (definition and progress) from a to_dict() record"""
+        wave = cls(record["wave_id"], record["agent_id"], list(record["tasks"]),
+                   depends_on=record.get("depends_on"), executor=record.get("executor", "async"))
+        wave.restore(record)
+        return wave
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "wave_id": self.wave_id,
-            "agent_id": self.agent_id,
-            "tasks": self.tasks,
-            "status": self.status,
-            "started_at": self.started_at,
-            "completed_at": self.completed_at
-        }
+        record = self._record
+        if record is None:
+            record = {
+                "wave_id": self.wave_id,
+                "agent_id": self.agent_id,
+                "tasks": self.tasks,
+                "depends_on": self.depends_on,
+                "executor": self.executor,
+                "status": self.status,
+                "started_at": self.started_at,
+                "completed_at": self.completed_at,
+                "completed_tasks": sorted(self.completed_tasks)
+            }
+            object.__setattr__(self, "_record", record)
+        return record
 
 
 class Orchestrator:
@@ -51,112 +141,623 @@ class Orchestrator:
     Main orchestrator for Shannon wave execution.
 
     Supports:
-    - Parallel wave execution
-    - HALT: Pause execution in <100ms
+    - Parallel wave execution (dependency DAG, bounded concurrency)
+    - Streaming intake: waves from an async iterator, with backpressure
+    - Per-agent run queues and concurrency limits (Wave.agent_id)
+    - Critical-path priority from learned task/wave durations
+    - Task retries with backoff, timeouts and speculative re-execution
+    - Span tracing to a ring buffer, exportable as Chrome trace JSON
+    - Awaitable human decisions with timeout and fallback policy
+    - HALT: Pause execution in <100ms, cancelling in-flight tasks
     - RESUME: Continue from halted state
     - ROLLBACK: Revert N execution steps
     """
 
-    def __init__(self):
+    DEFAULT_MAX_CONCURRENT_WAVES = 4
+    DEFAULT_INTAKE_QUEUE_SIZE = 64
+    DECISION_FALLBACKS = ("reject", "best_option", "pending")
+    HALT_LATENCY_SAMPLES = 1000
+
+    def __init__(self, max_concurrent_waves: int = DEFAULT_MAX_CONCURRENT_WAVES,
+                 executors: Optional[Dict[str, TaskExecutor]] = None,
+                 task_checkpoint_interval: Optional[int] = None,
+                 state_manager: Optional[StateManager] = None,
+                 intake_queue_size: int = DEFAULT_INTAKE_QUEUE_SIZE,
+                 agent_limits: Optional[Dict[str, int]] = None,
+                 default_agent_limit: Optional[int] = None,
+                 duration_history: Optional[DurationHistory] = None,
+                 compare_makespan: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 clock: Optional[Callable[[], float]] = None,
+                 tracer: Optional[TraceRecorder] = None,
+                 metrics: Optional[OrchestratorMetrics] = None,
+                 wait_for_decisions: bool = False,
+                 decision_timeout: Optional[float] = None,
+                 decision_fallback: str = "reject",
+                 decision_engine: Optional[DecisionEngine] = None):
+        """
+        Args:
+            max_concurrent_waves: Maximum number of waves running at once
+            executors: Task executor backends by name (Wave.executor). Defaults
+                to a single simulated "async" backend running one task at a time.
+            task_checkpoint_interval: If set, snapshot a running wave every N
+                completed tasks so ROLLBACK can target points inside a wave
+            state_manager: Snapshot store (e.g. with a memory budget). Defaults
+                to a StateManager with default retention.
+            intake_queue_size: Streamed waves buffered ahead of the plan before
+                the wave source is paused (backpressure)
+            agent_limits: Maximum concurrently running waves per agent_id.
+                Waves with an empty agent_id have no affinity and run in any
+                free slot.
+            default_agent_limit: Limit for agents not in agent_limits
+                (None = only max_concurrent_waves applies)
+            duration_history: Learned durations. If set, task and wave
+                durations are recorded (and saved after each run) and ready
+                waves start in critical-path order.
+            compare_makespan: Predict the makespan when a run starts and
+                report it next to the actual one in get_status()["makespan"]
+                (requires duration_history)
+            retry_policy: Default retry/timeout/speculation policy for tasks
+                on executors without their own retry_policy. None runs each
+                task once, and its failure fails the run.
+            clock: Time source for durations and timestamps (simulation
+                passes its virtual clock). Defaults to time.perf_counter for
+                durations and time.time for timestamps.
+            tracer: Records wave, snapshot, control, decision and (opt-in) task spans
+                (export with tracer.export(path))
+            metrics: Prometheus counters and histograms for waves, task and
+                HALT latency and snapshots (rendered by metrics.registry)
+            wait_for_decisions: Make _request_decision wait for a human to
+                approve or reject decisions that are not auto-approved
+                (False returns them pending immediately). Other waves keep
+                running while one waits.
+            decision_timeout: Seconds to wait for a decision (None = no limit)
+            decision_fallback: On timeout, "reject" the decision, approve its
+                "best_option" (highest confidence) or leave it "pending"
+            decision_engine: Decision engine (e.g. with a bounded history or
+                a DecisionCache). Defaults to a plain DecisionEngine, which
+                the WebSocket server replaces with its own on registration.
+        """
+        if max_concurrent_waves < 1:
+            raise ValueError("max_concurrent_waves must be at least 1")
+        if intake_queue_size < 1:
+            raise ValueError("intake_queue_size must be at least 1")
+        if compare_makespan and duration_history is None:
+            raise ValueError("compare_makespan requires a duration_history")
+        if task_checkpoint_interval is not None and task_checkpoint_interval < 1:
+            raise ValueError("task_checkpoint_interval must be at least 1")
+        if decision_timeout is not None and decision_timeout <= 0:
+            raise ValueError("decision_timeout must be positive")
+        if decision_fallback not in self.DECISION_FALLBACKS:
+            raise ValueError(f"decision_fallback must be one of {', '.join(self.DECISION_FALLBACKS)}")
+
+        self._clock = clock or time.perf_counter
+        self._timestamp = clock or time.time
         self.state = ExecutionState.IDLE
-        self.halt_requested = False
+        self.max_concurrent_waves = max_concurrent_waves
+        self.task_checkpoint_interval = task_checkpoint_interval
+        self.intake_queue_size = intake_queue_size
+        # Validates the limits; each run builds its own scheduler from them
+        WaveScheduler(agent_limits, default_agent_limit)
+        self.agent_limits = dict(agent_limits or {})
+        self.default_agent_limit = default_agent_limit
+        self._scheduler: Optional[WaveScheduler] = None
+        self._agent_busy: Dict[Optional[str], float] = {}
+        # Clock of the last busy-time update; utilization is measured up to it
+        self._busy_accounted_at: Optional[float] = None
+        self._run_seconds = 0.0
+        self._run_started: Optional[float] = None
+        self.duration_history = duration_history
+        self.compare_makespan = compare_makespan
+        self.makespan: Optional[Dict[str, Any]] = None
+        self.retry_policy = retry_policy
+        self.tracer = tracer
+        self.metrics = metrics
+        self.task_stats: Counter = Counter()
+        self.executors: Dict[str, TaskExecutor] = executors or {
+            "async": AsyncTaskExecutor(max_concurrency=1)
+        }
+        self._halt_event = asyncio.Event()
+        self._halt_requested_at: Optional[float] = None
         self.waves: List[Wave] = []
+        # Streamed wave source: producer task feeding a bounded queue. Kept
+        # across HALT/RESUME until the source is exhausted.
+        self._intake: Optional[asyncio.Queue] = None
+        self._intake_task: Optional[asyncio.Task] = None
         self.current_wave_index = 0
         self.execution_history: List[Dict[str, Any]] = []
         self.halt_response_time: Optional[float] = None
-        self.state_manager = StateManager()
-        self.decision_engine = DecisionEngine()
+        self.halt_latencies: Deque[float] = deque(maxlen=self.HALT_LATENCY_SAMPLES)
+        self.state_manager = state_manager or StateManager()
+        self._dirty_waves: Set[int] = set()
+        # Versioned status: every wave change bumps state_version; scalar
+        # fields are compared against their last reported values lazily
+        self.state_version = 0
+        self._resync_version = 0
+        self._wave_versions: "OrderedDict[int, int]" = OrderedDict()
+        self._field_values: Dict[str, Any] = {}
+        self._field_versions: Dict[str, int] = {}
+        self._field_inputs: Optional[Tuple[Any, ...]] = None
+        self.decision_engine = decision_engine or DecisionEngine()
+        # A server may swap a default engine for its own, never a configured one
+        self.decision_engine_configured = decision_engine is not None
+        self.wait_for_decisions = wait_for_decisions
+        self.decision_timeout = decision_timeout
+        self.decision_fallback = decision_fallback
+        if metrics is not None:
+            metrics.bind(self)
+
+    @property
+    def halt_requested(self) -> bool:
+        """Whether a HALT has been requested and not yet cleared"""
+        return self._halt_event.is_set()
+
+    @property
+    def streaming(self) -> bool:
+        """Whether a wave source is attached and not yet exhausted"""
+        return self._intake is not None
 
     def add_wave(self, wave: Wave) -> None:
         """Add a wave to the execution queue"""
-        self.waves.append(wave)
+        self._check_executor(wave)
+        self._append_wave(wave)
         logger.info(f"Added wave {wave.wave_id} for agent {wave.agent_id}")
 
-    async def execute(self) -> Dict[str, Any]:
+    def add_waves(self, waves: Iterable[Wave]) -> int:
         """
-        Execute all waves in sequence.
+        Add many waves at once, logging a single line.
 
-        Checks halt_requested flag frequently to enable <100ms halt response.
+        Every wave is validated before any is added.
+
+        Returns:
+            Number of waves added
         """
-        self.state = ExecutionState.RUNNING
-        logger.info(f"Starting execution of {len(self.waves)} waves")
+        waves = list(waves)
+        for wave in waves:
+            self._check_executor(wave)
+        for wave in waves:
+            self._append_wave(wave)
+        logger.info(f"Added {len(waves)} waves")
+        return len(waves)
 
-        try:
-            while self.current_wave_index < len(self.waves):
-                # Check for halt request at wave boundaries
-                if self.halt_requested:
-                    await self._perform_halt()
-                    break
+    def _check_executor(self, wave: Wave) -> None:
+        if wave.executor not in self.executors:
+            raise ValueError(f"Wave {wave.wave_id} uses unknown executor {wave.executor}")
+
+    def _append_wave(self, wave: Wave) -> None:
+        """Attach a validated wave to the plan"""
+        wave._position = len(self.waves)
+        wave._listener = self._on_wave_changed
+        self.waves.append(wave)
+        self._on_wave_changed(wave)
 
-                wave = self.waves[self.current_wave_index]
+    async def execute(self, waves: Optional[AsyncIterable[Wave]] = None) -> Dict[str, Any]:
+        """
+        Execute all waves, running independent waves concurrently.
 
-                # Create snapshot before executing wave
-                self.state_manager.create_snapshot(
-                    self.current_wave_index,
-                    self.execution_history,
-                    self.waves
-                )
+        Waves start as soon as their dependencies complete, up to
+        max_concurrent_waves at a time. HALT is event-driven: running tasks
+        are cancelled as soon as it is requested.
 
-                wave_completed = await self._execute_wave(wave)
+        Args:
+            waves: Optional async iterator of further waves, run as they are
+                produced after the waves already added. Streamed waves may only
+                depend on waves produced before them. At most
+                intake_queue_size waves are buffered, plus max_concurrent_waves
+                admitted but not yet started; beyond that the source is paused.
+                The source stays attached across HALT/RESUME.
 
-                # Record execution step
-                self.execution_history.append({
-                    "wave_id": wave.wave_id,
-                    "wave_index": self.current_wave_index,
-                    "timestamp": time.time(),
-                    "status": wave.status
-                })
+        Raises:
+            ValueError: If a wave source is already attached
+        """
+        if waves is not None:
+            if self._intake is not None:
+                raise ValueError("A wave source is already attached")
+            self._attach_source(waves)
 
-                # If wave was halted, stop execution
-                if not wave_completed:
-                    break
+        if self.compare_makespan and self.makespan is None:
+            self.makespan = {
+                "predicted_seconds": self.predict_makespan(),
+                "plan_order_seconds": self.predict_makespan(critical_path=False),
+                "critical_path_seconds": self._build_scheduler(self._estimate_durations())
+                .critical_path_length(),
+                "actual_seconds": None,
+                "run_seconds_at_start": self._run_seconds
+            }
 
-                self.current_wave_index += 1
+        self.state = ExecutionState.RUNNING
+        logger.info(f"Starting execution of {len(self.waves)} waves"
+                    + (" (streaming)" if self.streaming else ""))
+
+        try:
+            await self._run_waves()
 
-            if self.current_wave_index >= len(self.waves) and not self.halt_requested:
+            if (self.current_wave_index >= len(self.waves) and not self.streaming
+                    and not self.halt_requested):
                 self.state = ExecutionState.COMPLETED
                 logger.info("All waves completed")
+                if self.makespan is not None and self.makespan["actual_seconds"] is None:
+                    self.makespan["actual_seconds"] = (
+                        self._run_seconds - self.makespan["run_seconds_at_start"])
 
         except Exception as e:
             self.state = ExecutionState.FAILED
+            self._detach_source()
             logger.error(f"Execution failed: {e}")
             raise
 
         return self.get_status()
 
-    async def _execute_wave(self, wave: Wave) -> bool:
+    def _attach_source(self, waves: AsyncIterable[Wave]) -> None:
+        """Start pulling waves from an async iterator into the intake queue"""
+        intake: asyncio.Queue = asyncio.Queue(maxsize=self.intake_queue_size)
+
+        async def produce() -> None:
+            try:
+                async for wave in waves:
+                    await intake.put(wave)
+            except Exception as e:
+                await intake.put(e)
+            else:
+                await intake.put(_END_OF_STREAM)
+
+        self._intake = intake
+        self._intake_task = asyncio.create_task(produce())
+
+    def _detach_source(self) -> None:
+        """Stop the wave producer and drop any buffered waves"""
+        if self._intake_task is not None:
+            self._intake_task.cancel()
+        self._intake = None
+        self._intake_task = None
+
+    def _admit(self, item: Any, scheduler: WaveScheduler) -> None:
+        """Move one intake item into the plan and the scheduler"""
+        if item is _END_OF_STREAM:
+            self._detach_source()
+            logger.info(f"Wave source exhausted after {len(self.waves)} waves")
+            return
+        if isinstance(item, Exception):
+            raise item
+        self._check_executor(item)
+        duration = self._estimate_wave(item) if self.duration_history is not None else None
+        scheduler.add(len(self.waves), item, duration)
+        self._append_wave(item)
+
+    async def _run_waves(self) -> None:
+        """
+        Drive the wave DAG until every wave completes or a halt drains the frontier.
+
+        On halt no new waves are started; in-flight waves cancel their running
+        tasks and are left for RESUME to pick up.
+        """
+        scheduler = self._build_scheduler(
+            self._estimate_durations() if self.duration_history is not None else None)
+        self._scheduler = scheduler
+        self._run_started = self._clock()
+        running: Dict[asyncio.Task, int] = {}
+        launched_at: Dict[asyncio.Task, float] = {}
+        intake_getter: Optional[asyncio.Task] = None
+        halt_waiter: Optional[asyncio.Task] = None
+
+        try:
+            while True:
+                # Admit buffered waves while few enough admitted waves wait to start
+                while (self._intake is not None and not self.halt_requested
+                       and not self._intake.empty()
+                       and scheduler.pending_count() - len(running) < self.max_concurrent_waves):
+                    self._admit(self._intake.get_nowait(), scheduler)
+
+                while (not self.halt_requested and scheduler.has_ready()
+                       and len(running) < self.max_concurrent_waves):
+                    index = scheduler.pop_ready()
+
+                    # Create snapshot before executing wave
+                    self._create_snapshot(index)
+
+                    task = asyncio.create_task(self._execute_wave(self.waves[index], index))
+                    running[task] = index
+                    launched_at[task] = self._clock()
+
+                waiting = set(running)
+                if (self._intake is not None and not self.halt_requested
+                        and scheduler.pending_count() - len(running) < self.max_concurrent_waves):
+                    if intake_getter is None:
+                        intake_getter = asyncio.create_task(self._intake.get())
+                    if halt_waiter is None:
+                        halt_waiter = asyncio.create_task(self._halt_event.wait())
+                    waiting |= {intake_getter, halt_waiter}
+
+                if not waiting:
+                    break
+
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                if intake_getter in done:
+                    item, intake_getter = intake_getter.result(), None
+                    self._admit(item, scheduler)
+                for task in done:
+                    if task not in running:
+                        continue
+                    index = running.pop(task)
+                    wave = self.waves[index]
+                    self._record_wave_span(wave, launched_at.pop(task))
+                    wave_completed = task.result()
+
+                    # Record execution step
+                    self.execution_history.append({
+                        "wave_id": wave.wave_id,
+                        "wave_index": index,
+                        "timestamp": self._timestamp(),
+                        "status": wave.status,
+                        "tasks_completed": len(wave.completed_tasks)
+                    })
+                    self.state_manager.record_history(self.execution_history, wave)
+
+                    if wave_completed:
+                        scheduler.complete(index)
+                        self._advance_wave_index()
+                    else:
+                        scheduler.release(index)
+        finally:
+            # A cancelled queue get leaves its item in the queue for RESUME
+            pending = [t for t in (intake_getter, halt_waiter) if t is not None]
+            pending.extend(running)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            for task, index in running.items():
+                self._record_wave_span(self.waves[index], launched_at[task])
+            self._run_seconds += self._clock() - self._run_started
+            self._run_started = None
+            self._scheduler = None
+
+        if self.halt_requested:
+            await self._perform_halt()
+        self.state_manager.sync()
+        if self.duration_history is not None:
+            self.duration_history.save()
+
+    def _build_scheduler(self, durations: Optional[Dict[int, float]] = None) -> WaveScheduler:
+        """Scheduler over the current plan with this orchestrator's agent limits"""
+        scheduler = WaveScheduler(self.agent_limits, self.default_agent_limit)
+        scheduler.build(self.waves, durations)
+        return scheduler
+
+    def _estimate_wave(self, wave: Wave) -> float:
+        executor = self.executors[wave.executor]
+        return self.duration_history.estimate_wave(wave, executor.max_concurrency)
+
+    def _estimate_durations(self) -> Dict[int, float]:
+        """Estimated seconds for every wave that has not completed"""
+        return {
+            i: self._estimate_wave(wave)
+            for i, wave in enumerate(self.waves) if wave.status != "completed"
+        }
+
+    def predict_makespan(self, critical_path: bool = True) -> float:
         """
-        Execute a single wave with halt checking.
+        Simulate the remaining plan with estimated durations.
+
+        Respects dependencies, max_concurrent_waves and agent limits.
+
+        Args:
+            critical_path: Order ready waves by critical path (False = plan order)
+
+        Returns:
+            Predicted seconds until every wave completes
+
+        Raises:
+            ValueError: Without a duration_history
+        """
+        if self.duration_history is None:
+            raise ValueError("Makespan prediction requires a duration_history")
+
+        durations = self._estimate_durations()
+        scheduler = self._build_scheduler(durations if critical_path else None)
+        clock = 0.0
+        running: List[Tuple[float, int]] = []
+        while True:
+            while scheduler.has_ready() and len(running) < self.max_concurrent_waves:
+                index = scheduler.pop_ready()
+                heapq.heappush(running, (clock + durations[index], index))
+            if not running:
+                return clock
+            clock, index = heapq.heappop(running)
+            scheduler.complete(index)
+
+    def _record_wave_span(self, wave: Wave, launched_at: float) -> None:
+        """Account a finished wave's run time to its agent and the tracer"""
+        now = self._clock()
+        agent = wave.agent_id or None
+        self._agent_busy[agent] = self._agent_busy.get(agent, 0.0) + now - launched_at
+        self._busy_accounted_at = now
+        if self.tracer is not None:
+            self.tracer.complete(wave.wave_id, "wave", wave.wave_id, launched_at, now,
+                                 {"agent": wave.agent_id, "status": wave.status,
+                                  "tasks_completed": len(wave.completed_tasks)})
+
+    def _agent_utilization(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-agent scheduling stats.
+
+        utilization is busy time over the run time available to the agent
+        (elapsed execution time x its effective concurrency). Busy time only
+        grows when a wave finishes, so elapsed time is measured up to the
+        last finished wave too: the stats do not move with the clock between
+        waves and do not bump status versions. Waves without an agent_id are
+        reported under "*".
+        """
+        elapsed = self._run_seconds
+        if self._run_started is not None and self._busy_accounted_at is not None:
+            elapsed += max(0.0, self._busy_accounted_at - self._run_started)
+
+        scheduler = self._scheduler
+        running = scheduler.running_by_agent if scheduler else {}
+        queued = scheduler.queued_by_agent() if scheduler else {}
+        agents = set(self._agent_busy) | set(running) | set(queued) | set(self.agent_limits)
+
+        report = {}
+        for agent in sorted(agents, key=lambda a: (a is not None, a or "")):
+            limit = None if agent is None else self.agent_limits.get(agent, self.default_agent_limit)
+            capacity = min(limit or self.max_concurrent_waves, self.max_concurrent_waves)
+            busy = self._agent_busy.get(agent, 0.0)
+            report["*" if agent is None else agent] = {
+                "running": running.get(agent, 0),
+                "queued": queued.get(agent, 0),
+                "limit": limit,
+                "busy_seconds": round(busy, 3),
+                "utilization": round(busy / (elapsed * capacity), 3) if elapsed > 0 else 0.0
+            }
+        return report
+
+    def _on_wave_changed(self, wave: Wave) -> None:
+        """Wave listener: track changes for snapshots and versioned status"""
+        position = wave._position
+        self._dirty_waves.add(position)
+        self.state_version += 1
+        self._wave_versions[position] = self.state_version
+        self._wave_versions.move_to_end(position)
+
+    def _require_resync(self) -> None:
+        """Invalidate incremental status after the wave list was replaced"""
+        self.state_version += 1
+        self._resync_version = self.state_version
+        self._wave_versions.clear()
+
+    def _create_snapshot(self, wave_index: int) -> None:
+        """Snapshot current state, capturing only waves changed since the last one"""
+        changed, self._dirty_waves = self._dirty_waves, set()
+        started = self._clock() if self.tracer is not None else 0.0
+        self.state_manager.create_snapshot(wave_index, self.execution_history, self.waves, changed)
+        if self.tracer is not None:
+            self.tracer.complete("snapshot", "snapshot", "snapshots", started, self._clock(),
+                                 {"wave_index": wave_index, "changed_waves": len(changed)})
+
+    def _advance_wave_index(self) -> None:
+        """Move current_wave_index past the leading run of completed waves"""
+        while (self.current_wave_index < len(self.waves)
+               and self.waves[self.current_wave_index].status == "completed"):
+            self.current_wave_index += 1
+
+    async def _execute_wave(self, wave: Wave, wave_index: int) -> bool:
+        """
+        Execute a single wave's remaining tasks on its executor backend.
+
+        Tasks already in wave.completed_tasks are skipped. Tasks run
+        concurrently up to the backend's max_concurrency. When a halt
+        is requested, in-flight tasks are cancelled cooperatively (coroutine
+        handlers receive CancelledError; pool-backed handlers are abandoned and
+        finish in the background) and the wave is marked halted.
 
         Returns:
             True if wave completed, False if halted
         """
         wave.status = "running"
-        wave.started_at = time.time()
-        logger.info(f"Executing wave {wave.wave_id}")
+        if not wave.completed_tasks:
+            wave.started_at = self._timestamp()
+        logger.info(f"Executing wave {wave.wave_id} "
+                    f"({len(wave.completed_tasks)}/{len(wave.tasks)} tasks already done)")
+
+        executor = self.executors[wave.executor]
+        remaining = [i for i in range(len(wave.tasks)) if i not in wave.completed_tasks]
+        pending_tasks = iter(remaining)
+        interval = self.task_checkpoint_interval
 
-        # Simulate wave execution with frequent halt checks
-        for task in wave.tasks:
-            # Check halt every 10ms for <100ms response time
-            if self.halt_requested:
-                wave.status = "halted"
-                await self._perform_halt()
-                return False
+        history = self.duration_history
+        policy = executor.retry_policy or self.retry_policy
+        trace_task = self.tracer.complete if self.tracer is not None and self.tracer.task_spans else None
+        task_latency = self.metrics.task_latency.observe if self.metrics is not None else None
+        peer_durations: List[float] = []
+        uninterrupted = not wave.completed_tasks
+        wave_started = self._clock()
 
-            # Simulate task execution
-            await asyncio.sleep(0.01)
+        clock = self._clock
+
+        async def worker(slot: int) -> None:
+            track = (wave.wave_id, "worker", slot)
+            for task_index in pending_tasks:
+                if self.halt_requested:
+                    return
+                task = wave.tasks[task_index]
+                if policy is None and history is None and trace_task is None and task_latency is None:
+                    await executor.run(task)
+                else:
+                    task_started = clock()
+                    if policy is None:
+                        await executor.run(task)
+                    else:
+                        await policy.run(partial(executor.run, task), peer_durations, self.task_stats)
+                    task_finished = clock()
+                    duration = task_finished - task_started
+                    peer_durations.append(duration)
+                    if history is not None:
+                        history.record_task(task, duration)
+                    if trace_task is not None:
+                        trace_task(task, "task", track, task_started, task_finished)
+                    if task_latency is not None:
+                        task_latency(duration)
+                wave.mark_task_completed(task_index)
+                if interval and len(wave.completed_tasks) % interval == 0 \
+                        and len(wave.completed_tasks) < len(wave.tasks):
+                    self._create_snapshot(wave_index)
 
+        workers = [
+            asyncio.create_task(worker(slot))
+            for slot in range(min(executor.max_concurrency, len(remaining)))
+        ]
+        halt_waiter = asyncio.create_task(self._halt_event.wait())
+
+        try:
+            waiting = set(workers)
+            while waiting:
+                done, _ = await asyncio.wait(waiting | {halt_waiter},
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if halt_waiter in done or any(w.exception() for w in done if w in waiting):
+                    break
+                waiting -= done
+        finally:
+            halt_waiter.cancel()
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(halt_waiter, *workers, return_exceptions=True)
+
+        error = next((w.exception() for w in workers if not w.cancelled() and w.exception()), None)
+        if error is not None:
+            wave.status = "failed"
+            if self.metrics is not None:
+                self.metrics.waves_failed.inc()
+            raise error
+
+        if len(wave.completed_tasks) < len(wave.tasks):
+            wave.status = "halted"
+            return False
+
+        if history is not None and uninterrupted:
+            history.record_wave(wave.wave_id, self._clock() - wave_started)
         wave.status = "completed"
-        wave.completed_at = time.time()
+        wave.completed_at = self._timestamp()
+        if self.metrics is not None:
+            self.metrics.waves_completed.inc()
         logger.info(f"Wave {wave.wave_id} completed")
         return True
 
     async def _perform_halt(self) -> None:
-        """Perform halt operation and record response time"""
-        halt_start = time.time()
+        """Enter HALTED and record request-to-quiesce latency"""
         self.state = ExecutionState.HALTED
-        self.halt_response_time = (time.time() - halt_start) * 1000  # Convert to ms
-        logger.info(f"Execution halted (response time: {self.halt_response_time:.2f}ms)")
+        if self._halt_requested_at is not None:
+            now = self._clock()
+            self.halt_response_time = (now - self._halt_requested_at) * 1000  # ms
+            self.halt_latencies.append(self.halt_response_time)
+            if self.metrics is not None:
+                self.metrics.halt_latency.observe(now - self._halt_requested_at)
+            if self.tracer is not None:
+                self.tracer.complete("HALT", "control", "control", self._halt_requested_at, now,
+                                     {"latency_ms": self.halt_response_time})
+            self._halt_requested_at = None
+            logger.info(f"Execution halted (response time: {self.halt_response_time:.2f}ms)")
+        else:
+            logger.info("Execution halted")
 
     def halt(self) -> Dict[str, Any]:
         """
@@ -166,9 +767,15 @@ class Orchestrator:
             Status dict with halt_requested flag and current state
         """
         logger.info("HALT requested")
-        self.halt_requested = True
+        if not self.halt_requested and self.state == ExecutionState.RUNNING:
+            self._halt_requested_at = self._clock()
+            if self.tracer is not None:
+                self.tracer.instant("HALT requested", "control", "control", self._halt_requested_at)
+        self._halt_event.set()
+        for executor in self.executors.values():
+            executor.halt()
 
-        # Return immediately - actual halt happens in execute loop
+        # Return immediately - running waves observe the halt event
         return {
             "halt_requested": True,
             "current_state": self.state.value,
@@ -187,7 +794,10 @@ class Orchestrator:
             raise ValueError(f"Cannot resume from state {self.state.value}")
 
         logger.info("Resuming execution")
-        self.halt_requested = False
+        if self.tracer is not None:
+            self.tracer.instant("RESUME", "control", "control", self._clock())
+        self._halt_event.clear()
+        self._halt_requested_at = None
         self.state = ExecutionState.RUNNING
 
         # Continue execution from current position
@@ -198,6 +808,8 @@ class Orchestrator:
         """
         Rollback execution state by N steps.
 
+        Snapshots newer than the target are discarded.
+
         Args:
             n_steps: Number of steps to rollback (1 = previous snapshot)
 
@@ -210,30 +822,37 @@ class Orchestrator:
         if n_steps < 1:
             raise ValueError("n_steps must be at least 1")
 
-        # Get rollback state
-        rollback_state = self.state_manager.get_rollback_state(n_steps)
+        started = self._clock()
+        # Get rollback state (discards snapshots newer than the target)
+        rollback_state = self.state_manager.rollback(n_steps, self._dirty_waves)
         if rollback_state is None:
             available = self.state_manager.get_snapshot_count()
             raise ValueError(f"Cannot rollback {n_steps} steps (only {available} snapshots available)")
 
         logger.info(f"Rolling back {n_steps} steps")
 
-        # Restore state
-        self.current_wave_index = rollback_state["wave_index"]
-        self.execution_history = rollback_state["execution_history"]
+        # Restore state: history is append-only, so truncate to the snapshot's offset
+        del self.execution_history[rollback_state["history_length"]:]
 
-        # Restore wave states
-        for i, wave_state in enumerate(rollback_state["waves_state"]):
+        # Restore only waves that differ from the target snapshot
+        waves_state = rollback_state["waves_state"]
+        for i in rollback_state["changed_waves"]:
             if i < len(self.waves):
-                self.waves[i].status = wave_state["status"]
-                self.waves[i].started_at = wave_state.get("started_at")
-                self.waves[i].completed_at = wave_state.get("completed_at")
+                self.waves[i].restore(waves_state[i])
+        self._dirty_waves = set()
+
+        self.current_wave_index = 0
+        self._advance_wave_index()
 
         # Reset execution state
         self.state = ExecutionState.IDLE
-        self.halt_requested = False
+        self._halt_event.clear()
+        self._halt_requested_at = None
 
         logger.info(f"Rolled back to wave {self.current_wave_index}")
+        if self.tracer is not None:
+            self.tracer.complete("ROLLBACK", "control", "control", started, self._clock(),
+                                 {"steps": n_steps, "wave_index": self.current_wave_index})
 
         return {
             "rollback_steps": n_steps,
@@ -242,39 +861,148 @@ class Orchestrator:
             "status": self.get_status()
         }
 
-    def get_status(self) -> Dict[str, Any]:
-        """Get current orchestrator status"""
+    def recover(self) -> Dict[str, Any]:
+        """
+        Rebuild waves, history and snapshots from the state manager's journal.
+
+        Waves that were in flight at the crash restart from pending (keeping
+        their completed tasks). The orchestrator is left HALTED so resume()
+        continues the run, or COMPLETED if nothing is left to do.
+
+        Returns:
+            Status dict after recovery
+
+        Raises:
+            ValueError: If there is no journaled state to recover
+        """
+        recovered = self.state_manager.recover()
+        if recovered is None:
+            raise ValueError("No journaled state to recover")
+
+        self._detach_source()
+        self.waves = []
+        self._dirty_waves = set()
+        self._require_resync()
+        self.add_waves(Wave.from_dict(record) for record in recovered["waves"])
+        self.execution_history = recovered["history"]
+        self._dirty_waves = set(recovered["changed_waves"])
+
+        self.current_wave_index = 0
+        self._advance_wave_index()
+        self._halt_event.clear()
+        self._halt_requested_at = None
+        self.state = (ExecutionState.COMPLETED if self.current_wave_index >= len(self.waves)
+                      else ExecutionState.HALTED)
+
+        logger.info(f"Recovered run at wave {self.current_wave_index}/{len(self.waves)}")
+        return self.get_status()
+
+    def _status_inputs(self) -> Tuple[Any, ...]:
+        """Everything _status_fields reads, cheap to compare"""
+        return (self.state, self.halt_requested, self.current_wave_index, len(self.waves),
+                self.streaming, self.state_version, sum(self.task_stats.values()),
+                len(self.execution_history), self.halt_response_time, len(self.halt_latencies),
+                self.state_manager.get_snapshot_count(), self._busy_accounted_at,
+                self._run_started, self._run_seconds,
+                self.makespan and self.makespan.get("actual_seconds"))
+
+    def _status_fields(self) -> Dict[str, Any]:
+        """Scalar status fields"""
         return {
             "state": self.state.value,
             "halt_requested": self.halt_requested,
             "current_wave_index": self.current_wave_index,
             "total_waves": len(self.waves),
-            "waves": [w.to_dict() for w in self.waves],
+            "streaming": self.streaming,
+            "agents": self._agent_utilization(),
+            "makespan": self._makespan_report(),
+            "task_stats": dict(self.task_stats),
             "execution_history_length": len(self.execution_history),
             "halt_response_time_ms": self.halt_response_time,
+            "halt_latency_p50_ms": percentile(self.halt_latencies, 50),
+            "halt_latency_p99_ms": percentile(self.halt_latencies, 99),
             "snapshots_available": self.state_manager.get_snapshot_count()
         }
 
+    def _makespan_report(self) -> Optional[Dict[str, Any]]:
+        """Predicted vs actual makespan (compare_makespan mode)"""
+        if self.makespan is None:
+            return None
+        return {k: v for k, v in self.makespan.items() if k != "run_seconds_at_start"}
+
+    def get_status(self, since_version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get current orchestrator status.
+
+        Args:
+            since_version: A version returned by an earlier call. If given and
+                still reconcilable, only fields and waves changed after it are
+                returned ("incremental": True).
+
+        Returns:
+            Status dict carrying the current "version"
+        """
+        # Fields are only recomputed when something they read has changed
+        if self._status_inputs() != self._field_inputs:
+            for name, value in self._status_fields().items():
+                if name not in self._field_values or self._field_values[name] != value:
+                    self.state_version += 1
+                    self._field_values[name] = value
+                    self._field_versions[name] = self.state_version
+            self._field_inputs = self._status_inputs()
+        fields = self._field_values
+
+        if (since_version is None or since_version < self._resync_version
+                or since_version > self.state_version):
+            status = dict(fields)
+            status["waves"] = [w.to_dict() for w in self.waves]
+            status["version"] = self.state_version
+            status["incremental"] = False
+            return status
+
+        changed_waves = []
+        for index, version in reversed(self._wave_versions.items()):
+            if version <= since_version:
+                break
+            changed_waves.append({"index": index, **self.waves[index].to_dict()})
+        changed_waves.reverse()
+
+        return {
+            "version": self.state_version,
+            "since_version": since_version,
+            "incremental": True,
+            "fields": {
+                name: value for name, value in fields.items()
+                if self._field_versions[name] > since_version
+            },
+            "waves": changed_waves
+        }
+
     async def _request_decision(
         self,
         question: str,
         options: List[DecisionOption],
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        wait: Optional[bool] = None
     ):
         """
         Request a decision during execution.
 
         If auto-approved (confidence >= 0.95), returns immediately.
-        If not auto-approved, waits for human approval via WebSocket.
+        If not auto-approved and waiting, awaits human approval (e.g. via
+        WebSocket) up to decision_timeout, then applies decision_fallback.
 
         Args:
             question: The decision question
             options: List of possible options
             context: Additional context
+            wait: Wait for approval (None = use wait_for_decisions)
 
         Returns:
-            Decision object with selected option
+            Decision object with selected option (or still pending when
+            not waiting)
         """
+        started = self._clock()
         decision = await self.decision_engine.request_decision(
             question=question,
             options=options,
@@ -282,25 +1010,67 @@ class Orchestrator:
         )
 
         if decision.auto_approved:
-            logger.info(f"Decision auto-approved: {decision.selected_option_id}")
+            source = "from cache" if decision.from_cache else "auto-approved"
+            logger.info(f"Decision {source}: {decision.selected_option_id}")
+            self._trace_decision(decision, started)
             return decision
 
-        # Not auto-approved - emit to dashboard and wait
+        # Not auto-approved - resolved through decision_engine.approve_decision()
         logger.info(f"Decision requires human approval: {decision.id}")
+        if self.wait_for_decisions if wait is None else wait:
+            decision = await self._await_decision(decision)
+
+        self._trace_decision(decision, started)
+        return decision
 
-        # In real implementation, this would emit via WebSocket
-        # and wait for approval. For now, we'll just log.
-        # The approval would come through decision_engine.approve_decision()
+    async def _await_decision(self, decision):
+        """Wait for a pending decision, applying the fallback on timeout"""
+        try:
+            return await self.decision_engine.wait_for_decision(decision.id, self.decision_timeout)
+        except asyncio.TimeoutError:
+            pass
 
+        logger.warning(f"Decision {decision.id} timed out after {self.decision_timeout}s "
+                       f"(fallback: {self.decision_fallback})")
+        if self.decision_fallback == "reject":
+            return self.decision_engine.reject_decision(decision.id, reason="timeout")
+        if self.decision_fallback == "best_option":
+            best = max(decision.options, key=lambda option: option.confidence)
+            return await self.decision_engine.approve_decision(decision.id, best.id,
+                                                               approved_by="fallback")
         return decision
 
+    def _trace_decision(self, decision, started: float) -> None:
+        """Record the time spent obtaining a decision"""
+        if self.tracer is not None:
+            self.tracer.complete(decision.question, "decision", "decisions", started, self._clock(),
+                                 {"decision_id": decision.id, "status": decision.status,
+                                  "auto_approved": decision.auto_approved})
+
+    def shutdown(self) -> None:
+        """Shut down all task executor backends and archive buffered decisions"""
+        for executor in self.executors.values():
+            executor.shutdown()
+        if self.decision_engine.archive is not None:
+            self.decision_engine.flush_archive()
+
     def reset(self) -> None:
         """Reset orchestrator to initial state"""
         self.state = ExecutionState.IDLE
-        self.halt_requested = False
+        self._halt_event.clear()
+        self._halt_requested_at = None
+        self._detach_source()
         self.waves = []
+        self._dirty_waves = set()
+        self._require_resync()
         self.current_wave_index = 0
         self.execution_history = []
         self.halt_response_time = None
+        self.halt_latencies.clear()
+        self._agent_busy = {}
+        self._busy_accounted_at = None
+        self._run_seconds = 0.0
+        self.makespan = None
+        self.task_stats.clear()
         self.state_manager.clear_snapshots()
         logger.info("Orchestrator reset")
@@ -0,0 +1,142 @@
+"""
+Retry Policies - Retries, timeouts and speculative re-execution for tasks
+
+A RetryPolicy wraps each task attempt with an optional timeout, retries
+failed attempts with exponential backoff and, once enough peers in the same
+wave have finished, launches a speculative copy of a straggling attempt.
+The first copy to succeed wins and the other is cancelled.
+"""
+
+import asyncio
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple, Type
+import logging
+
+from .stats import percentile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How a task attempt is bounded, retried and speculated.
+
+    Speculative copies run the handler twice, so only enable speculation
+    for idempotent tasks. Pool-backed losers cannot be interrupted and
+    finish in the background.
+    """
+    max_attempts: int = 1
+    base_delay: float = 0.1
+    multiplier: float = 2.0
+    max_delay: float = 10.0
+    jitter: float = 0.0  # fraction of the delay randomised either way
+    timeout: Optional[float] = None  # seconds per attempt
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+    speculate_percentile: Optional[float] = None  # e.g. 95; None disables
+    speculate_factor: float = 1.5  # straggler = peer percentile x factor
+    speculate_min_peers: int = 5
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if self.base_delay < 0 or self.max_delay < 0:
+            raise ValueError("Retry delays must not be negative")
+        if self.multiplier < 1:
+            raise ValueError("multiplier must be at least 1")
+        if not 0 <= self.jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError("timeout must be positive")
+        if self.speculate_percentile is not None and not 0 < self.speculate_percentile <= 100:
+            raise ValueError("speculate_percentile must be in (0, 100]")
+        if self.speculate_factor <= 0:
+            raise ValueError("speculate_factor must be positive")
+        if self.speculate_min_peers < 1:
+            raise ValueError("speculate_min_peers must be at least 1")
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number attempt (1 = first retry)"""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return delay
+
+    def straggler_threshold(self, peer_durations: Sequence[float]) -> Optional[float]:
+        """Seconds after which an attempt is speculated, or None"""
+        if self.speculate_percentile is None or len(peer_durations) < self.speculate_min_peers:
+            return None
+        return percentile(peer_durations, self.speculate_percentile) * self.speculate_factor
+
+    async def run(self, attempt: Callable[[], Awaitable[Any]],
+                  peer_durations: Sequence[float] = (),
+                  stats: Optional[Counter] = None) -> Any:
+        """
+        Run attempt() under this policy.
+
+        Args:
+            attempt: Starts one execution of the task
+            peer_durations: Durations of tasks already finished in the same
+                wave (read at each attempt)
+            stats: Counter updated with retries, timeouts,
+                speculative_launches and speculative_wins
+
+        Raises:
+            The last attempt's exception once attempts are exhausted, or
+            immediately for exceptions not in retry_on
+        """
+        stats = stats if stats is not None else Counter()
+        for attempt_number in range(1, self.max_attempts + 1):
+            try:
+                return await self._run_attempt(attempt, peer_durations, stats)
+            except self.retry_on as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    stats["timeouts"] += 1
+                if attempt_number == self.max_attempts:
+                    raise
+                delay = self.backoff(attempt_number)
+                stats["retries"] += 1
+                logger.warning(f"Task attempt {attempt_number} failed ({e!r}); retrying in {delay:.3f}s")
+                await asyncio.sleep(delay)
+
+    async def _run_attempt(self, attempt: Callable[[], Awaitable[Any]],
+                           peer_durations: Sequence[float], stats: Counter) -> Any:
+        """One attempt, bounded by timeout, with an optional speculative copy"""
+        threshold = self.straggler_threshold(peer_durations)
+        if threshold is None or (self.timeout is not None and threshold >= self.timeout):
+            if self.timeout is None:
+                return await attempt()
+            return await asyncio.wait_for(attempt(), self.timeout)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout if self.timeout is not None else None
+        copies: List[asyncio.Task] = [asyncio.ensure_future(attempt())]
+        try:
+            done, _ = await asyncio.wait(copies, timeout=threshold)
+            if not done:
+                stats["speculative_launches"] += 1
+                copies.append(asyncio.ensure_future(attempt()))
+
+            error: Optional[BaseException] = None
+            pending = set(copies)
+            while pending:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError()
+                done, pending = await asyncio.wait(pending, timeout=remaining,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise asyncio.TimeoutError()
+                for copy in done:
+                    if copy.exception() is None:
+                        if copy is not copies[0]:
+                            stats["speculative_wins"] += 1
+                        return copy.result()
+                    error = error or copy.exception()
+            raise error
+        finally:
+            for copy in copies:
+                copy.cancel()
+            await asyncio.gather(*copies, return_exceptions=True)
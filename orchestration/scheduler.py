@@ -0,0 +1,259 @@
+"""
+Wave Scheduler - Dependency-aware wave ordering
+
+Builds a DAG from each wave's declared dependencies and hands out waves
+as soon as everything they depend on has completed, so independent waves
+can execute concurrently. Ready waves are queued per agent so per-agent
+concurrency limits keep one busy agent from occupying every slot. Given
+duration estimates, ready waves are ordered by critical-path length.
+"""
+
+import heapq
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class WaveScheduler:
+    """
+    Tracks which waves are ready to run.
+
+    Dependencies come from Wave.depends_on:
+    - None: implicit dependency on the preceding wave (sequential plans)
+    - []: no dependencies, ready immediately
+    - ["wave_id", ...]: ready once every listed wave has completed
+
+    Waves appended to the plan after build() (streamed intake) are
+    registered with add() and may only depend on waves already known.
+
+    Each agent (Wave.agent_id) has its own ready queue and an optional limit
+    on concurrently running waves. Waves without an agent_id have no
+    affinity: they sit in a shared queue that any free slot can take from.
+    pop_ready() hands out the earliest ready wave whose agent is below its
+    limit.
+
+    When build() receives estimated durations, "earliest" means longest
+    remaining critical path first (the wave's duration plus the longest
+    chain of pending waves depending on it), with plan order breaking ties.
+    """
+
+    def __init__(self, agent_limits: Optional[Dict[str, int]] = None,
+                 default_agent_limit: Optional[int] = None):
+        """
+        Args:
+            agent_limits: Maximum concurrently running waves per agent_id
+            default_agent_limit: Limit for agents not in agent_limits
+                (None = unlimited)
+        """
+        for agent, limit in (agent_limits or {}).items():
+            if limit < 1:
+                raise ValueError(f"Concurrency limit for agent {agent} must be at least 1")
+        if default_agent_limit is not None and default_agent_limit < 1:
+            raise ValueError("default_agent_limit must be at least 1")
+
+        self.agent_limits = dict(agent_limits or {})
+        self.default_agent_limit = default_agent_limit
+        self.running_by_agent: Counter = Counter()
+        self._waves: List[Any] = []
+        self._index_by_id: Dict[str, int] = {}
+        self._dependents: Dict[int, List[int]] = {}
+        self._remaining: Dict[int, int] = {}
+        self._ready: Dict[Optional[str], List[Tuple[float, int]]] = {}
+        self._running: Dict[int, Optional[str]] = {}
+        self._critical_path: Dict[int, float] = {}
+
+    def build(self, waves: List[Any], durations: Optional[Dict[int, float]] = None) -> None:
+        """
+        Build the dependency graph for all waves that have not completed.
+
+        Args:
+            waves: List of Wave objects in plan order
+            durations: Estimated seconds per pending wave index. If given,
+                ready waves are ordered by critical-path length.
+
+        Raises:
+            ValueError: On duplicate wave ids, unknown dependencies or cycles
+        """
+        self._waves = waves
+        self._dependents = {}
+        self._remaining = {}
+        self._ready = {}
+        self._running = {}
+        self._critical_path = {}
+        self.running_by_agent = Counter()
+
+        index_by_id: Dict[str, int] = {}
+        for i, wave in enumerate(waves):
+            if wave.wave_id in index_by_id:
+                raise ValueError(f"Duplicate wave id {wave.wave_id}")
+            index_by_id[wave.wave_id] = i
+        self._index_by_id = index_by_id
+
+        ready = [
+            i for i, wave in enumerate(waves)
+            if wave.status != "completed"
+            and self._register(i, self.resolve_dependencies(i, wave, index_by_id))
+        ]
+        order = self._topological_order(ready)
+        if durations is not None:
+            self._compute_critical_paths(order, durations)
+
+        for i in ready:
+            self._ready.setdefault(waves[i].agent_id or None, []).append(self._ready_entry(i))
+        for queue in self._ready.values():
+            heapq.heapify(queue)
+
+    def add(self, index: int, wave: Any, duration: Optional[float] = None) -> None:
+        """
+        Register a wave that will be appended to the plan at index.
+
+        Call before appending the wave; nothing is registered on error.
+        duration is its estimated seconds (its critical path, since nothing
+        depends on it yet).
+
+        Raises:
+            ValueError: On a duplicate wave id or a dependency on a wave that
+                is not yet in the plan
+        """
+        if wave.wave_id in self._index_by_id:
+            raise ValueError(f"Duplicate wave id {wave.wave_id}")
+        deps = self.resolve_dependencies(index, wave, self._index_by_id)
+        self._index_by_id[wave.wave_id] = index
+        if duration is not None:
+            self._critical_path[index] = duration
+        if self._register(index, deps):
+            self._push_ready(index, wave)
+
+    def _register(self, index: int, deps: List[int]) -> bool:
+        """Record a wave's pending dependencies; returns True if it is ready"""
+        pending_deps = [dep for dep in deps if self._waves[dep].status != "completed"]
+        self._remaining[index] = len(pending_deps)
+        for dep in pending_deps:
+            self._dependents.setdefault(dep, []).append(index)
+        return not pending_deps
+
+    @staticmethod
+    def resolve_dependencies(index: int, wave: Any, index_by_id: Dict[str, int]) -> List[int]:
+        """Resolve a wave's dependencies to wave indices"""
+        if wave.depends_on is None:
+            return [index - 1] if index > 0 else []
+
+        deps = []
+        for dep_id in wave.depends_on:
+            if dep_id not in index_by_id:
+                raise ValueError(f"Wave {wave.wave_id} depends on unknown wave {dep_id}")
+            if index_by_id[dep_id] == index:
+                raise ValueError(f"Wave {wave.wave_id} depends on itself")
+            deps.append(index_by_id[dep_id])
+        return deps
+
+    def _topological_order(self, ready: List[int]) -> List[int]:
+        """
+        Order pending waves so dependencies come first.
+
+        Raises:
+            ValueError: If the pending dependency graph contains a cycle
+        """
+        remaining = dict(self._remaining)
+        stack = list(ready)
+        order = []
+
+        while stack:
+            index = stack.pop()
+            order.append(index)
+            for dependent in self._dependents.get(index, []):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    stack.append(dependent)
+
+        if len(order) < len(remaining):
+            blocked = sorted(i for i, count in remaining.items() if count > 0)
+            raise ValueError(f"Wave dependency cycle detected among wave indices {blocked}")
+        return order
+
+    def _compute_critical_paths(self, order: List[int], durations: Dict[int, float]) -> None:
+        """Longest duration chain starting at each pending wave"""
+        critical_path = self._critical_path
+        for index in reversed(order):
+            critical_path[index] = durations.get(index, 0.0) + max(
+                (critical_path[d] for d in self._dependents.get(index, [])), default=0.0
+            )
+
+    def critical_path_length(self) -> float:
+        """Estimated length of the longest pending dependency chain"""
+        return max(self._critical_path.values(), default=0.0)
+
+    def _ready_entry(self, index: int) -> Tuple[float, int]:
+        return (-self._critical_path.get(index, 0.0), index)
+
+    def pending_count(self) -> int:
+        """Number of registered waves that have not completed"""
+        return len(self._remaining)
+
+    def limit_for(self, agent: Optional[str]) -> Optional[int]:
+        """Concurrency limit for an agent (None = unlimited)"""
+        if agent is None:
+            return None
+        return self.agent_limits.get(agent, self.default_agent_limit)
+
+    def queued_by_agent(self) -> Dict[Optional[str], int]:
+        """Number of ready (not yet started) waves per agent"""
+        return {agent: len(queue) for agent, queue in self._ready.items() if queue}
+
+    def _next_queue(self) -> Optional[List[int]]:
+        """Ready queue holding the earliest wave that may start now"""
+        best = None
+        for agent, queue in self._ready.items():
+            if not queue:
+                continue
+            limit = self.limit_for(agent)
+            if limit is not None and self.running_by_agent[agent] >= limit:
+                continue
+            if best is None or queue[0] < best[0]:
+                best = queue
+        return best
+
+    def has_ready(self) -> bool:
+        """Check whether any ready wave may start within its agent's limit"""
+        return self._next_queue() is not None
+
+    def pop_ready(self) -> int:
+        """Pop the next wave to start (highest priority among agents below their limit)"""
+        queue = self._next_queue()
+        if queue is None:
+            raise IndexError("No wave can start")
+        _, index = heapq.heappop(queue)
+        agent = self._waves[index].agent_id or None
+        self._running[index] = agent
+        self.running_by_agent[agent] += 1
+        return index
+
+    def release(self, index: int) -> None:
+        """Free a started wave's agent slot without completing it (e.g. halted)"""
+        if index in self._running:
+            agent = self._running.pop(index)
+            self.running_by_agent[agent] -= 1
+            if not self.running_by_agent[agent]:
+                del self.running_by_agent[agent]
+
+    def complete(self, index: int) -> List[int]:
+        """
+        Mark a wave as completed and release its dependents.
+
+        Returns:
+            Indices of waves that became ready
+        """
+        self.release(index)
+        released = []
+        for dependent in self._dependents.pop(index, []):
+            self._remaining[dependent] -= 1
+            if self._remaining[dependent] == 0:
+                self._push_ready(dependent, self._waves[dependent])
+                released.append(dependent)
+        self._remaining.pop(index, None)
+        return released
+
+    def _push_ready(self, index: int, wave: Any) -> None:
+        heapq.heappush(self._ready.setdefault(wave.agent_id or None, []), self._ready_entry(index))
@@ -0,0 +1,285 @@
+"""
+Sharded Execution - Waves spread across worker processes over pipes
+
+A ShardedTaskExecutor starts one long-lived worker process (shard) per
+core and talks to each over a multiprocessing pipe. The coordinating
+Orchestrator keeps every Wave: shards only run task handlers and report
+completions back, so task progress lands in the coordinator's waves and
+its StateManager snapshots exactly as with in-process executors. Replies
+are read with loop.add_reader, so the coordinator spends no threads on IPC.
+
+HALT is propagated to every shard: each drops the tasks queued on it and
+acknowledges, typically within a pipe round trip. A task already running
+in a shard cannot be interrupted; it finishes in the background and its
+result is discarded (the task reruns on resume, as with pool executors).
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Deque, Dict, List, Optional
+import logging
+
+from .executors import TaskExecutor
+from .retry import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+# GIL switch interval (seconds) inside shards; bounds HALT acknowledgement
+# while a CPU-bound handler runs (the interpreter default is 5ms)
+SHARD_SWITCH_INTERVAL = 0.001
+
+
+def _shard_main(conn: Connection, handler: Callable[[str], Any]) -> None:
+    """
+    Shard process entry point.
+
+    A reader thread receives messages so HALT can drop queued tasks while
+    the main thread is busy running one. A short GIL switch interval lets
+    the reader preempt CPU-bound handlers quickly.
+    """
+    sys.setswitchinterval(SHARD_SWITCH_INTERVAL)
+    queue: Deque[tuple] = deque()
+    ready = threading.Condition()
+    send_lock = threading.Lock()
+    stopping = False
+
+    def send(message: tuple) -> None:
+        with send_lock:
+            conn.send(message)
+
+    def read() -> None:
+        nonlocal stopping
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                message = ("stop",)
+            kind = message[0]
+            with ready:
+                if kind == "run":
+                    queue.append(message)
+                elif kind == "halt":
+                    dropped = [queued[1] for queued in queue]
+                    queue.clear()
+                    send(("halted", message[1], dropped))
+                else:  # stop
+                    stopping = True
+                ready.notify()
+            if kind == "stop":
+                return
+
+    threading.Thread(target=read, name="shard-reader", daemon=True).start()
+
+    while True:
+        with ready:
+            while not queue and not stopping:
+                ready.wait()
+            if stopping:
+                break
+            _, request_id, task = queue.popleft()
+        started = time.perf_counter()
+        try:
+            result = handler(task)
+        except Exception as e:
+            reply = ("error", request_id, e, time.perf_counter() - started)
+        else:
+            reply = ("done", request_id, result, time.perf_counter() - started)
+        try:
+            send(reply)
+        except Exception as e:  # unpicklable result or exception
+            send(("error", request_id, RuntimeError(f"Unpicklable task reply: {e!r}"), reply[3]))
+    conn.close()
+
+
+class _Shard:
+    """Coordinator-side handle of one shard process"""
+
+    __slots__ = ("index", "process", "conn", "outstanding", "tasks", "busy_seconds", "alive")
+
+    def __init__(self, index: int, process: multiprocessing.Process, conn: Connection):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.outstanding: Dict[int, asyncio.Future] = {}
+        self.tasks = 0
+        self.busy_seconds = 0.0
+        self.alive = True
+
+
+class ShardedTaskExecutor(TaskExecutor):
+    """
+    Runs CPU-bound handlers on a fixed set of shard processes.
+
+    Each task goes to the shard with the fewest outstanding tasks, so
+    concurrent waves spread across cores. The handler must be picklable
+    (a module-level function). A shard that dies fails its outstanding
+    tasks and is replaced on the next dispatch.
+    """
+
+    name = "sharded"
+
+    def __init__(self, handler: Callable[[str], Any], shards: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None, mp_context: Optional[Any] = None):
+        """
+        Args:
+            handler: Task handler run inside the shard processes
+            shards: Number of shard processes (default: CPU count); also the
+                per-wave task concurrency
+            retry_policy: Overrides the orchestrator's default policy
+            mp_context: multiprocessing context (default: the platform default)
+        """
+        super().__init__(handler, shards or os.cpu_count() or 1, retry_policy)
+        self.mp_context = mp_context or multiprocessing.get_context()
+        self._shards: List[Optional[_Shard]] = [None] * self.max_concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._request_ids = itertools.count()
+        self._halt_id = 0
+        self._halt_pending: set = set()
+        self._halt_sent_at = 0.0
+        self.halt_latencies: Deque[float] = deque(maxlen=1000)  # ms until every shard acknowledged
+        self.dropped_on_halt = 0
+
+    def _spawn(self, index: int) -> _Shard:
+        parent_conn, child_conn = self.mp_context.Pipe()
+        process = self.mp_context.Process(target=_shard_main, args=(child_conn, self.handler),
+                                          name=f"shannon-shard-{index}", daemon=True)
+        process.start()
+        child_conn.close()
+        shard = self._shards[index] = _Shard(index, process, parent_conn)
+        self._loop.add_reader(parent_conn.fileno(), self._on_readable, shard)
+        logger.info(f"Started shard {index} (pid {process.pid})")
+        return shard
+
+    def _attach(self) -> None:
+        """Bind shard pipes to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        for shard in self._shards:
+            if shard is not None and shard.alive:
+                if self._loop is not None and not self._loop.is_closed():
+                    self._loop.remove_reader(shard.conn.fileno())
+                loop.add_reader(shard.conn.fileno(), self._on_readable, shard)
+        self._loop = loop
+
+    def _on_readable(self, shard: _Shard) -> None:
+        try:
+            while shard.conn.poll():
+                self._handle(shard, shard.conn.recv())
+        except (EOFError, OSError):
+            logger.warning(f"Shard {shard.index} exited; it is replaced on the next dispatch")
+            self._lose(shard, RuntimeError(f"Shard {shard.index} exited"))
+
+    def _handle(self, shard: _Shard, message: tuple) -> None:
+        kind = message[0]
+        if kind == "halted":
+            self.dropped_on_halt += len(message[2])
+            for request_id in message[2]:
+                future = shard.outstanding.pop(request_id, None)
+                if future is not None:
+                    future.cancel()
+            if message[1] == self._halt_id:
+                self._halt_pending.discard(shard.index)
+                if not self._halt_pending:
+                    self.halt_latencies.append((time.perf_counter() - self._halt_sent_at) * 1000)
+            return
+        _, request_id, payload, seconds = message
+        shard.tasks += 1
+        shard.busy_seconds += seconds
+        future = shard.outstanding.pop(request_id, None)
+        if future is None or future.done():
+            return  # abandoned (cancelled or dropped by HALT)
+        if kind == "done":
+            future.set_result(payload)
+        else:
+            future.set_exception(payload)
+
+    def _lose(self, shard: _Shard, error: Exception) -> None:
+        """Fail a dead shard's tasks and free its slot"""
+        if not shard.alive:
+            return
+        shard.alive = False
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.remove_reader(shard.conn.fileno())
+        shard.conn.close()
+        for future in shard.outstanding.values():
+            if not future.done():
+                future.set_exception(error)
+        shard.outstanding.clear()
+        self._halt_pending.discard(shard.index)
+        self._shards[shard.index] = None
+
+    def _pick(self) -> _Shard:
+        best: Optional[_Shard] = None
+        for index, shard in enumerate(self._shards):
+            if shard is None:
+                shard = self._spawn(index)
+            if best is None or len(shard.outstanding) < len(best.outstanding):
+                best = shard
+                if not shard.outstanding:
+                    break
+        return best
+
+    async def run(self, task: str) -> Any:
+        self._attach()
+        shard = self._pick()
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        shard.outstanding[request_id] = future
+        try:
+            shard.conn.send(("run", request_id, task))
+        except (OSError, ValueError) as e:
+            self._lose(shard, RuntimeError(f"Shard {shard.index} unreachable: {e}"))
+        try:
+            return await future
+        finally:
+            shard.outstanding.pop(request_id, None)
+
+    def halt(self) -> None:
+        """Drop the tasks queued on every shard; acknowledgements land in halt_latencies"""
+        self._halt_id += 1
+        self._halt_sent_at = time.perf_counter()
+        self._halt_pending = set()
+        for shard in self._shards:
+            if shard is None or not shard.alive:
+                continue
+            try:
+                shard.conn.send(("halt", self._halt_id))
+                self._halt_pending.add(shard.index)
+            except (OSError, ValueError) as e:
+                self._lose(shard, RuntimeError(f"Shard {shard.index} unreachable: {e}"))
+
+    @property
+    def halt_acknowledged(self) -> bool:
+        """Whether every shard acknowledged the last HALT"""
+        return not self._halt_pending
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-shard pid, tasks completed, busy seconds and outstanding tasks"""
+        return [
+            {"shard": index, "pid": shard.process.pid, "tasks": shard.tasks,
+             "busy_seconds": shard.busy_seconds, "outstanding": len(shard.outstanding)}
+            for index, shard in enumerate(self._shards) if shard is not None
+        ]
+
+    def shutdown(self) -> None:
+        for shard in self._shards:
+            if shard is None:
+                continue
+            try:
+                shard.conn.send(("stop",))
+            except (OSError, ValueError):
+                pass
+            self._lose(shard, RuntimeError(f"Shard {shard.index} shut down"))
+            shard.process.join(timeout=1)
+            if shard.process.is_alive():
+                shard.process.terminate()
+                shard.process.join(timeout=1)
+        logger.info("Shut down sharded executor")
@@ -2,31 +2,173 @@
 State Manager - Handles execution state snapshots and rollback
 
 Provides snapshot functionality for rollback operations.
+
+Snapshots share structure instead of deep-copying: wave records live in a
+persistent chunked table where a new snapshot only copies the chunks whose
+waves changed, and execution history is append-only so a snapshot just
+remembers its length.
+
+Retained snapshots form a ring buffer bounded by count and, optionally, by
+an approximate byte budget, with optional thinning of old snapshots.
+
+With a SnapshotJournal attached, snapshots, history records and rollbacks
+are also written to disk so state survives a crash (see recover()).
 """
 
+import sys
 import time
-import copy
-from typing import Dict, List, Optional, Any
+from collections import deque
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Any, Tuple
 import logging
+from .journal import SnapshotJournal
 
 logger = logging.getLogger(__name__)
 
 
+class WaveTable:
+    """
+    Persistent vector of wave records with structural sharing.
+
+    Records are the dicts produced by Wave.to_dict() and are treated as
+    read-only once stored. update() returns a new table that shares every
+    untouched chunk with the original.
+    """
+
+    CHUNK_SIZE = 64
+
+    __slots__ = ("_chunks", "_length")
+
+    def __init__(self, chunks: Tuple[Tuple[Dict[str, Any], ...], ...] = (), length: int = 0):
+        self._chunks = chunks
+        self._length = length
+
+    def new_bytes(self, base: Optional["WaveTable"]) -> int:
+        """
+        Approximate bytes allocated by this table that it does not share with base.
+
+        Counts the chunk index, chunks not present in base and the records
+        inside them that base does not hold.
+        """
+        base_chunks = base._chunks if base is not None else ()
+        total = sys.getsizeof(self._chunks)
+        for chunk_index, chunk in enumerate(self._chunks):
+            base_chunk = base_chunks[chunk_index] if chunk_index < len(base_chunks) else ()
+            if chunk is base_chunk:
+                continue
+            total += sys.getsizeof(chunk)
+            for offset, record in enumerate(chunk):
+                if offset >= len(base_chunk) or record is not base_chunk[offset]:
+                    total += _record_bytes(record)
+        return total
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "WaveTable":
+        """Build a table from a full list of records"""
+        size = cls.CHUNK_SIZE
+        chunks = tuple(tuple(records[i:i + size]) for i in range(0, len(records), size))
+        return cls(chunks, len(records))
+
+    def update(self, updates: Dict[int, Dict[str, Any]]) -> "WaveTable":
+        """
+        Return a new table with the given indices replaced.
+
+        Indices may extend the table by appending directly after its end.
+        """
+        if not updates:
+            return self
+
+        size = self.CHUNK_SIZE
+        length = max(self._length, max(updates) + 1)
+        chunks = list(self._chunks)
+        by_chunk: Dict[int, List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, record in updates.items():
+            by_chunk.setdefault(index // size, []).append((index % size, record))
+
+        for chunk_index in sorted(by_chunk):
+            chunk = list(chunks[chunk_index]) if chunk_index < len(chunks) else []
+            for offset, record in sorted(by_chunk[chunk_index], key=lambda item: item[0]):
+                if offset < len(chunk):
+                    chunk[offset] = record
+                elif offset == len(chunk):
+                    chunk.append(record)
+                else:
+                    raise IndexError(f"Wave record {chunk_index * size + offset} leaves a gap")
+            if chunk_index < len(chunks):
+                chunks[chunk_index] = tuple(chunk)
+            elif chunk_index == len(chunks):
+                chunks.append(tuple(chunk))
+            else:
+                raise IndexError(f"Wave record {chunk_index * size} leaves a gap")
+
+        return WaveTable(tuple(chunks), length)
+
+    def changed_indices(self, other: "WaveTable") -> List[int]:
+        """Indices whose records differ (by identity) between two tables"""
+        size = self.CHUNK_SIZE
+        changed = []
+        for chunk_index in range(max(len(self._chunks), len(other._chunks))):
+            mine = self._chunks[chunk_index] if chunk_index < len(self._chunks) else ()
+            theirs = other._chunks[chunk_index] if chunk_index < len(other._chunks) else ()
+            if mine is theirs:
+                continue
+            for offset in range(max(len(mine), len(theirs))):
+                if offset >= len(mine) or offset >= len(theirs) or mine[offset] is not theirs[offset]:
+                    changed.append(chunk_index * size + offset)
+        return changed
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("WaveTable index out of range")
+        return self._chunks[index // self.CHUNK_SIZE][index % self.CHUNK_SIZE]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for chunk in self._chunks:
+            yield from chunk
+
+
+def _record_bytes(record: Dict[str, Any]) -> int:
+    """Shallow size of a wave record (the tasks list is shared with the Wave)"""
+    return sys.getsizeof(record) + sum(
+        sys.getsizeof(value) for key, value in record.items() if key != "tasks"
+    )
+
+
 class StateSnapshot:
-    """Represents a snapshot of execution state at a point in time"""
+    """
+    Represents a snapshot of execution state at a point in time.
+
+    history_length is an offset into the orchestrator's append-only
+    execution history; waves_state is a WaveTable shared with neighbouring
+    snapshots. approx_bytes counts the memory this snapshot holds beyond the
+    retained snapshot before it (everything, for the oldest), so the sum
+    over retained snapshots is the memory they keep alive.
+    """
+
+    __slots__ = ("sequence", "wave_index", "history_length", "waves_state",
+                 "timestamp", "approx_bytes")
 
-    def __init__(self, wave_index: int, execution_history: List[Dict], waves_state: List[Dict]):
+    def __init__(self, wave_index: int, history_length: int, waves_state: WaveTable,
+                 sequence: int = 0, approx_bytes: int = 0):
+        self.sequence = sequence
         self.wave_index = wave_index
-        self.execution_history = copy.deepcopy(execution_history)
-        self.waves_state = copy.deepcopy(waves_state)
+        self.history_length = history_length
+        self.waves_state = waves_state
         self.timestamp = time.time()
+        self.approx_bytes = approx_bytes
 
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "sequence": self.sequence,
             "wave_index": self.wave_index,
-            "execution_history_length": len(self.execution_history),
+            "execution_history_length": self.history_length,
             "waves_count": len(self.waves_state),
-            "timestamp": self.timestamp
+            "timestamp": self.timestamp,
+            "approx_bytes": self.approx_bytes
         }
 
 
@@ -35,41 +177,162 @@ class StateManager:
     Manages execution state snapshots for rollback capability.
 
     Features:
-    - create_snapshot(): Save current execution state
+    - create_snapshot(): Save current execution state (O(changed waves))
     - get_snapshot(n): Get snapshot from N steps ago
     - rollback(n): Restore state from N steps ago
+
+    Retention:
+    - max_snapshots: Hard cap on retained snapshots
+    - max_bytes: Optional approximate memory budget for retained snapshots
+    - thin_every: When over budget, first drop snapshots in the older half
+      whose sequence is not a multiple of N, so deep rollback stays possible
+
+    Durability:
+    - journal: Optional SnapshotJournal receiving every state change
     """
 
-    def __init__(self):
-        self.snapshots: List[StateSnapshot] = []
-        self.max_snapshots = 100  # Keep last 100 snapshots
+    def __init__(self, max_snapshots: int = 100, max_bytes: Optional[int] = None,
+                 thin_every: Optional[int] = None, journal: Optional[SnapshotJournal] = None):
+        if max_snapshots < 1:
+            raise ValueError("max_snapshots must be at least 1")
+        if thin_every is not None and thin_every < 2:
+            raise ValueError("thin_every must be at least 2")
+
+        self.snapshots: Deque[StateSnapshot] = deque()
+        self.max_snapshots = max_snapshots
+        self.max_bytes = max_bytes
+        self.thin_every = thin_every
+        self.total_bytes = 0
+        self._sequence = 0
+        self._table: Optional[WaveTable] = None
+        self.journal = journal
 
     def create_snapshot(self, wave_index: int, execution_history: List[Dict],
-                       waves: List[Any]) -> StateSnapshot:
+                        waves: List[Any], changed: Optional[Iterable[int]] = None) -> StateSnapshot:
         """
         Create a snapshot of current execution state.
 
         Args:
             wave_index: Current wave index being executed
-            execution_history: List of execution history records
+            execution_history: Append-only list of execution history records
             waves: List of Wave objects
+            changed: Indices of waves modified since the previous snapshot.
+                None captures every wave.
 
         Returns:
             StateSnapshot object
         """
-        # Convert waves to serializable format
-        waves_state = [w.to_dict() for w in waves]
+        base = self._table
+        if base is None or changed is None:
+            updates = {i: w.to_dict() for i, w in enumerate(waves)}
+            table = WaveTable.from_records(list(updates.values()))
+        else:
+            updates = {i: waves[i].to_dict() for i in changed if i < len(waves)}
+            for i in range(len(base), len(waves)):
+                updates[i] = waves[i].to_dict()
+            table = base.update(updates)
 
-        snapshot = StateSnapshot(wave_index, execution_history, waves_state)
-        self.snapshots.append(snapshot)
+        snapshot = self._add_snapshot(wave_index, len(execution_history), table)
 
-        # Trim old snapshots if exceeding max
-        if len(self.snapshots) > self.max_snapshots:
-            self.snapshots = self.snapshots[-self.max_snapshots:]
+        if self.journal is not None:
+            self.journal.append({
+                "op": "snapshot",
+                "wave_index": wave_index,
+                "history_length": snapshot.history_length,
+                "timestamp": snapshot.timestamp,
+                "full": base is None or changed is None,
+                "waves": sorted(updates.items())
+            })
 
         logger.info(f"Created snapshot at wave {wave_index} (total snapshots: {len(self.snapshots)})")
         return snapshot
 
+    def _add_snapshot(self, wave_index: int, history_length: int, table: WaveTable,
+                      timestamp: Optional[float] = None) -> StateSnapshot:
+        """Append a snapshot of table to the ring buffer and enforce the budget"""
+        base = self._table
+        self._table = table
+        self._sequence += 1
+        snapshot = StateSnapshot(wave_index, history_length, table, sequence=self._sequence)
+        if timestamp is not None:
+            snapshot.timestamp = timestamp
+        snapshot.approx_bytes = table.new_bytes(base) + sys.getsizeof(snapshot)
+        self.snapshots.append(snapshot)
+        self.total_bytes += snapshot.approx_bytes
+        self._enforce_budget()
+        return snapshot
+
+    def record_history(self, execution_history: List[Dict], wave: Any) -> None:
+        """
+        Journal the newest history entry together with the progress of its wave.
+
+        The entry must carry the wave's wave_index and status.
+        """
+        if self.journal is not None:
+            done = len(wave.completed_tasks) == len(wave.tasks)
+            self.journal.append({
+                "op": "history",
+                "entry": execution_history[-1],
+                "wave": [wave.started_at, wave.completed_at,
+                         None if done else sorted(wave.completed_tasks)]
+            })
+
+    def sync(self) -> None:
+        """Make everything journaled so far durable"""
+        if self.journal is not None:
+            self.journal.sync()
+
+    def _over_budget(self) -> bool:
+        if len(self.snapshots) > self.max_snapshots:
+            return True
+        return (self.max_bytes is not None and self.total_bytes > self.max_bytes
+                and len(self.snapshots) > 1)
+
+    def _enforce_budget(self) -> None:
+        """Thin and then evict the oldest snapshots until within budget"""
+        while self._over_budget():
+            if self.thin_every is not None and self._thin():
+                continue
+            self._drop(0)
+
+    def _drop(self, index: int) -> None:
+        """Remove a retained snapshot, charging memory it shared to its successor"""
+        dropped = self.snapshots[index]
+        del self.snapshots[index]
+        self.total_bytes -= dropped.approx_bytes
+        if index == len(self.snapshots):
+            return
+        successor = self.snapshots[index]
+        previous_cost = successor.approx_bytes
+        if index == 0:
+            # The successor now owns everything it shared with the dropped
+            # oldest snapshot: its full size, derived from the tables' difference
+            successor.approx_bytes = (dropped.approx_bytes - sys.getsizeof(dropped)
+                                      + previous_cost
+                                      - dropped.waves_state.new_bytes(successor.waves_state))
+        else:
+            base = self.snapshots[index - 1].waves_state
+            successor.approx_bytes = successor.waves_state.new_bytes(base) + sys.getsizeof(successor)
+        self.total_bytes += successor.approx_bytes - previous_cost
+
+    def _thin(self) -> bool:
+        """
+        Drop snapshots in the older half whose sequence is not a multiple of thin_every.
+
+        Returns:
+            True if any snapshot was dropped
+        """
+        older = len(self.snapshots) // 2
+        dropped = 0
+        # Newest first, so each drop rebases a successor that is already final
+        for i in range(older - 1, -1, -1):
+            if self.snapshots[i].sequence % self.thin_every != 0:
+                self._drop(i)
+                dropped += 1
+        if dropped:
+            logger.info(f"Thinned {dropped} old snapshots (keeping every {self.thin_every}th)")
+        return dropped > 0
+
     def get_snapshot(self, steps_back: int) -> Optional[StateSnapshot]:
         """
         Get snapshot from N steps back.
@@ -96,7 +359,8 @@ class StateManager:
             steps_back: Number of steps to rollback
 
         Returns:
-            Dict with wave_index, execution_history, and waves_state
+            Dict with wave_index, history_length, waves_state (read-only
+            WaveTable) and snapshot_timestamp
         """
         snapshot = self.get_snapshot(steps_back)
         if snapshot is None:
@@ -104,28 +368,124 @@ class StateManager:
 
         return {
             "wave_index": snapshot.wave_index,
-            "execution_history": copy.deepcopy(snapshot.execution_history),
-            "waves_state": copy.deepcopy(snapshot.waves_state),
+            "history_length": snapshot.history_length,
+            "waves_state": snapshot.waves_state,
             "snapshot_timestamp": snapshot.timestamp
         }
 
+    def rollback(self, steps_back: int, changed: Iterable[int] = ()) -> Optional[Dict[str, Any]]:
+        """
+        Make the snapshot N steps back the latest one.
+
+        Snapshots newer than the target are discarded, since the history they
+        point into is truncated by the rollback.
+
+        Args:
+            steps_back: Number of steps to rollback
+            changed: Indices of waves modified since the latest snapshot
+
+        Returns:
+            get_rollback_state() dict plus changed_waves: indices whose live
+            state may differ from the target and must be restored
+        """
+        state = self.get_rollback_state(steps_back)
+        if state is None:
+            return None
+
+        target = state["waves_state"]
+        restore = set(changed)
+        restore.update(self._table.changed_indices(target) if self._table else range(len(target)))
+        state["changed_waves"] = sorted(i for i in restore if i < len(target))
+        for _ in range(steps_back - 1):
+            self.total_bytes -= self.snapshots.pop().approx_bytes
+        self._table = target
+
+        if self.journal is not None:
+            self.journal.append({
+                "op": "rollback",
+                "steps": steps_back,
+                "history_length": state["history_length"],
+                "waves": [[i, target[i]] for i in state["changed_waves"]]
+            })
+            self.journal.sync()
+        return state
+
+    def recover(self) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild snapshots and durable state from the journal.
+
+        Returns:
+            None if there is nothing to recover, otherwise a dict with the
+            latest wave records (index order), the execution history and the
+            indices whose live record differs from the latest snapshot
+        """
+        if self.journal is None:
+            return None
+
+        records = self.journal.load()
+        self.snapshots.clear()
+        self.total_bytes = 0
+        self._table = None
+
+        for record in records:
+            op = record["op"]
+            if op == "checkpoint":
+                self.snapshots.clear()
+                self.total_bytes = 0
+                self._table = None
+                table = WaveTable.from_records(record["waves"])
+                self._add_snapshot(0, len(record["history"]), table, record["timestamp"])
+            elif op == "snapshot":
+                base = self._table if self._table is not None and not record["full"] else WaveTable()
+                table = base.update(dict(record["waves"]))
+                self._add_snapshot(record["wave_index"], record["history_length"], table,
+                                   record["timestamp"])
+            elif op == "rollback":
+                for _ in range(min(record["steps"] - 1, len(self.snapshots) - 1)):
+                    self.total_bytes -= self.snapshots.pop().approx_bytes
+                self._table = self.snapshots[-1].waves_state if self.snapshots else None
+
+        state = self.journal.latest_state()
+        if not state["waves"] and not state["history"]:
+            return None
+
+        table = self._table or WaveTable()
+        waves = state["waves"]
+        state["changed_waves"] = [
+            i for i, wave_record in enumerate(waves)
+            if i >= len(table) or table[i] is not wave_record
+        ]
+        logger.info(f"Recovered {len(waves)} waves, {len(state['history'])} history entries "
+                    f"and {len(self.snapshots)} snapshots from journal")
+        return state
+
     def clear_snapshots(self) -> None:
         """Clear all snapshots"""
         self.snapshots.clear()
+        self.total_bytes = 0
+        self._table = None
+        if self.journal is not None:
+            self.journal.clear()
         logger.info("Cleared all snapshots")
 
     def get_snapshot_count(self) -> int:
         """Get total number of snapshots"""
         return len(self.snapshots)
 
+    def get_memory_usage(self) -> int:
+        """Approximate bytes held by retained snapshots"""
+        return self.total_bytes
+
     def list_snapshots(self) -> List[Dict[str, Any]]:
-        """List all snapshots with basic info"""
+        """List all snapshots with basic info and approximate memory"""
         return [
             {
                 "index": i,
+                "sequence": snapshot.sequence,
                 "wave_index": snapshot.wave_index,
                 "timestamp": snapshot.timestamp,
-                "execution_history_length": len(snapshot.execution_history)
+                "execution_history_length": snapshot.history_length,
+                "approx_bytes": snapshot.approx_bytes
             }
             for i, snapshot in enumerate(self.snapshots)
         ]
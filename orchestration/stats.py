@@ -0,0 +1,15 @@
+"""
+Small statistics helpers shared by the orchestration modules
+"""
+
+import math
+from typing import Iterable, Optional
+
+
+def percentile(samples: Iterable[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of samples, or None if there are none"""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -0,0 +1,126 @@
+"""
+Trace Recorder - Low-overhead span events exported as Chrome trace JSON
+
+The orchestrator records wave, task, snapshot, control (HALT, RESUME,
+ROLLBACK) and decision spans into a fixed-size ring buffer. Recording only
+appends a tuple; names, tracks and microsecond timestamps are resolved at
+export time. The export loads in Perfetto (ui.perfetto.dev) or
+chrome://tracing, where concurrent waves appear as parallel tracks.
+"""
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Hashable, List, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Raw event: (phase, name, category, track, start, end, args)
+_Event = Tuple[str, str, str, Hashable, float, float, Optional[Dict[str, Any]]]
+
+
+class TraceRecorder:
+    """
+    Ring buffer of trace events.
+
+    Timestamps are seconds from the orchestrator's clock; the export shifts
+    them so the oldest retained event starts at zero. Once capacity is
+    reached the oldest events are overwritten (dropped counts them).
+
+    Tracks group events into Perfetto threads. Any hashable works; a tuple
+    ("wave", 3) is displayed as "wave 3".
+    """
+
+    DEFAULT_CAPACITY = 100000
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, task_spans: bool = False):
+        """
+        Args:
+            capacity: Maximum events retained
+            task_spans: Also record a span per task. Off by default: with
+                tasks that do little work it adds about 10% to run time,
+                while wave-level and control events cost a few percent at
+                most (checked by benchmarks.orchestrator_bench)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.task_spans = task_spans
+        self.recorded = 0
+        self._events: Deque[_Event] = deque(maxlen=capacity)
+
+    def complete(self, name: str, category: str, track: Hashable, start: float, end: float,
+                 args: Optional[Dict[str, Any]] = None) -> None:
+        """Record a span that ran from start to end"""
+        self._events.append(("X", name, category, track, start, end, args))
+        self.recorded += 1
+
+    def instant(self, name: str, category: str, track: Hashable, at: float,
+                args: Optional[Dict[str, Any]] = None) -> None:
+        """Record a point-in-time event"""
+        self._events.append(("i", name, category, track, at, at, args))
+        self.recorded += 1
+
+    @property
+    def dropped(self) -> int:
+        """Events overwritten because the buffer was full"""
+        return self.recorded - len(self._events)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def clear(self) -> None:
+        self._events.clear()
+        self.recorded = 0
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build a Chrome trace (JSON object format) from the buffer"""
+        events = list(self._events)
+        origin = min((e[4] for e in events), default=0.0)
+        track_ids: Dict[Hashable, int] = {}
+        trace: List[Dict[str, Any]] = []
+
+        for phase, name, category, track, start, end, args in events:
+            tid = track_ids.get(track)
+            if tid is None:
+                tid = track_ids[track] = len(track_ids) + 1
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": phase,
+                "ts": round((start - origin) * 1e6, 3),
+                "pid": 1,
+                "tid": tid
+            }
+            if phase == "X":
+                event["dur"] = round((end - start) * 1e6, 3)
+            else:
+                event["s"] = "g"
+            if args:
+                event["args"] = args
+            trace.append(event)
+
+        metadata = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 0,
+                     "args": {"name": "shannon orchestrator"}}]
+        for track, tid in track_ids.items():
+            label = " ".join(str(part) for part in track) if isinstance(track, tuple) else str(track)
+            metadata.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                             "args": {"name": label}})
+            metadata.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": tid,
+                             "args": {"sort_index": tid}})
+
+        return {
+            "traceEvents": metadata + trace,
+            "displayTimeUnit": "ms",
+            "otherData": {"recorded": self.recorded, "dropped": self.dropped}
+        }
+
+    def export(self, path: Union[str, Path]) -> Path:
+        """Write the Chrome trace JSON to path"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, separators=(",", ":"))
+        logger.info(f"Exported {len(self._events)} trace events to {path}")
+        return path
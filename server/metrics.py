@@ -0,0 +1,56 @@
+"""
+Shannon Metrics Endpoint
+
+Prometheus text exposition of orchestrator and server metrics, served at
+GET /metrics on the same ASGI app as the Socket.IO server.
+"""
+from typing import Any, Callable, Dict
+
+from orchestration.metrics import DecisionMetrics, MetricsRegistry, OrchestratorMetrics
+
+METRICS_PATH = '/metrics'
+
+# Registry shared by the orchestrator metrics and the server metrics below
+registry = MetricsRegistry()
+
+# Attached to the orchestrator registered with the server
+orchestrator_metrics = OrchestratorMetrics(registry)
+
+connected_clients = registry.gauge(
+    'shannon_connected_clients', 'Socket.IO clients currently connected')
+emits_total = registry.counter(
+    'shannon_socketio_emits_total', 'Socket.IO events emitted')
+
+# Recorded by the server's decision engine
+decision_metrics = DecisionMetrics(registry)
+pending_decisions = decision_metrics.pending
+decision_wait_seconds = decision_metrics.wait_seconds
+
+
+async def _send_response(send: Callable, status: int, body: bytes, content_type: str,
+                         head: bool = False) -> None:
+    """Send a complete response; head sends the headers of body without it"""
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', content_type.encode()),
+            (b'content-length', str(len(body)).encode())
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': b'' if head else body})
+
+
+async def metrics_app(scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+    """ASGI app serving GET and HEAD /metrics; any other path is a 404"""
+    if scope['type'] != 'http':
+        return
+    if scope['path'].rstrip('/') != METRICS_PATH:
+        await _send_response(send, 404, b'Not Found', 'text/plain')
+        return
+    if scope['method'] not in ('GET', 'HEAD'):
+        await _send_response(send, 405, b'Method Not Allowed', 'text/plain')
+        return
+    body = registry.render().encode()
+    await _send_response(send, 200, body, MetricsRegistry.CONTENT_TYPE,
+                         head=scope['method'] == 'HEAD')
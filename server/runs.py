@@ -0,0 +1,164 @@
+"""
+Shannon Run Registry
+
+Tracks the orchestrator runs a server process drives, keyed by run id.
+All runs share the server's event loop; each run gets its own resource
+limits, and an optional cap bounds how many runs execute at once (runs
+started beyond it wait for a free slot).
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_RUN_ID = 'default'
+
+
+@dataclass
+class RunLimits:
+    """Per-run resource limits (None = keep the orchestrator's own setting)"""
+    max_concurrent_waves: Optional[int] = None
+    max_snapshots: Optional[int] = None
+    max_snapshot_bytes: Optional[int] = None
+
+    def __post_init__(self):
+        for name in ('max_concurrent_waves', 'max_snapshots', 'max_snapshot_bytes'):
+            value = getattr(self, name)
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be at least 1")
+
+    def apply(self, orchestrator: Any) -> None:
+        """Tighten the orchestrator's settings to these limits"""
+        if self.max_concurrent_waves is not None:
+            orchestrator.max_concurrent_waves = min(orchestrator.max_concurrent_waves,
+                                                    self.max_concurrent_waves)
+        state_manager = orchestrator.state_manager
+        if self.max_snapshots is not None:
+            state_manager.max_snapshots = min(state_manager.max_snapshots, self.max_snapshots)
+        if self.max_snapshot_bytes is not None:
+            state_manager.max_bytes = (self.max_snapshot_bytes if state_manager.max_bytes is None
+                                       else min(state_manager.max_bytes, self.max_snapshot_bytes))
+
+
+class Run:
+    """An orchestrator registered under a run id"""
+
+    __slots__ = ('run_id', 'orchestrator', 'limits', 'last_broadcast_version', 'task')
+
+    def __init__(self, run_id: str, orchestrator: Any, limits: Optional[RunLimits] = None):
+        self.run_id = run_id
+        self.orchestrator = orchestrator
+        self.limits = limits
+        # Status version covered by the last broadcast (None until the first full broadcast)
+        self.last_broadcast_version: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def room(self) -> str:
+        """Socket.IO room of clients following this run"""
+        return f"run:{self.run_id}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'run_id': self.run_id,
+            'state': self.orchestrator.state.value,
+            'total_waves': len(self.orchestrator.waves),
+            'running': self.task is not None and not self.task.done()
+        }
+
+
+class RunRegistry:
+    """
+    Runs keyed by run id.
+
+    - max_runs: Maximum registered runs (None = unlimited)
+    - max_active_runs: Maximum runs executing at once through start()
+    - default_limits: RunLimits applied to runs registered without their own
+    """
+
+    def __init__(self, max_runs: Optional[int] = None, max_active_runs: Optional[int] = None,
+                 default_limits: Optional[RunLimits] = None):
+        if max_runs is not None and max_runs < 1:
+            raise ValueError("max_runs must be at least 1")
+        if max_active_runs is not None and max_active_runs < 1:
+            raise ValueError("max_active_runs must be at least 1")
+        self.max_runs = max_runs
+        self.max_active_runs = max_active_runs
+        self.default_limits = default_limits
+        self._runs: Dict[str, Run] = {}
+        self._active: Optional[asyncio.Semaphore] = None
+
+    def register(self, run_id: str, orchestrator: Any, limits: Optional[RunLimits] = None,
+                 replace: bool = False) -> Run:
+        """
+        Register orchestrator under run_id and apply its limits.
+
+        Raises:
+            ValueError: If run_id is taken (and replace is False) or the
+                registry is full
+        """
+        if not run_id:
+            raise ValueError("run_id must not be empty")
+        if run_id in self._runs:
+            if not replace:
+                raise ValueError(f"Run {run_id} already registered")
+            self.remove(run_id)
+        if self.max_runs is not None and len(self._runs) >= self.max_runs:
+            raise ValueError(f"Run limit reached ({self.max_runs})")
+
+        limits = limits or self.default_limits
+        if limits is not None:
+            limits.apply(orchestrator)
+        run = self._runs[run_id] = Run(run_id, orchestrator, limits)
+        return run
+
+    def remove(self, run_id: str) -> Optional[Run]:
+        """Unregister a run, cancelling its execution if start() launched it"""
+        run = self._runs.pop(run_id, None)
+        if run is not None and run.task is not None:
+            run.task.cancel()
+        return run
+
+    def get(self, run_id: str) -> Optional[Run]:
+        return self._runs.get(run_id)
+
+    def start(self, run_id: str) -> asyncio.Task:
+        """
+        Execute a registered run as a task on the running event loop.
+
+        With max_active_runs, the run waits for a free slot before executing.
+
+        Raises:
+            ValueError: If the run is unknown or already executing
+        """
+        run = self._runs.get(run_id)
+        if run is None:
+            raise ValueError(f"Unknown run: {run_id}")
+        if run.task is not None and not run.task.done():
+            raise ValueError(f"Run {run_id} is already executing")
+        run.task = asyncio.create_task(self._execute(run), name=f"run:{run_id}")
+        return run.task
+
+    async def _execute(self, run: Run) -> Dict[str, Any]:
+        if self.max_active_runs is None:
+            return await run.orchestrator.execute()
+        if self._active is None:
+            self._active = asyncio.Semaphore(self.max_active_runs)
+        async with self._active:
+            return await run.orchestrator.execute()
+
+    @property
+    def active_count(self) -> int:
+        """Runs currently executing through start()"""
+        return sum(1 for run in self._runs.values() if run.task is not None and not run.task.done())
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        return [run.to_dict() for run in self._runs.values()]
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._runs
+
+    def __iter__(self) -> Iterator[Run]:
+        return iter(list(self._runs.values()))
+
+    def __len__(self) -> int:
+        return len(self._runs)
@@ -6,11 +6,22 @@ Includes HALT/RESUME/ROLLBACK control handlers.
 """
 import socketio
 import asyncio
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable
 from orchestration.decision_engine import DecisionEngine
+from server import metrics
+from server.runs import Run, RunLimits, RunRegistry, DEFAULT_RUN_ID
+
+
+class InstrumentedAsyncServer(socketio.AsyncServer):
+    """AsyncServer that counts emitted events for the metrics endpoint"""
+
+    async def emit(self, *args, **kwargs):
+        metrics.emits_total.inc()
+        return await super().emit(*args, **kwargs)
+
 
 # Create Socket.IO server
-sio = socketio.AsyncServer(
+sio = InstrumentedAsyncServer(
     async_mode='asgi',
     cors_allowed_origins='*',
     logger=False,
@@ -18,25 +29,107 @@ sio = socketio.AsyncServer(
 )
 
 # Global decision engine instance (shared across connections)
-decision_engine = DecisionEngine()
+decision_engine = DecisionEngine(metrics=metrics.decision_metrics)
+
+# Orchestrator runs driven by this server, keyed by run id. Control events
+# carry an optional run_id; events without one target the default run.
+runs = RunRegistry()
 
-# Global orchestrator instance (set by server initialization)
+# Orchestrator of the default run (set by server initialization)
 orchestrator = None
 
+# Status version covered by the last broadcast of the default run
+last_broadcast_version: Optional[int] = None
+
+metrics.orchestrator_metrics.snapshots.set_function(
+    lambda: sum(run.orchestrator.state_manager.get_snapshot_count() for run in runs))
+metrics.orchestrator_metrics.snapshot_bytes.set_function(
+    lambda: sum(run.orchestrator.state_manager.get_memory_usage() for run in runs))
+
 # Event handlers registry
 event_handlers: Dict[str, Callable] = {}
 
 
-def set_orchestrator(orch):
-    """Set the global orchestrator instance"""
-    global orchestrator
-    orchestrator = orch
+def set_orchestrator(orch, run_id: str = DEFAULT_RUN_ID, limits: Optional[RunLimits] = None):
+    """
+    Register the orchestrator of a run (None unregisters the run).
+
+    An existing run with the same id is replaced. An orchestrator still
+    using its default decision engine (with nothing pending) gets the
+    server's, so its decisions are counted in the decision metrics. One
+    constructed with its own engine keeps it; the decision handlers route
+    each decision to the engine that holds it either way.
+    """
+    global orchestrator, last_broadcast_version
+    if orch is None:
+        runs.remove(run_id)
+    else:
+        if orch.metrics is None:
+            orch.metrics = metrics.orchestrator_metrics
+        if not orch.decision_engine_configured and not orch.decision_engine.pending_decisions:
+            orch.decision_engine = decision_engine
+        runs.register(run_id, orch, limits, replace=True)
+    if run_id == DEFAULT_RUN_ID:
+        orchestrator = orch
+        last_broadcast_version = None
+
+
+def _decision_engines() -> List[DecisionEngine]:
+    """The server's decision engine plus those runs were configured with"""
+    engines = [decision_engine]
+    for run in runs:
+        engine = run.orchestrator.decision_engine
+        if all(engine is not known for known in engines):
+            engines.append(engine)
+    return engines
+
+
+def _engine_for(decision_id: str) -> DecisionEngine:
+    """Decision engine holding a decision (the server's if none does)"""
+    for engine in _decision_engines():
+        if engine.get_decision(decision_id) is not None:
+            return engine
+    return decision_engine
+
+
+async def _get_run_id(sid, data: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Run id of a control event, emitting an error if the payload is malformed"""
+    if data is not None and not isinstance(data, dict):
+        await sio.emit('error', {
+            'message': 'Payload must be an object',
+            'code': 'INVALID_REQUEST'
+        }, room=sid)
+        return None
+    run_id = (data or {}).get('run_id') or DEFAULT_RUN_ID
+    if not isinstance(run_id, str):
+        await sio.emit('error', {
+            'message': 'run_id must be a string',
+            'code': 'INVALID_REQUEST'
+        }, room=sid)
+        return None
+    return run_id
+
+
+async def _get_run(sid, data: Optional[Dict[str, Any]]) -> Optional[Run]:
+    """Run targeted by a control event, emitting an error if there is none"""
+    run_id = await _get_run_id(sid, data)
+    if run_id is None:
+        return None
+    run = runs.get(run_id)
+    if run is None:
+        if run_id == DEFAULT_RUN_ID:
+            error = {'message': 'Orchestrator not initialized', 'code': 'NO_ORCHESTRATOR'}
+        else:
+            error = {'message': f'Unknown run: {run_id}', 'code': 'UNKNOWN_RUN'}
+        await sio.emit('error', {**error, 'run_id': run_id}, room=sid)
+    return run
 
 
 @sio.event
 async def connect(sid, environ):
     """Handle client connection"""
     print(f"[WebSocket] Client connected: {sid}")
+    metrics.connected_clients.inc()
     await sio.emit('connection_status', {'status': 'connected', 'sid': sid}, room=sid)
 
 
@@ -44,6 +137,7 @@ async def connect(sid, environ):
 async def disconnect(sid):
     """Handle client disconnection"""
     print(f"[WebSocket] Client disconnected: {sid}")
+    metrics.connected_clients.dec()
 
 
 @sio.event
@@ -73,7 +167,7 @@ async def approve_decision(sid, data: Dict[str, Any]):
             return
 
         # Approve the decision
-        decision = await decision_engine.approve_decision(
+        decision = await _engine_for(decision_id).approve_decision(
             decision_id=decision_id,
             selected_option_id=selected_option_id,
             approved_by=f"dashboard-{sid}"
@@ -108,6 +202,99 @@ async def approve_decision(sid, data: Dict[str, Any]):
         }, room=sid)
 
 
+@sio.event
+async def approve_decisions(sid, data: Dict[str, Any]):
+    """
+    Handle a batch of decision approvals from dashboard.
+
+    All approvals are validated before any is applied: if one fails,
+    none is approved.
+
+    Expected data:
+    {
+        "approvals": [
+            {"decision_id": "uuid-here", "selected_option_id": "option-id"},
+            ...
+        ]
+    }
+
+    Emits:
+    - decisions:approved - One confirmation listing every approval
+    - execution:resumed - Execution continues (once for the batch)
+    """
+    try:
+        approvals = (data or {}).get('approvals')
+        if not approvals or not isinstance(approvals, list):
+            await sio.emit('error', {
+                'message': 'Missing approvals',
+                'code': 'INVALID_REQUEST'
+            }, room=sid)
+            return
+
+        selections: Dict[str, str] = {}
+        for approval in approvals:
+            decision_id = approval.get('decision_id') if isinstance(approval, dict) else None
+            selected_option_id = approval.get('selected_option_id') if isinstance(approval, dict) else None
+            if not decision_id or not selected_option_id:
+                await sio.emit('error', {
+                    'message': 'Each approval needs decision_id and selected_option_id',
+                    'code': 'INVALID_REQUEST'
+                }, room=sid)
+                return
+            if decision_id in selections:
+                await sio.emit('error', {
+                    'message': f"Decision {decision_id} approved twice",
+                    'code': 'INVALID_REQUEST'
+                }, room=sid)
+                return
+            selections[decision_id] = selected_option_id
+
+        # Decisions may belong to different runs' engines: validate every
+        # group before applying any
+        groups: Dict[DecisionEngine, Dict[str, str]] = {}
+        for decision_id, selected_option_id in selections.items():
+            groups.setdefault(_engine_for(decision_id), {})[decision_id] = selected_option_id
+        for engine, group in groups.items():
+            engine.validate_approvals(group)
+        approved = {}
+        for engine, group in groups.items():
+            for decision in await engine.approve_decisions(group, approved_by=f"dashboard-{sid}"):
+                approved[decision.id] = decision
+        decisions = [approved[decision_id] for decision_id in selections]
+
+        await sio.emit('decisions:approved', {
+            'decisions': [
+                {
+                    'decision_id': decision.id,
+                    'selected_option': decision.selected_option_id,
+                    'question': decision.question,
+                    'status': decision.status,
+                    'timestamp': decision.approved_at.isoformat()
+                }
+                for decision in decisions
+            ],
+            'count': len(decisions)
+        }, room=sid)
+
+        await sio.emit('execution:resumed', {
+            'reason': 'decisions_approved',
+            'decision_ids': list(selections)
+        })
+
+        print(f"[WebSocket] Decisions approved: {len(decisions)}")
+
+    except ValueError as e:
+        await sio.emit('error', {
+            'message': str(e),
+            'code': 'DECISION_ERROR'
+        }, room=sid)
+    except Exception as e:
+        await sio.emit('error', {
+            'message': f"Failed to approve decisions: {str(e)}",
+            'code': 'INTERNAL_ERROR'
+        }, room=sid)
+
+
 @sio.event
 async def request_pending_decisions(sid, data: Dict[str, Any] = None):
     """
@@ -117,29 +304,11 @@ async def request_pending_decisions(sid, data: Dict[str, Any] = None):
     - decisions:pending - List of all pending decisions
     """
     try:
-        pending = decision_engine.get_pending_decisions()
+        pending = [d for engine in _decision_engines() for d in engine.get_pending_decisions()]
 
         await sio.emit('decisions:pending', {
             'decisions': [
-                {
-                    'id': d.id,
-                    'question': d.question,
-                    'options': [
-                        {
-                            'id': opt.id,
-                            'label': opt.label,
-                            'description': opt.description,
-                            'confidence': opt.confidence,
-                            'pros': opt.pros,
-                            'cons': opt.cons
-                        }
-                        for opt in d.options
-                    ],
-                    'status': d.status,
-                    'context': d.context,
-                    'created_at': d.created_at.isoformat()
-                }
-                for d in pending
+                _decision_payload(d) for d in pending
             ],
             'count': len(pending)
         }, room=sid)
@@ -151,17 +320,61 @@ async def request_pending_decisions(sid, data: Dict[str, Any] = None):
         }, room=sid)
 
 
+@sio.event
+async def request_decision_metrics(sid, data: Dict[str, Any] = None):
+    """
+    Handle request for decision latency and throughput metrics.
+
+    Emits:
+    - decisions:metrics - Counts, auto-approve ratio, rejection rate,
+      time-to-decision quantiles and pending depth over time (of the
+      server's engine; runs with their own engine record into its metrics)
+    """
+    try:
+        await sio.emit('decisions:metrics', decision_engine.decision_metrics(), room=sid)
+
+    except Exception as e:
+        await sio.emit('error', {
+            'message': f"Failed to get decision metrics: {str(e)}",
+            'code': 'INTERNAL_ERROR'
+        }, room=sid)
+
+
 async def emit_decision_request(decision_id: str):
     """
     Emit a decision request to all connected clients.
 
     Called by orchestrator when a decision is needed.
     """
-    decision = decision_engine.get_decision(decision_id)
+    decision = _engine_for(decision_id).get_decision(decision_id)
     if not decision:
         return
 
-    await sio.emit('decision:requested', {
+    await sio.emit('decision:requested', _decision_payload(decision))
+
+
+async def emit_decision_requests(decision_ids: List[str]):
+    """
+    Emit several decision requests to all connected clients in one message.
+
+    Called by orchestrator after DecisionEngine.request_decisions.
+
+    Emits:
+    - decisions:requested - The decisions (unknown ids are skipped)
+    """
+    decisions = [d for d in (_engine_for(i).get_decision(i) for i in decision_ids) if d]
+    if not decisions:
+        return
+
+    await sio.emit('decisions:requested', {
+        'decisions': [_decision_payload(d) for d in decisions],
+        'count': len(decisions)
+    })
+
+
+def _decision_payload(decision) -> Dict[str, Any]:
+    """Dashboard view of a decision"""
+    return {
         'id': decision.id,
         'question': decision.question,
         'options': [
@@ -178,7 +391,7 @@ async def emit_decision_request(decision_id: str):
         'status': decision.status,
         'context': decision.context,
         'created_at': decision.created_at.isoformat()
-    })
+    }
 
 
 # ============================================================================
@@ -190,29 +403,32 @@ async def halt_execution(sid, data: Dict[str, Any] = None):
     """
     Handle HALT command - pause execution.
 
+    Expected data (optional):
+    {
+        "run_id": "run-id"  // Defaults to the default run
+    }
+
     Emits:
     - execution:halted - Confirmation of halt
     """
     try:
-        if not orchestrator:
-            await sio.emit('error', {
-                'message': 'Orchestrator not initialized',
-                'code': 'NO_ORCHESTRATOR'
-            }, room=sid)
+        run = await _get_run(sid, data)
+        if run is None:
             return
 
-        result = orchestrator.halt()
+        result = run.orchestrator.halt()
 
         await sio.emit('execution:halted', {
             'success': True,
+            'run_id': run.run_id,
             'result': result,
             'halt_response_time_ms': result.get('halt_response_time_ms')
         }, room=sid)
 
         # Broadcast status update
-        await broadcast_status()
+        await broadcast_status(run.run_id)
 
-        print(f"[WebSocket] Execution halted by {sid}")
+        print(f"[WebSocket] Execution of run {run.run_id} halted by {sid}")
 
     except Exception as e:
         await sio.emit('error', {
@@ -226,29 +442,32 @@ async def resume_execution(sid, data: Dict[str, Any] = None):
     """
     Handle RESUME command - continue execution.
 
+    Expected data (optional):
+    {
+        "run_id": "run-id"  // Defaults to the default run
+    }
+
     Emits:
     - execution:resumed - Confirmation of resume
     """
     try:
-        if not orchestrator:
-            await sio.emit('error', {
-                'message': 'Orchestrator not initialized',
-                'code': 'NO_ORCHESTRATOR'
-            }, room=sid)
+        run = await _get_run(sid, data)
+        if run is None:
             return
 
-        result = await orchestrator.resume()
+        result = await run.orchestrator.resume()
 
         await sio.emit('execution:resumed', {
             'success': True,
+            'run_id': run.run_id,
             'result': result,
             'reason': 'manual_resume'
         }, room=sid)
 
         # Broadcast status update
-        await broadcast_status()
+        await broadcast_status(run.run_id)
 
-        print(f"[WebSocket] Execution resumed by {sid}")
+        print(f"[WebSocket] Execution of run {run.run_id} resumed by {sid}")
 
     except ValueError as e:
         await sio.emit('error', {
@@ -269,34 +488,33 @@ async def rollback_execution(sid, data: Dict[str, Any]):
 
     Expected data:
     {
-        "steps": 1  // Number of steps to rollback
+        "steps": 1,  // Number of steps to rollback
+        "run_id": "run-id"  // Optional, defaults to the default run
     }
 
     Emits:
     - execution:rolled_back - Confirmation of rollback
     """
     try:
-        if not orchestrator:
-            await sio.emit('error', {
-                'message': 'Orchestrator not initialized',
-                'code': 'NO_ORCHESTRATOR'
-            }, room=sid)
+        run = await _get_run(sid, data)
+        if run is None:
             return
 
         steps = data.get('steps', 1)
 
-        result = orchestrator.rollback(steps)
+        result = run.orchestrator.rollback(steps)
 
         await sio.emit('execution:rolled_back', {
             'success': True,
+            'run_id': run.run_id,
             'result': result,
             'steps': steps
         }, room=sid)
 
         # Broadcast status update
-        await broadcast_status()
+        await broadcast_status(run.run_id)
 
-        print(f"[WebSocket] Execution rolled back {steps} steps by {sid}")
+        print(f"[WebSocket] Run {run.run_id} rolled back {steps} steps by {sid}")
 
     except ValueError as e:
         await sio.emit('error', {
@@ -315,21 +533,33 @@ async def get_execution_status(sid, data: Dict[str, Any] = None):
     """
     Handle GET_STATUS command - get current orchestrator status.
 
+    Expected data (optional):
+    {
+        "since_version": 42,  // Only return changes after this version
+        "run_id": "run-id"  // Defaults to the default run
+    }
+
     Emits:
-    - execution:status - Current status
+    - execution:status - Current status (full or incremental)
     """
     try:
-        if not orchestrator:
+        run = await _get_run(sid, data)
+        if run is None:
+            return
+
+        since_version = (data or {}).get('since_version')
+        if since_version is not None and (not isinstance(since_version, int)
+                                          or isinstance(since_version, bool)):
             await sio.emit('error', {
-                'message': 'Orchestrator not initialized',
-                'code': 'NO_ORCHESTRATOR'
+                'message': 'since_version must be an integer',
+                'code': 'INVALID_REQUEST'
             }, room=sid)
             return
-
-        status = orchestrator.get_status()
+        status = run.orchestrator.get_status(since_version=since_version)
 
         await sio.emit('execution:status', {
             'success': True,
+            'run_id': run.run_id,
             'status': status
         }, room=sid)
 
@@ -340,22 +570,88 @@ async def get_execution_status(sid, data: Dict[str, Any] = None):
         }, room=sid)
 
 
-async def broadcast_status():
-    """Broadcast status update to all connected clients"""
-    if not orchestrator:
+async def broadcast_status(run_id: str = DEFAULT_RUN_ID):
+    """
+    Broadcast a run's status update.
+
+    The default run is broadcast to all connected clients; other runs only
+    to clients that joined them with join_run. After the first full
+    broadcast only changes since the previous broadcast are sent; clients
+    that fall behind request a full status with get_execution_status.
+    """
+    global last_broadcast_version
+    run = runs.get(run_id)
+    if run is None:
         return
 
     try:
-        status = orchestrator.get_status()
-        await sio.emit('execution:status_update', {
-            'status': status
-        })
+        status = run.orchestrator.get_status(since_version=run.last_broadcast_version)
+        run.last_broadcast_version = status['version']
+        payload = {'status': status, 'run_id': run_id}
+        if run_id == DEFAULT_RUN_ID:
+            last_broadcast_version = run.last_broadcast_version
+            await sio.emit('execution:status_update', payload)
+        else:
+            await sio.emit('execution:status_update', payload, room=run.room)
     except Exception as e:
         print(f"[WebSocket] Error broadcasting status: {e}")
 
 
-# ASGI application
-app = socketio.ASGIApp(sio)
+# ============================================================================
+# RUN HANDLERS - multiple orchestrator runs per server
+# ============================================================================
+
+@sio.event
+async def list_runs(sid, data: Dict[str, Any] = None):
+    """
+    Handle request for the registered runs.
+
+    Emits:
+    - runs:list - Run ids with their state
+    """
+    await sio.emit('runs:list', {'runs': runs.list_runs(), 'count': len(runs)}, room=sid)
+
+
+@sio.event
+async def join_run(sid, data: Dict[str, Any]):
+    """
+    Subscribe a client to a run's status broadcasts.
+
+    Expected data:
+    {
+        "run_id": "run-id"
+    }
+
+    Emits:
+    - run:joined - Confirmation with the run's current full status
+    """
+    try:
+        run = await _get_run(sid, data)
+        if run is None:
+            return
+        await sio.enter_room(sid, run.room)
+        await sio.emit('run:joined', {
+            'run_id': run.run_id,
+            'status': run.orchestrator.get_status()
+        }, room=sid)
+
+    except Exception as e:
+        await sio.emit('error', {
+            'message': f"Failed to join run: {str(e)}",
+            'code': 'INTERNAL_ERROR'
+        }, room=sid)
+
+
+@sio.event
+async def leave_run(sid, data: Dict[str, Any]):
+    """Unsubscribe a client from a run's status broadcasts"""
+    run = await _get_run(sid, data)
+    if run is not None:
+        await sio.leave_room(sid, run.room)
+
+
+# ASGI application (Socket.IO, plus GET /metrics for Prometheus)
+app = socketio.ASGIApp(sio, other_asgi_app=metrics.metrics_app)
 
 
 # Utility function for testing
@@ -0,0 +1,9 @@
+"""Helpers for asserting on Prometheus text exposition in tests"""
+
+
+def sample(text: str, name: str) -> float:
+    """Value of the first sample named name (labels included) in text"""
+    for line in text.splitlines():
+        if line.startswith(name + " "):
+            return float(line.split()[-1])
+    raise AssertionError(f"{name} not in exposition")
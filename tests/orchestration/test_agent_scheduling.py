@@ -0,0 +1,103 @@
+"""
+Tests for per-agent run queues and concurrency limits
+
+Requirements:
+- Per-agent limits cap concurrently running waves of that agent
+- Other agents (and waves without affinity) use the remaining slots
+- Halted waves free their agent slot
+- Agent utilization is reported in get_status
+"""
+
+import pytest
+import asyncio
+from orchestration.orchestrator import Orchestrator, Wave
+from orchestration.executors import AsyncTaskExecutor
+from orchestration.scheduler import WaveScheduler
+
+
+def independent(wave_id: str, agent_id: str) -> Wave:
+    return Wave(wave_id, agent_id, ["task"], depends_on=[])
+
+
+class TestAgentQueues:
+    """Test scheduler ready queues keyed on agent_id"""
+
+    def test_agent_limit_blocks_only_that_agent(self):
+        """A saturated agent yields the slot to the next agent's wave"""
+        waves = [independent("a1", "alpha"), independent("a2", "alpha"), independent("b1", "beta")]
+        scheduler = WaveScheduler(agent_limits={"alpha": 1})
+        scheduler.build(waves)
+
+        assert scheduler.pop_ready() == 0
+        assert scheduler.pop_ready() == 2
+        assert not scheduler.has_ready()
+
+        scheduler.complete(0)
+        assert scheduler.pop_ready() == 1
+
+    def test_unaffiliated_waves_run_in_any_slot(self):
+        """Waves without agent_id are not subject to agent limits"""
+        waves = [independent("a1", "alpha"), independent("a2", "alpha"),
+                 independent("x1", ""), independent("x2", "")]
+        scheduler = WaveScheduler(default_agent_limit=1)
+        scheduler.build(waves)
+
+        assert [scheduler.pop_ready() for _ in range(3)] == [0, 2, 3]
+        assert scheduler.queued_by_agent() == {"alpha": 1}
+
+    def test_release_frees_agent_slot(self):
+        """A halted wave's slot is returned without completing it"""
+        scheduler = WaveScheduler(default_agent_limit=1)
+        scheduler.build([independent("a1", "alpha"), independent("a2", "alpha")])
+
+        scheduler.pop_ready()
+        assert not scheduler.has_ready()
+        scheduler.release(0)
+        assert scheduler.pop_ready() == 1
+
+    def test_invalid_limit_rejected(self):
+        """Limits below one raise ValueError"""
+        with pytest.raises(ValueError):
+            WaveScheduler(agent_limits={"alpha": 0})
+        with pytest.raises(ValueError):
+            Orchestrator(default_agent_limit=0)
+
+
+class TestAgentExecution:
+    """Test agent limits during execution"""
+
+    @pytest.mark.asyncio
+    async def test_agent_limit_respected_and_others_progress(self):
+        """A busy agent never exceeds its limit while other agents run alongside"""
+        active = {"alpha": 0, "beta": 0}
+        peak = {"alpha": 0, "beta": 0}
+
+        async def handler(task):
+            agent = task.split(":")[0]
+            active[agent] += 1
+            peak[agent] = max(peak[agent], active[agent])
+            await asyncio.sleep(0.01)
+            active[agent] -= 1
+
+        orchestrator = Orchestrator(
+            max_concurrent_waves=4,
+            executors={"async": AsyncTaskExecutor(handler, max_concurrency=1)},
+            agent_limits={"alpha": 2}
+        )
+        orchestrator.add_waves(Wave(f"a{i}", "alpha", ["alpha:t"], depends_on=[]) for i in range(8))
+        orchestrator.add_waves(Wave(f"b{i}", "beta", ["beta:t"], depends_on=[]) for i in range(2))
+
+        result = await orchestrator.execute()
+
+        assert peak["alpha"] == 2
+        assert peak["beta"] == 2
+        # beta's waves did not queue behind alpha's eight
+        beta_positions = [i for i, entry in enumerate(orchestrator.execution_history)
+                          if entry["wave_id"].startswith("b")]
+        assert max(beta_positions) < 6
+
+        agents = result["agents"]
+        assert agents["alpha"]["limit"] == 2
+        assert agents["alpha"]["running"] == 0
+        assert 0 < agents["alpha"]["utilization"] <= 1
+        assert agents["beta"]["busy_seconds"] > 0
@@ -0,0 +1,83 @@
+"""
+Tests for the orchestrator scale benchmarks
+
+Requirements:
+- A case reports every metric
+- Results are compared against a baseline with a relative threshold
+- Timer noise below the floor is not a regression
+- The command line fails when default tracing exceeds its overhead limit
+"""
+
+import json
+from benchmarks import orchestrator_bench
+from benchmarks.orchestrator_bench import (
+    METRICS, TRACING_OVERHEAD_LIMIT, compare, run_case
+)
+
+
+def results(**metrics):
+    case = {"waves": 10, "tasks": 1, "concurrency": 1}
+    case.update(metrics)
+    return {"cases": [case]}
+
+
+class TestBenchmarks:
+    """Test measurement and baseline comparison"""
+
+    def test_case_reports_all_metrics(self):
+        """A small case measures throughput, HALT, resume, rollback and status costs"""
+        case = run_case(waves=10, tasks=4, concurrency=2, repeat=1)
+
+        assert set(METRICS) <= set(case)
+        assert case["halts"] > 0
+        assert case["throughput_tasks_per_s"] > 0
+        assert case["halt_latency_p99_ms"] >= case["halt_latency_p50_ms"]
+        assert case["snapshot_bytes"] > 0
+
+    def test_regressions_beyond_threshold(self):
+        """Lower throughput and higher costs are regressions in either direction"""
+        baseline = results(throughput_tasks_per_s=1000, status_full_ms=1.0, snapshot_bytes=100)
+        current = results(throughput_tasks_per_s=400, status_full_ms=1.2, snapshot_bytes=300)
+
+        regressions = compare(current, baseline, threshold=0.5)
+
+        assert sorted(r["metric"] for r in regressions) == ["snapshot_bytes", "throughput_tasks_per_s"]
+
+    def test_noise_floor_ignored(self):
+        """Millisecond changes below the noise floor are not regressions"""
+        baseline = results(status_full_ms=0.01)
+        current = results(status_full_ms=0.05)
+
+        assert compare(current, baseline, threshold=0.5) == []
+
+    def test_cli_fails_on_tracing_overhead(self, tmp_path, monkeypatch):
+        """The command line exits 1 when default tracing exceeds its limit"""
+        # The measurement itself only runs from the benchmark command line:
+        # timing assertions do not belong in the unit suite
+        monkeypatch.setattr(orchestrator_bench, "QUICK_SWEEP",
+                            {"waves": (10,), "tasks": (1,), "concurrency": (1,)})
+        monkeypatch.setattr(orchestrator_bench, "tracing_overhead",
+                            lambda task_spans=False: 2 * TRACING_OVERHEAD_LIMIT)
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(results(throughput_tasks_per_s=1.0)))
+
+        argv = ["--quick", "--repeat", "1", "--baseline", str(baseline)]
+
+        assert orchestrator_bench.main(argv) == 1
+        monkeypatch.setattr(orchestrator_bench, "tracing_overhead", lambda task_spans=False: 0.0)
+        assert orchestrator_bench.main(argv) == 0
+
+    def test_cli_writes_results_and_fails_on_regression(self, tmp_path, monkeypatch):
+        """The command line writes JSON and exits 1 when the baseline is beaten"""
+        monkeypatch.setattr(orchestrator_bench, "QUICK_SWEEP",
+                            {"waves": (10,), "tasks": (1,), "concurrency": (1,)})
+        monkeypatch.setattr(orchestrator_bench, "tracing_overhead", lambda task_spans=False: 0.0)
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps(results(throughput_tasks_per_s=1e12)))
+        output = tmp_path / "results.json"
+
+        code = orchestrator_bench.main(["--quick", "--repeat", "1", "--output", str(output),
+                                        "--baseline", str(baseline)])
+
+        assert code == 1
+        assert json.loads(output.read_text())["cases"][0]["waves"] == 10
@@ -0,0 +1,188 @@
+"""
+Tests for confidence calibration
+
+Requirements:
+- Thresholds are the lowest that keep auto-approval errors within target
+- Categories are calibrated independently; sparse ones keep the default
+- Only human answers are learned from
+- Online calibration refits and installs thresholds on the engine
+- Refits drop thresholds that no longer meet the target
+- A held-out sample above the threshold reaches humans, so refits can
+  raise thresholds
+"""
+
+import pytest
+import random
+
+np = pytest.importorskip("numpy")
+
+from orchestration.calibration import ConfidenceCalibrator, suggest_threshold
+from orchestration.decision_engine import Decision, DecisionEngine, DecisionOption
+
+
+def resolved(top_confidence, picked_top=True, category=None, status="approved", approved_by="human"):
+    """A human-resolved decision whose top option has top_confidence"""
+    options = [DecisionOption(id="top", label="Top", description="", confidence=top_confidence),
+               DecisionOption(id="alt", label="Alt", description="", confidence=0.1)]
+    context = {"category": category} if category else {}
+    return Decision(id=f"d-{top_confidence}-{picked_top}", question="Q?", options=options,
+                    status=status, selected_option_id="top" if picked_top else "alt",
+                    context=context, approved_by=approved_by)
+
+
+class TestSuggestThreshold:
+    """Test the vectorized threshold search"""
+
+    def test_lowest_threshold_within_target(self):
+        confidences = np.array([0.9, 0.8, 0.7, 0.6, 0.5])
+        correct = np.array([True, True, True, False, False])
+
+        assert suggest_threshold(confidences, correct, 0.0) == (0.7, 3, 0.0)
+        assert suggest_threshold(confidences, correct, 0.25) == (0.6, 4, 0.25)
+
+    def test_ties_are_admitted_together(self):
+        confidences = np.array([0.9, 0.8, 0.8])
+        correct = np.array([True, True, False])
+
+        threshold, approvals, _ = suggest_threshold(confidences, correct, 0.0)
+        assert (threshold, approvals) == (0.9, 1)
+
+    def test_weights(self):
+        confidences = np.array([0.9, 0.8, 0.7])
+        correct = np.array([True, False, True])
+
+        assert suggest_threshold(confidences, correct, 0.34)[0] == 0.7
+        assert suggest_threshold(confidences, correct, 0.34, np.array([1.0, 3.0, 1.0]))[0] == 0.9
+
+    def test_unreachable_target(self):
+        assert suggest_threshold(np.array([0.9]), np.array([False]), 0.05)[0] is None
+
+
+class TestConfidenceCalibrator:
+    """Test fitting and applying thresholds"""
+
+    def test_per_category_thresholds(self):
+        history = [resolved(c, picked_top=c >= 0.7, category="deploy") for c in np.linspace(0.5, 0.99, 50)]
+        history += [resolved(0.8, category="sparse")] * 3
+        calibrator = ConfidenceCalibrator(target_error_rate=0.0, min_samples=10)
+
+        suggestions = calibrator.fit(history)
+
+        assert suggestions["deploy"].threshold == pytest.approx(0.7, abs=0.01)
+        assert suggestions["deploy"].auto_approve_rate > 0.5
+        assert suggestions["sparse"].threshold is None
+        assert set(calibrator.thresholds()) == {"deploy"}
+
+    def test_only_human_answers_are_learned(self):
+        calibrator = ConfidenceCalibrator(min_samples=1)
+        auto = resolved(0.99, approved_by="auto")
+        auto.auto_approved = True
+        timed_out = resolved(0.6, status="rejected")
+        timed_out.context["rejection_reason"] = "timeout"
+        refused = resolved(0.6, status="rejected")
+
+        for decision in (auto, resolved(0.8, approved_by="fallback"), timed_out, refused):
+            calibrator.observe(decision)
+
+        assert calibrator.stats()["categories"] == {"default": 1}
+        assert calibrator.fit()["default"].threshold is None  # the refusal was an error
+
+    def test_curve(self):
+        history = [resolved(0.85, picked_top=i % 4 != 0) for i in range(40)]
+        calibrator = ConfidenceCalibrator(bins=10)
+        calibrator.fit(history)
+
+        curve = calibrator.curve()
+
+        assert curve.counts[8] == 40 and curve.counts[1] == 40
+        assert curve.pick_rate[8] == pytest.approx(0.75)
+        assert curve.pick_rate[1] == pytest.approx(0.25)
+        assert curve.expected_calibration_error == pytest.approx(0.125)
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            ConfidenceCalibrator(target_error_rate=1.0)
+        with pytest.raises(ValueError):
+            ConfidenceCalibrator(refit_every=0)
+        with pytest.raises(ValueError):
+            ConfidenceCalibrator(holdout=1.0)
+
+
+class TestEngineCalibration:
+    """Test thresholds on the DecisionEngine"""
+
+    @pytest.mark.asyncio
+    async def test_applied_threshold_auto_approves_category(self):
+        engine = DecisionEngine()
+        calibrator = ConfidenceCalibrator(target_error_rate=0.0, min_samples=5)
+        calibrator.fit([resolved(0.8, category="deploy")] * 5)
+        calibrator.apply(engine)
+        options = [DecisionOption(id="a", label="A", description="", confidence=0.8)]
+
+        deploy = await engine.request_decision("Deploy?", options, {"category": "deploy"})
+        other = await engine.request_decision("Other?", options)
+
+        assert deploy.auto_approved and deploy.approved_by == "auto"
+        assert other.status == "pending"
+
+    @pytest.mark.asyncio
+    async def test_online_refit(self):
+        calibrator = ConfidenceCalibrator(target_error_rate=0.0, min_samples=3, refit_every=3)
+        engine = DecisionEngine(calibrator=calibrator)
+        options = [DecisionOption(id="a", label="A", description="", confidence=0.7),
+                   DecisionOption(id="b", label="B", description="", confidence=0.2)]
+
+        for i in range(3):
+            decision = await engine.request_decision(f"Q{i}", options, {"category": "lint"})
+            await engine.approve_decision(decision.id, "a")
+
+        assert engine.thresholds == {"lint": 0.7}
+        repeat = await engine.request_decision("Q", options, {"category": "lint"})
+        assert repeat.auto_approved
+
+    def test_refit_without_threshold_restores_default(self):
+        engine = DecisionEngine()
+        calibrator = ConfidenceCalibrator(target_error_rate=0.0, min_samples=5, window=5)
+        calibrator.fit([resolved(0.8, category="deploy")] * 5)
+        calibrator.apply(engine)
+        assert engine.threshold_for({"category": "deploy"}) == 0.8
+
+        calibrator.fit([resolved(0.8, picked_top=False, category="deploy")] * 5)
+        calibrator.apply(engine)
+
+        assert "deploy" not in engine.thresholds
+        assert engine.threshold_for({"category": "deploy"}) == DecisionEngine.AUTO_APPROVE_THRESHOLD
+
+    @pytest.mark.asyncio
+    async def test_holdout_is_opt_in(self):
+        engine = DecisionEngine(calibrator=ConfidenceCalibrator())
+        options = [DecisionOption(id="a", label="A", description="", confidence=0.99)]
+
+        decisions = await engine.request_decisions([(f"Q{i}", options) for i in range(200)])
+
+        assert all(d.auto_approved for d in decisions)
+
+    @pytest.mark.asyncio
+    async def test_held_out_answers_raise_threshold(self):
+        calibrator = ConfidenceCalibrator(target_error_rate=0.0, min_samples=5, refit_every=10,
+                                          holdout=0.5, rng=random.Random(1))
+        engine = DecisionEngine(calibrator=calibrator)
+        engine.thresholds["lint"] = 0.7
+        answered = []
+
+        # Above the threshold humans now disagree at 0.8 and agree at 0.9
+        for i in range(80):
+            confidence = 0.8 if i % 2 else 0.9
+            options = [DecisionOption(id="top", label="Top", description="", confidence=confidence),
+                       DecisionOption(id="alt", label="Alt", description="", confidence=0.1)]
+            decision = await engine.request_decision(f"Q{i}", options, {"category": "lint"})
+            if decision.status == "pending":
+                answered.append(decision)
+                await engine.approve_decision(decision.id, "alt" if confidence == 0.8 else "top")
+
+        assert any(d.held_out for d in answered)
+        assert engine.thresholds["lint"] == 0.9
+        confident = await engine.request_decisions(
+            [(f"R{i}", [DecisionOption(id="top", label="Top", description="", confidence=0.9)],
+              {"category": "lint"}) for i in range(20)])
+        assert 0 < sum(d.auto_approved for d in confident) < 20
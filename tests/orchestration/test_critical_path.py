@@ -0,0 +1,142 @@
+"""
+Tests for learned durations and critical-path scheduling
+
+Requirements:
+- Task and wave durations are learned and persisted across runs
+- Ready waves start longest-critical-path first
+- compare_makespan reports predicted versus actual makespan
+"""
+
+import pytest
+import asyncio
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.executors import AsyncTaskExecutor
+from orchestration.durations import DurationHistory
+from orchestration.scheduler import WaveScheduler
+
+
+def make_plan():
+    """A chain of three short waves, two short fillers and one long wave, in that order"""
+    waves = [Wave("chain0", "agent", ["short"], depends_on=[])]
+    waves.append(Wave("chain1", "agent", ["short"], depends_on=["chain0"]))
+    waves.append(Wave("chain2", "agent", ["short"], depends_on=["chain1"]))
+    waves.extend(Wave(f"filler{i}", "agent", ["short"], depends_on=[]) for i in range(2))
+    waves.append(Wave("long", "agent", ["long"], depends_on=[]))
+    return waves
+
+
+def timed_executor(started: list) -> AsyncTaskExecutor:
+    async def handler(task):
+        started.append(task)
+        await asyncio.sleep(0.06 if task == "long" else 0.01)
+    return AsyncTaskExecutor(handler, max_concurrency=1)
+
+
+class TestDurationHistory:
+    """Test moving averages and persistence"""
+
+    def test_moving_average_and_estimates(self):
+        """Repeated samples are blended; unknown tasks use the mean"""
+        history = DurationHistory(alpha=0.5)
+        history.record_task("a", 1.0)
+        history.record_task("a", 3.0)
+        history.record_task("b", 4.0)
+
+        assert history.estimate_task("a") == 2.0
+        assert history.estimate_task("unknown") == 3.0
+        wave = Wave("w", "agent", ["a", "b"])
+        assert history.estimate_wave(wave) == 6.0
+        assert history.estimate_wave(wave, concurrency=2) == 3.0
+
+    def test_oldest_entries_evicted(self):
+        """History is bounded by max_entries"""
+        history = DurationHistory(max_entries=2)
+        for task in ("a", "b", "c"):
+            history.record_task(task, 1.0)
+
+        assert len(history) == 2
+        assert "a" not in history._tasks
+
+    def test_persisted_across_instances(self, tmp_path):
+        """save() writes history that a new instance loads"""
+        path = tmp_path / "durations.json"
+        history = DurationHistory(path)
+        history.record_task("a", 0.5)
+        history.record_wave("w", 2.0)
+        history.save()
+
+        reloaded = DurationHistory(path)
+
+        assert reloaded.estimate_task("a") == 0.5
+        assert reloaded.estimate_wave(Wave("w", "agent", ["a"])) == 2.0
+
+
+class TestCriticalPathOrder:
+    """Test scheduler priority"""
+
+    def test_longest_chain_popped_first(self):
+        """The wave heading the longest remaining path starts first"""
+        durations = {i: 0.01 for i in range(5)}
+        durations[5] = 0.06
+        scheduler = WaveScheduler()
+        scheduler.build(make_plan(), durations)
+
+        assert scheduler.pop_ready() == 5
+        assert scheduler.pop_ready() == 0
+        assert scheduler.pop_ready() == 3
+        assert scheduler.critical_path_length() == pytest.approx(0.06)
+
+    def test_chain_length_counts(self):
+        """With equal durations a chain outranks a single wave"""
+        scheduler = WaveScheduler()
+        scheduler.build(make_plan(), {i: 1.0 for i in range(6)})
+
+        assert scheduler.pop_ready() == 0
+        assert scheduler.critical_path_length() == 3.0
+
+    def test_without_durations_plan_order(self):
+        """Without estimates ready waves keep plan order"""
+        scheduler = WaveScheduler()
+        scheduler.build(make_plan())
+
+        assert scheduler.pop_ready() == 0
+
+
+class TestLearnedScheduling:
+    """Test learning in one run and prioritising in the next"""
+
+    @pytest.mark.asyncio
+    async def test_second_run_starts_critical_path_first(self, tmp_path):
+        """Durations learned in run one reorder run two and shorten the prediction"""
+        path = tmp_path / "durations.json"
+        first_started = []
+        first = Orchestrator(max_concurrent_waves=2, executors={"async": timed_executor(first_started)},
+                             duration_history=DurationHistory(path))
+        first.add_waves(make_plan())
+        await first.execute()
+        assert first_started[:2] == ["short", "short"]
+        assert path.exists()
+
+        second_started = []
+        second = Orchestrator(max_concurrent_waves=2, executors={"async": timed_executor(second_started)},
+                              duration_history=DurationHistory(path), compare_makespan=True)
+        second.add_waves(make_plan())
+        result = await second.execute()
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert second_started[0] == "long"
+
+        makespan = result["makespan"]
+        assert makespan["predicted_seconds"] < makespan["plan_order_seconds"]
+        assert makespan["critical_path_seconds"] <= makespan["predicted_seconds"]
+        assert makespan["actual_seconds"] == pytest.approx(makespan["predicted_seconds"], rel=0.5)
+
+    def test_compare_makespan_requires_history(self):
+        """compare_makespan without a duration history is rejected"""
+        with pytest.raises(ValueError, match="duration_history"):
+            Orchestrator(compare_makespan=True)
+
+    def test_predict_without_history_rejected(self):
+        """predict_makespan needs learned durations"""
+        with pytest.raises(ValueError):
+            Orchestrator().predict_makespan()
@@ -0,0 +1,163 @@
+"""
+Tests for bounded decision history and the on-disk archive
+
+Requirements:
+- Resolved decisions beyond max_resolved leave memory for the archive
+- Pending decisions always stay in memory
+- History pages through archive and memory with a cursor, in creation order
+- Archived decisions round-trip and can be filtered by status and approver
+- Archive failures never fail approvals; close() archives what is buffered
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from orchestration.decision_engine import DecisionEngine, DecisionOption
+from orchestration.decision_archive import DecisionArchive
+
+
+def low_confidence():
+    return [DecisionOption(id="a", label="A", description="Option A", confidence=0.5, pros=["x"]),
+            DecisionOption(id="b", label="B", description="Option B", confidence=0.4)]
+
+
+def high_confidence():
+    return [DecisionOption(id="a", label="A", description="Option A", confidence=0.99)]
+
+
+async def make_decisions(engine, count):
+    """count decisions: even ones approved by alice, odd ones rejected"""
+    decisions = []
+    for i in range(count):
+        decision = await engine.request_decision(f"Question {i}", low_confidence())
+        if i % 2 == 0:
+            await engine.approve_decision(decision.id, "a", approved_by="alice")
+        else:
+            engine.reject_decision(decision.id, "no")
+        decisions.append(decision)
+    return decisions
+
+
+class TestBoundedHistory:
+    """Test memory bounds and archival"""
+
+    @pytest.mark.asyncio
+    async def test_resolved_decisions_age_out_to_archive(self):
+        """Memory holds at most max_resolved resolved decisions"""
+        archive = DecisionArchive()
+        engine = DecisionEngine(max_resolved=10, archive=archive)
+        decisions = await make_decisions(engine, 200)
+        pending = await engine.request_decision("Still open", low_confidence())
+
+        assert len(engine.decisions) == 11
+        assert pending.id in engine.decisions
+        engine.flush_archive()
+        assert len(archive) == 190
+
+        archived = engine.get_decision(decisions[0].id)
+        assert archived.status == "approved"
+        assert archived.approved_by == "alice"
+        assert archived.options[0].pros == ["x"]
+        assert isinstance(archived.created_at, datetime)
+
+    @pytest.mark.asyncio
+    async def test_unencodable_context_does_not_fail_approvals(self):
+        """Contexts JSON cannot hold never break approvals or later archiving"""
+        archive = DecisionArchive()
+        engine = DecisionEngine(max_resolved=0, archive=archive)
+        engine.ARCHIVE_BATCH = 1
+        cyclic = {}
+        cyclic["self"] = cyclic
+        dated = await engine.request_decision("Dated", low_confidence(), {"at": datetime(2024, 1, 2)})
+        looped = await engine.request_decision("Cyclic", low_confidence(), cyclic)
+
+        await engine.approve_decision(dated.id, "a")
+        await engine.approve_decision(looped.id, "a")
+        later = await make_decisions(engine, 3)
+
+        assert archive.get(dated.id).context == {"at": "2024-01-02 00:00:00"}
+        assert archive.get(looped.id) is None  # skipped, not retried
+        assert [archive.get(d.id).status for d in later] == ["approved", "rejected", "approved"]
+        assert not engine._archive_buffer
+
+    @pytest.mark.asyncio
+    async def test_close_archives_buffered_decisions(self, tmp_path):
+        """close() writes decisions still waiting for a full batch"""
+        path = tmp_path / "decisions.db"
+        engine = DecisionEngine(max_resolved=0, archive=DecisionArchive(path))
+        decisions = await make_decisions(engine, 5)
+        engine.close()
+
+        reopened = DecisionArchive(path)
+        assert len(reopened) == 5
+        assert reopened.get(decisions[4].id).status == "approved"
+
+    @pytest.mark.asyncio
+    async def test_without_archive_old_decisions_are_dropped(self):
+        """max_resolved alone bounds memory"""
+        engine = DecisionEngine(max_resolved=5)
+        decisions = await make_decisions(engine, 20)
+
+        assert len(engine.decisions) == 5
+        assert engine.get_decision(decisions[0].id) is None
+
+    @pytest.mark.asyncio
+    async def test_unbounded_by_default(self):
+        """Without max_resolved every decision stays in memory"""
+        engine = DecisionEngine()
+        await make_decisions(engine, 20)
+        await engine.request_decision("Auto", high_confidence())
+
+        assert len(engine.get_decision_history()) == 21
+        assert not engine._resolved  # no second index of every resolved id
+
+
+class TestHistoryQueries:
+    """Test cursor pagination and filters"""
+
+    @pytest.mark.asyncio
+    async def test_pages_span_archive_and_memory(self):
+        """Pages cover every decision once, in creation order"""
+        engine = DecisionEngine(max_resolved=7, archive=DecisionArchive())
+        decisions = await make_decisions(engine, 50)
+        await engine.request_decision("Open", low_confidence())
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            page, cursor = engine.query_history(cursor=cursor, limit=8)
+            seen.extend(page)
+            pages += 1
+            if cursor is None:
+                break
+
+        assert [d.question for d in seen] == [d.question for d in decisions] + ["Open"]
+        assert pages == 7
+
+    @pytest.mark.asyncio
+    async def test_filters(self, tmp_path):
+        """Status, approver and time filters apply to archived decisions"""
+        engine = DecisionEngine(max_resolved=3, archive=DecisionArchive(tmp_path / "decisions.db"))
+        await make_decisions(engine, 30)
+
+        approved = list(engine.iter_history(status="approved", page_size=4))
+        by_alice = list(engine.iter_history(approved_by="alice"))
+        future = list(engine.iter_history(since=datetime.now() + timedelta(hours=1)))
+
+        assert len(approved) == 15
+        assert all(d.status == "approved" for d in approved)
+        assert [d.id for d in by_alice] == [d.id for d in approved]
+        assert future == []
+
+    @pytest.mark.asyncio
+    async def test_sequence_continues_after_reopen(self, tmp_path):
+        """A reopened archive keeps cursors monotonic"""
+        path = tmp_path / "decisions.db"
+        engine = DecisionEngine(max_resolved=0, archive=DecisionArchive(path))
+        await make_decisions(engine, 5)
+        engine.flush_archive()
+        engine.archive.close()
+
+        reopened = DecisionEngine(max_resolved=0, archive=DecisionArchive(path))
+        decision = await reopened.request_decision("Next", low_confidence())
+
+        assert decision.sequence == 6
+        assert len(list(reopened.iter_history())) == 6
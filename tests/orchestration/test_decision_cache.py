@@ -0,0 +1,143 @@
+"""
+Tests for the learned decision cache
+
+Requirements:
+- A question a human already answered is auto-resolved from that answer
+- Only option ids/labels, the normalized question and selected context
+  keys distinguish questions
+- Entries expire after ttl and the least recently used are evicted
+- Cached and fallback approvals are never learned
+- Cache-resolved decisions carry an audit flag that survives archival
+"""
+
+import pytest
+from orchestration.decision_engine import DecisionEngine, DecisionOption
+from orchestration.decision_cache import DecisionCache
+from orchestration.decision_archive import DecisionArchive
+
+
+def options(confidence=0.5):
+    return [DecisionOption(id="a", label="A", description="Option A", confidence=confidence),
+            DecisionOption(id="b", label="B", description="Option B", confidence=0.4)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def answer(engine, question, option_id="b", context=None, approved_by="human"):
+    decision = await engine.request_decision(question, options(), context)
+    await engine.approve_decision(decision.id, option_id, approved_by=approved_by)
+    return decision
+
+
+class TestFingerprint:
+    """Test what distinguishes questions"""
+
+    def test_ignores_whitespace_option_order_and_confidence(self):
+        cache = DecisionCache()
+        reordered = [DecisionOption(id="b", label="B", description="other", confidence=0.1),
+                     DecisionOption(id="a", label="A", description="text", confidence=0.9)]
+        assert cache.fingerprint("Deploy  now?\n", options()) == cache.fingerprint("Deploy now?", reordered)
+
+    def test_labels_and_selected_context_keys_matter(self):
+        cache = DecisionCache(context_keys=["env"])
+        relabelled = options()
+        relabelled[0].label = "Other"
+        base = cache.fingerprint("Deploy?", options(), {"env": "prod", "wave": 1})
+        assert base != cache.fingerprint("Deploy?", relabelled, {"env": "prod"})
+        assert base != cache.fingerprint("Deploy?", options(), {"env": "staging"})
+        assert base == cache.fingerprint("Deploy?", options(), {"env": "prod", "wave": 2})
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            DecisionCache(max_entries=0)
+        with pytest.raises(ValueError):
+            DecisionCache(ttl=0)
+
+
+class TestCachedDecisions:
+    """Test auto-resolution through the DecisionEngine"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_resolved_from_human_answer(self):
+        engine = DecisionEngine(cache=DecisionCache())
+        first = await answer(engine, "Deploy?")
+
+        repeat = await engine.request_decision("Deploy?", options())
+
+        assert repeat.status == "approved"
+        assert repeat.selected_option_id == "b"
+        assert repeat.from_cache and repeat.auto_approved
+        assert repeat.approved_by == "cache"
+        assert repeat.cached_from == first.id
+        assert not engine.get_pending_decisions()
+        assert engine.cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_different_question_or_context_stays_pending(self):
+        engine = DecisionEngine(cache=DecisionCache(context_keys=["env"]))
+        await answer(engine, "Deploy?", context={"env": "staging"})
+
+        other = await engine.request_decision("Rollback?", options(), {"env": "staging"})
+        prod = await engine.request_decision("Deploy?", options(), {"env": "prod"})
+
+        assert other.status == "pending" and prod.status == "pending"
+        assert not other.from_cache
+
+    @pytest.mark.asyncio
+    async def test_fallback_and_rejections_not_learned(self):
+        engine = DecisionEngine(cache=DecisionCache())
+        await answer(engine, "Deploy?", approved_by="fallback")
+        decision = await engine.request_decision("Rollback?", options())
+        engine.reject_decision(decision.id, "no")
+
+        assert len(engine.cache) == 0
+        assert (await engine.request_decision("Deploy?", options())).status == "pending"
+
+    @pytest.mark.asyncio
+    async def test_high_confidence_bypasses_cache(self):
+        engine = DecisionEngine(cache=DecisionCache())
+        await answer(engine, "Deploy?")
+
+        decision = await engine.request_decision("Deploy?", options(confidence=0.99))
+
+        assert decision.approved_by == "auto" and not decision.from_cache
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        clock = FakeClock()
+        engine = DecisionEngine(cache=DecisionCache(ttl=60, clock=clock))
+        await answer(engine, "Deploy?")
+
+        clock.now = 61
+        assert (await engine.request_decision("Deploy?", options())).status == "pending"
+        assert len(engine.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        engine = DecisionEngine(cache=DecisionCache(max_entries=2))
+        await answer(engine, "Q1")
+        await answer(engine, "Q2")
+        await engine.request_decision("Q1", options())  # Q1 now most recent
+        await answer(engine, "Q3")
+
+        assert (await engine.request_decision("Q1", options())).from_cache
+        assert (await engine.request_decision("Q2", options())).status == "pending"
+
+    @pytest.mark.asyncio
+    async def test_audit_flag_survives_archive(self):
+        archive = DecisionArchive()
+        engine = DecisionEngine(max_resolved=0, archive=archive, cache=DecisionCache())
+        first = await answer(engine, "Deploy?")
+        repeat = await engine.request_decision("Deploy?", options())
+        engine.flush_archive()
+
+        archived = archive.get(repeat.id)
+        assert archived.from_cache and archived.cached_from == first.id
+        page, _ = engine.query_history(approved_by="cache")
+        assert [d.id for d in page] == [repeat.id]
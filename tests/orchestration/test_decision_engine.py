@@ -5,7 +5,23 @@ These tests define the behavior BEFORE implementation (TDD).
 Run them and watch them FAIL, then implement until PASS.
 """
 import pytest
+import asyncio
 from orchestration.decision_engine import DecisionEngine, Decision, DecisionOption
+from orchestration.decision_cache import DecisionCache
+
+
+@pytest.fixture
+def engine():
+    """Create DecisionEngine instance"""
+    return DecisionEngine()
+
+
+@pytest.fixture
+def options():
+    return [
+        DecisionOption(id="a", label="A", description="Option A", confidence=0.6),
+        DecisionOption(id="b", label="B", description="Option B", confidence=0.4)
+    ]
 
 
 class TestDecisionEngineCore:
@@ -181,3 +197,116 @@ class TestDecisionRetrieval:
         history = engine.get_decision_history()
         assert len(history) == 1
         assert history[0].status == "approved"
+
+
+class TestDecisionWaiting:
+    """Test awaiting pending decisions"""
+
+    @pytest.mark.asyncio
+    async def test_wait_resolves_on_approval(self, engine, options):
+        """A waiter wakes as soon as the decision is approved"""
+        decision = await engine.request_decision("Pick one", options)
+        waiter = asyncio.create_task(engine.wait_for_decision(decision.id))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await engine.approve_decision(decision.id, "b")
+
+        resolved = await asyncio.wait_for(waiter, 1)
+        assert resolved.status == "approved"
+        assert resolved.selected_option_id == "b"
+
+    @pytest.mark.asyncio
+    async def test_wait_resolves_on_rejection(self, engine, options):
+        """Rejection also wakes waiters"""
+        decision = await engine.request_decision("Pick one", options)
+        waiter = asyncio.create_task(engine.wait_for_decision(decision.id))
+        await asyncio.sleep(0)
+
+        engine.reject_decision(decision.id, "no")
+
+        assert (await asyncio.wait_for(waiter, 1)).status == "rejected"
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_leaves_decision_pending(self, engine, options):
+        """A timed-out wait raises and the decision can still be approved and awaited"""
+        decision = await engine.request_decision("Pick one", options)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await engine.wait_for_decision(decision.id, timeout=0.01)
+        assert decision.id in engine.pending_decisions
+
+        await engine.approve_decision(decision.id, "a")
+        assert (await engine.wait_for_decision(decision.id)).status == "approved"
+
+    @pytest.mark.asyncio
+    async def test_wait_for_unknown_decision_raises(self, engine):
+        with pytest.raises(ValueError, match="not found"):
+            await engine.wait_for_decision("missing")
+
+
+class TestDecisionBatches:
+    """Test batch request and approval"""
+
+    @pytest.mark.asyncio
+    async def test_request_decisions_in_order(self, engine, options):
+        high = [DecisionOption(id="x", label="X", description="X", confidence=0.99)]
+        decisions = await engine.request_decisions([
+            ("First?", options),
+            ("Second?", high, {"wave": 2}),
+        ])
+
+        assert [d.question for d in decisions] == ["First?", "Second?"]
+        assert decisions[0].status == "pending"
+        assert decisions[1].auto_approved and decisions[1].context == {"wave": 2}
+
+    @pytest.mark.asyncio
+    async def test_malformed_request_creates_nothing(self, engine, options):
+        with pytest.raises(ValueError, match="at least one option"):
+            await engine.request_decisions([("First?", options), ("Empty?", [])])
+        assert engine.decisions == {}
+
+    @pytest.mark.asyncio
+    async def test_approve_decisions_wakes_waiters(self, engine, options):
+        first, second = await engine.request_decisions([("First?", options), ("Second?", options)])
+        waiters = [asyncio.create_task(engine.wait_for_decision(d.id)) for d in (first, second)]
+
+        approved = await engine.approve_decisions({first.id: "a", second.id: "b"}, approved_by="ops")
+
+        assert [d.selected_option_id for d in approved] == ["a", "b"]
+        assert all(d.approved_by == "ops" for d in approved)
+        assert not engine.get_pending_decisions()
+        assert [d.status for d in await asyncio.gather(*waiters)] == ["approved", "approved"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_approval_changes_nothing(self, engine, options):
+        first, second = await engine.request_decisions([("First?", options), ("Second?", options)])
+
+        with pytest.raises(ValueError, match="Option c not found"):
+            await engine.approve_decisions({first.id: "a", second.id: "c"})
+        with pytest.raises(ValueError, match="not found"):
+            await engine.approve_decisions({first.id: "a", "missing": "a"})
+
+        assert first.status == "pending" and second.status == "pending"
+        assert len(engine.get_pending_decisions()) == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_while_applying_approves_whole_batch(self, options):
+        """A side effect failing for one item neither raises nor stops the batch"""
+        class FailingCache(DecisionCache):
+            def store(self, fingerprint, option_id, decision_id):
+                if decision_id == second.id:
+                    raise RuntimeError("cache unavailable")
+                super().store(fingerprint, option_id, decision_id)
+
+        engine = DecisionEngine(cache=FailingCache())
+        first, second, third = await engine.request_decisions(
+            [("First?", options), ("Second?", options), ("Third?", options)])
+        waiters = [asyncio.create_task(engine.wait_for_decision(d.id)) for d in (first, second, third)]
+
+        approved = await engine.approve_decisions({first.id: "a", second.id: "b", third.id: "a"})
+
+        assert [d.status for d in approved] == ["approved"] * 3
+        assert not engine.get_pending_decisions()
+        assert [d.selected_option_id for d in await asyncio.gather(*waiters)] == ["a", "b", "a"]
+        assert len(engine.cache) == 2
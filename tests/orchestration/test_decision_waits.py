@@ -0,0 +1,100 @@
+"""
+Tests for waiting on decisions during execution
+
+Requirements:
+- With wait_for_decisions, _request_decision blocks until approval
+- Timeouts apply the configured fallback policy
+- Other waves keep running while one waits for a decision
+"""
+
+import pytest
+import asyncio
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.decision_engine import DecisionOption
+from orchestration.executors import AsyncTaskExecutor
+
+
+def options():
+    return [
+        DecisionOption(id="safe", label="Safe", description="Low risk", confidence=0.8),
+        DecisionOption(id="fast", label="Fast", description="Quick", confidence=0.5)
+    ]
+
+
+class TestDecisionWaits:
+    """Test awaitable decisions in the orchestrator"""
+
+    @pytest.mark.asyncio
+    async def test_default_returns_pending_immediately(self):
+        """Without wait_for_decisions the decision comes back pending"""
+        orchestrator = Orchestrator()
+        decision = await orchestrator._request_decision("Deploy?", options())
+        assert decision.status == "pending"
+
+    @pytest.mark.asyncio
+    async def test_waits_for_approval(self):
+        """The request blocks until the decision is approved"""
+        orchestrator = Orchestrator(wait_for_decisions=True)
+        request = asyncio.create_task(orchestrator._request_decision("Deploy?", options()))
+        await asyncio.sleep(0.01)
+        assert not request.done()
+
+        pending = orchestrator.decision_engine.get_pending_decisions()[0]
+        await orchestrator.decision_engine.approve_decision(pending.id, "fast")
+
+        decision = await asyncio.wait_for(request, 1)
+        assert decision.status == "approved"
+        assert decision.selected_option_id == "fast"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fallback,status,selected", [
+        ("reject", "rejected", None),
+        ("best_option", "approved", "safe"),
+        ("pending", "pending", None),
+    ])
+    async def test_timeout_fallbacks(self, fallback, status, selected):
+        """On timeout the fallback policy decides the outcome"""
+        orchestrator = Orchestrator(wait_for_decisions=True, decision_timeout=0.02,
+                                    decision_fallback=fallback)
+
+        decision = await orchestrator._request_decision("Deploy?", options())
+
+        assert decision.status == status
+        assert decision.selected_option_id == selected
+
+    def test_invalid_fallback_rejected(self):
+        with pytest.raises(ValueError, match="decision_fallback"):
+            Orchestrator(decision_fallback="guess")
+
+    @pytest.mark.asyncio
+    async def test_other_waves_run_while_waiting(self):
+        """A wave blocked on a decision does not stall independent waves"""
+        orchestrator = None
+        finished = []
+
+        async def handler(task):
+            if task == "ask":
+                decision = await orchestrator._request_decision("Continue?", options())
+                finished.append(decision.selected_option_id)
+            else:
+                await asyncio.sleep(0.005)
+                finished.append(task)
+
+        orchestrator = Orchestrator(executors={"async": AsyncTaskExecutor(handler, max_concurrency=1)},
+                                    wait_for_decisions=True)
+        orchestrator.add_waves([
+            Wave("blocked", "agent1", ["ask"], depends_on=[]),
+            Wave("free", "agent2", ["t1", "t2", "t3"], depends_on=[])
+        ])
+
+        execution = asyncio.create_task(orchestrator.execute())
+        await asyncio.sleep(0.1)
+        assert finished == ["t1", "t2", "t3"]
+        assert orchestrator.waves[1].status == "completed"
+
+        pending = orchestrator.decision_engine.get_pending_decisions()[0]
+        await orchestrator.decision_engine.approve_decision(pending.id, "safe")
+        result = await asyncio.wait_for(execution, 1)
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert finished[-1] == "safe"
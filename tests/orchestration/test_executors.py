@@ -0,0 +1,104 @@
+"""
+Tests for pluggable task executor backends
+
+Requirements:
+- Async, thread pool and process pool backends run wave tasks
+- Tasks inside a wave run concurrently up to the backend limit
+- Task failures fail the wave and the orchestrator
+"""
+
+import pytest
+import asyncio
+import time
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.executors import (
+    AsyncTaskExecutor, ThreadPoolTaskExecutor, ProcessPoolTaskExecutor
+)
+
+
+def cpu_task(task: str) -> int:
+    """Module-level handler so it can be pickled for the process pool"""
+    return sum(i * i for i in range(10000))
+
+
+class TestExecutorBackends:
+    """Test each backend runs tasks within its concurrency limit"""
+
+    @pytest.mark.asyncio
+    async def test_async_backend_runs_tasks_concurrently(self):
+        """Async backend overlaps tasks up to max_concurrency"""
+        active = 0
+        peak = 0
+
+        async def handler(task):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+
+        orchestrator = Orchestrator(executors={"async": AsyncTaskExecutor(handler, max_concurrency=4)})
+        orchestrator.add_wave(Wave("w1", "a", [f"t{i}" for i in range(12)]))
+
+        result = await orchestrator.execute()
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_thread_backend_parallelizes_blocking_io(self):
+        """Blocking handlers do not serialize on the event loop"""
+        executor = ThreadPoolTaskExecutor(lambda task: time.sleep(0.05), max_concurrency=8)
+        orchestrator = Orchestrator(executors={"io": executor})
+        orchestrator.add_wave(Wave("w1", "a", [f"t{i}" for i in range(8)], executor="io"))
+
+        start = time.time()
+        await orchestrator.execute()
+        elapsed = time.time() - start
+        orchestrator.shutdown()
+
+        assert orchestrator.state == ExecutionState.COMPLETED
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_process_backend_runs_cpu_tasks(self):
+        """CPU-bound handlers run on the process pool"""
+        executor = ProcessPoolTaskExecutor(cpu_task, max_concurrency=2)
+        orchestrator = Orchestrator(executors={"cpu": executor})
+        orchestrator.add_wave(Wave("w1", "a", ["t1", "t2", "t3"], executor="cpu"))
+
+        await orchestrator.execute()
+        orchestrator.shutdown()
+
+        assert orchestrator.state == ExecutionState.COMPLETED
+
+    def test_async_backend_requires_coroutine_handler(self):
+        """Plain functions are rejected by the async backend"""
+        with pytest.raises(TypeError):
+            AsyncTaskExecutor(lambda task: None)
+
+    def test_unknown_executor_rejected(self):
+        """Waves must name a configured backend"""
+        orchestrator = Orchestrator()
+        with pytest.raises(ValueError, match="unknown executor"):
+            orchestrator.add_wave(Wave("w1", "a", ["t1"], executor="gpu"))
+
+
+class TestExecutorFailures:
+    """Test failure propagation from task handlers"""
+
+    @pytest.mark.asyncio
+    async def test_task_failure_fails_execution(self):
+        """A raising handler fails the wave and the orchestrator"""
+        async def handler(task):
+            if task == "bad":
+                raise RuntimeError("boom")
+
+        orchestrator = Orchestrator(executors={"async": AsyncTaskExecutor(handler)})
+        orchestrator.add_wave(Wave("w1", "a", ["ok", "bad", "ok2"]))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await orchestrator.execute()
+
+        assert orchestrator.state == ExecutionState.FAILED
+        assert orchestrator.waves[0].status == "failed"
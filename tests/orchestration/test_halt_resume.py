@@ -18,6 +18,7 @@ import pytest
 import asyncio
 import time
 from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.executors import AsyncTaskExecutor
 
 
 class TestHaltResume:
@@ -115,5 +116,69 @@ class TestHaltResume:
         assert wave_index_at_halt < len(orchestrator.waves)
 
 
+class TestEventDrivenHalt:
+    """Test HALT cancellation of long-running tasks and latency reporting"""
+
+    @pytest.mark.asyncio
+    async def test_halt_cancels_long_running_task(self):
+        """
+        HALT quiesces within 100ms even when a task would run for seconds.
+
+        Verifies:
+        - In-flight task is cancelled
+        - Measured halt latency is recorded and under 100ms
+        - p50/p99 are exposed through get_status
+        """
+        cancelled = []
+
+        async def slow_task(task):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(task)
+                raise
+
+        orchestrator = Orchestrator(executors={"async": AsyncTaskExecutor(slow_task)})
+        orchestrator.add_wave(Wave("wave1", "agent1", ["long1", "long2"]))
+
+        execution_task = asyncio.create_task(orchestrator.execute())
+        await asyncio.sleep(0.02)
+
+        start = time.perf_counter()
+        orchestrator.halt()
+        await asyncio.wait_for(execution_task, timeout=1)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert orchestrator.state == ExecutionState.HALTED
+        assert sorted(cancelled) == ["long1", "long2"]
+        assert orchestrator.waves[0].status == "halted"
+        assert elapsed_ms < 100
+
+        status = orchestrator.get_status()
+        assert 0 < status["halt_response_time_ms"] < 100
+        assert status["halt_latency_p50_ms"] == status["halt_response_time_ms"]
+        assert status["halt_latency_p99_ms"] == status["halt_response_time_ms"]
+
+    @pytest.mark.asyncio
+    async def test_halt_latency_percentiles_accumulate(self):
+        """Each HALT adds a latency sample"""
+        orchestrator = Orchestrator()
+        for i in range(3):
+            orchestrator.add_wave(Wave(f"wave{i}", "agent", [f"t{j}" for j in range(20)]))
+
+        for _ in range(2):
+            run = asyncio.create_task(
+                orchestrator.execute() if orchestrator.state == ExecutionState.IDLE
+                else orchestrator.resume()
+            )
+            await asyncio.sleep(0.03)
+            orchestrator.halt()
+            await run
+
+        assert len(orchestrator.halt_latencies) == 2
+        status = orchestrator.get_status()
+        assert status["halt_latency_p99_ms"] >= status["halt_latency_p50_ms"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
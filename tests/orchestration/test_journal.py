@@ -0,0 +1,177 @@
+"""
+Tests for the durable snapshot journal and crash recovery
+
+Requirements:
+- A new orchestrator recovers waves, history and snapshots from the journal
+- Recovered runs resume from the last durable point
+- Torn final records and compaction are handled
+- Recovery of 100k history entries takes well under a second
+- Appends stay fast while compaction runs in the background
+"""
+
+import pytest
+import asyncio
+import time
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.state_manager import StateManager
+from orchestration.journal import SnapshotJournal
+from orchestration.executors import AsyncTaskExecutor
+
+
+def journaled_orchestrator(path, **journal_kwargs) -> Orchestrator:
+    async def handler(task):
+        await asyncio.sleep(0.002)
+
+    journal = SnapshotJournal(path, **journal_kwargs)
+    return Orchestrator(
+        executors={"async": AsyncTaskExecutor(handler, max_concurrency=1)},
+        state_manager=StateManager(journal=journal)
+    )
+
+
+class TestCrashRecovery:
+    """Test recovery of a run from its journal"""
+
+    @pytest.mark.asyncio
+    async def test_recover_and_resume_after_halt(self, tmp_path):
+        """A fresh orchestrator picks up exactly where the journaled run stopped"""
+        path = tmp_path / "run.journal"
+        original = journaled_orchestrator(path)
+        for i in range(5):
+            original.add_wave(Wave(f"wave{i}", "agent", [f"t{j}" for j in range(10)]))
+
+        run = asyncio.create_task(original.execute())
+        await asyncio.sleep(0.05)
+        original.halt()
+        await run
+
+        # Simulate a crash: drop the original without closing anything
+        expected = [(w.status, set(w.completed_tasks)) for w in original.waves]
+        history_length = len(original.execution_history)
+        del original
+
+        restarted = journaled_orchestrator(path)
+        status = restarted.recover()
+
+        assert status["state"] == ExecutionState.HALTED.value
+        assert [(w.status, w.completed_tasks) for w in restarted.waves] == expected
+        assert len(restarted.execution_history) == history_length
+        assert restarted.state_manager.get_snapshot_count() > 0
+
+        await restarted.resume()
+        assert restarted.state == ExecutionState.COMPLETED
+        assert all(w.status == "completed" for w in restarted.waves)
+
+    @pytest.mark.asyncio
+    async def test_rollback_is_journaled(self, tmp_path):
+        """Recovery reflects a rollback performed before the crash"""
+        path = tmp_path / "run.journal"
+        original = journaled_orchestrator(path)
+        for i in range(3):
+            original.add_wave(Wave(f"wave{i}", "agent", ["t"]))
+        await original.execute()
+        original.rollback(2)
+
+        restarted = journaled_orchestrator(path)
+        restarted.recover()
+
+        assert [w.status for w in restarted.waves] == ["completed", "pending", "pending"]
+        assert len(restarted.execution_history) == 1
+        assert restarted.state_manager.get_snapshot_count() == original.state_manager.get_snapshot_count()
+
+    def test_recover_without_journal_state_raises(self, tmp_path):
+        """Recovering an empty journal is an error"""
+        orchestrator = journaled_orchestrator(tmp_path / "empty.journal")
+        with pytest.raises(ValueError, match="No journaled state"):
+            orchestrator.recover()
+
+
+class TestJournalFormat:
+    """Test journal durability details"""
+
+    @pytest.mark.asyncio
+    async def test_torn_tail_is_ignored(self, tmp_path):
+        """A partial final record from a crash mid-write is discarded"""
+        path = tmp_path / "run.journal"
+        original = journaled_orchestrator(path)
+        original.add_wave(Wave("wave0", "agent", ["t"]))
+        await original.execute()
+
+        with open(path, "ab") as f:
+            f.write(b'{"op":"history","entry":{"wave_id"')
+
+        restarted = journaled_orchestrator(path)
+        status = restarted.recover()
+
+        assert status["state"] == ExecutionState.COMPLETED.value
+        assert len(restarted.execution_history) == 1
+
+    @pytest.mark.asyncio
+    async def test_compaction_preserves_state(self, tmp_path):
+        """Compaction rewrites the log as one checkpoint without losing state"""
+        path = tmp_path / "run.journal"
+        original = journaled_orchestrator(path, compact_every=5)
+        for i in range(6):
+            original.add_wave(Wave(f"wave{i}", "agent", ["t"]))
+        await original.execute()
+        original.state_manager.journal.compact()
+
+        assert len(path.read_bytes().splitlines()) == 1
+
+        restarted = journaled_orchestrator(path)
+        status = restarted.recover()
+
+        assert status["state"] == ExecutionState.COMPLETED.value
+        assert len(restarted.execution_history) == 6
+
+    def test_large_history_recovers_quickly(self, tmp_path):
+        """100k history entries reload in well under a second"""
+        path = tmp_path / "big.journal"
+        journal = SnapshotJournal(path, fsync_every=10000, compact_every=10**9)
+        waves = [Wave(f"wave{i}", "agent", ["t1", "t2"], depends_on=[]) for i in range(1000)]
+        manager = StateManager(journal=journal)
+        manager.create_snapshot(0, [], waves)
+        history = []
+        for n in range(100_000):
+            i = n % len(waves)
+            wave = waves[i]
+            wave.status = "completed"
+            wave.started_at = time.time()
+            wave.completed_at = time.time()
+            wave.completed_tasks = {0, 1}
+            history.append({"wave_id": wave.wave_id, "wave_index": i, "timestamp": time.time(),
+                            "status": wave.status, "tasks_completed": 2})
+            manager.record_history(history, wave)
+        journal.close()
+
+        start = time.perf_counter()
+        state = StateManager(journal=SnapshotJournal(path)).recover()
+        elapsed = time.perf_counter() - start
+
+        assert len(state["history"]) == 100_000
+        assert elapsed < 1.0
+
+    def test_append_latency_bounded_during_compaction(self, tmp_path):
+        """Compacting 100k entries never stalls an append (the HALT path)"""
+        path = tmp_path / "busy.journal"
+        journal = SnapshotJournal(path, compact_every=20_000)
+        waves = [Wave(f"wave{i}", "agent", ["t"], depends_on=[]) for i in range(1000)]
+        manager = StateManager(journal=journal)
+        manager.create_snapshot(0, [], waves)
+        history = []
+        slowest = 0.0
+        for n in range(100_000):
+            wave = waves[n % len(waves)]
+            wave.status = "completed"
+            wave.completed_tasks = {0}
+            history.append({"wave_id": wave.wave_id, "wave_index": n % len(waves),
+                            "timestamp": n, "status": wave.status, "tasks_completed": 1})
+            start = time.perf_counter()
+            manager.record_history(history, wave)
+            slowest = max(slowest, time.perf_counter() - start)
+        journal.close()
+
+        assert slowest < 0.1  # the HALT budget; about 20ms here, 250ms when compacting inline
+        state = StateManager(journal=SnapshotJournal(path)).recover()
+        assert len(state["history"]) == 100_000
+        assert [entry["timestamp"] for entry in state["history"][-3:]] == [99_997, 99_998, 99_999]
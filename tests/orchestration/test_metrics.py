@@ -0,0 +1,182 @@
+"""
+Tests for Prometheus-style metrics
+
+Requirements:
+- Counters, gauges and histograms render in Prometheus text format
+- Histogram buckets are cumulative with a +Inf bucket, _sum and _count
+- The orchestrator counts waves and observes task and HALT latency
+- Snapshot gauges are read from the state manager at scrape time
+- Decision metrics track wait time, ratios and pending depth in fixed memory
+"""
+
+import pytest
+import asyncio
+from orchestration.orchestrator import Orchestrator, Wave
+from orchestration.metrics import DecisionMetrics, DepthTimeline, Metric, MetricsRegistry, OrchestratorMetrics
+from orchestration.decision_engine import DecisionEngine, DecisionOption
+from tests.metrics_helpers import sample
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMetricsRegistry:
+    """Test metric primitives and the text format"""
+
+    def test_counter_and_gauge(self):
+        """Counters only increase; gauges move both ways or read a callback"""
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests")
+        gauge = registry.gauge("clients", "Clients")
+        counter.inc()
+        counter.inc(2)
+        gauge.inc(3)
+        gauge.dec()
+
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert sample(text, "requests_total") == 3
+        assert sample(text, "clients") == 2
+
+        gauge.set_function(lambda: 7)
+        assert sample(registry.render(), "clients") == 7
+        with pytest.raises(ValueError, match="only increase"):
+            counter.inc(-1)
+
+    def test_metric_requires_samples(self):
+        class Untyped(Metric):
+            pass
+
+        with pytest.raises(TypeError):
+            Untyped("shannon_untyped", "No samples")
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Each bucket counts observations at or below its bound"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        text = registry.render()
+        assert sample(text, 'latency_seconds_bucket{le="0.1"}') == 2
+        assert sample(text, 'latency_seconds_bucket{le="1"}') == 3
+        assert sample(text, 'latency_seconds_bucket{le="+Inf"}') == 4
+        assert sample(text, "latency_seconds_count") == 4
+        assert sample(text, "latency_seconds_sum") == pytest.approx(2.65)
+
+    def test_histogram_quantile(self):
+        """Quantiles interpolate within buckets and clamp above the top bound"""
+        histogram = MetricsRegistry().histogram("wait_seconds", "Wait", buckets=(1.0, 2.0))
+        assert histogram.quantile(0.5) is None
+        for value in (0.5, 1.5, 1.5, 5.0):
+            histogram.observe(value)
+
+        assert histogram.quantile(0.25) == pytest.approx(1.0)
+        assert histogram.quantile(0.5) == pytest.approx(1.5)
+        assert histogram.quantile(1.0) == 2.0
+        with pytest.raises(ValueError):
+            histogram.quantile(1.5)
+
+    def test_duplicate_names_rejected(self):
+        """A metric name can only be registered once"""
+        registry = MetricsRegistry()
+        registry.counter("events_total", "Events")
+        with pytest.raises(ValueError, match="already registered"):
+            registry.gauge("events_total", "Events")
+
+
+class TestOrchestratorMetrics:
+    """Test orchestrator instrumentation"""
+
+    @pytest.mark.asyncio
+    async def test_run_counts_waves_and_task_latency(self):
+        """Completed waves and every task latency are recorded"""
+        metrics = OrchestratorMetrics()
+        orchestrator = Orchestrator(metrics=metrics)
+        orchestrator.add_waves(Wave(f"wave{i}", "agent", ["t1", "t2"]) for i in range(3))
+
+        await orchestrator.execute()
+
+        text = metrics.registry.render()
+        assert sample(text, "shannon_waves_completed_total") == 3
+        assert sample(text, "shannon_waves_failed_total") == 0
+        assert sample(text, "shannon_task_latency_seconds_count") == 6
+        assert sample(text, "shannon_snapshots") == orchestrator.state_manager.get_snapshot_count()
+        assert sample(text, "shannon_snapshot_bytes") > 0
+
+    @pytest.mark.asyncio
+    async def test_halt_latency_observed(self):
+        """Each HALT records its request-to-quiesce latency"""
+        metrics = OrchestratorMetrics()
+        orchestrator = Orchestrator(metrics=metrics)
+        orchestrator.add_waves(Wave(f"wave{i}", "agent", ["t1", "t2", "t3"]) for i in range(3))
+
+        execution = asyncio.create_task(orchestrator.execute())
+        await asyncio.sleep(0.025)
+        orchestrator.halt()
+        await execution
+
+        assert metrics.halt_latency.count == 1
+        assert metrics.halt_latency.sum == pytest.approx(orchestrator.halt_response_time / 1000)
+
+
+class TestDecisionMetrics:
+    """Test decision flow instrumentation"""
+
+    @staticmethod
+    def options(confidence=0.5):
+        return [DecisionOption(id="a", label="A", description="A", confidence=confidence)]
+
+    @pytest.mark.asyncio
+    async def test_counts_ratios_and_wait(self):
+        engine = DecisionEngine()
+        await engine.request_decision("Auto?", self.options(0.99))
+        approved = await engine.request_decision("Approve?", self.options())
+        rejected = await engine.request_decision("Reject?", self.options())
+        await engine.request_decision("Pending?", self.options())
+        await engine.approve_decision(approved.id, "a")
+        engine.reject_decision(rejected.id, "no")
+        await engine.approve_decision(approved.id, "a")  # already resolved: not recounted
+
+        snapshot = engine.decision_metrics()
+
+        assert (snapshot["requested"], snapshot["auto_approved"]) == (4, 1)
+        assert (snapshot["approved"], snapshot["rejected"], snapshot["pending"]) == (1, 1, 1)
+        assert snapshot["auto_approve_ratio"] == 0.25
+        assert snapshot["rejection_rate"] == 0.5
+        assert snapshot["time_to_decision"]["count"] == 2
+        assert snapshot["time_to_decision"]["p50"] < 0.1
+        assert sample(engine.metrics.registry.render(), "shannon_pending_decisions") == 1
+
+    def test_pending_depth_timeline(self):
+        clock = FakeClock()
+        timeline = DepthTimeline(interval=10, slots=3, clock=clock)
+        timeline.record(2)
+        timeline.record(5)
+        timeline.record(1, resolved=1)
+        clock.now = 25
+        timeline.record(0, resolved=1)
+
+        assert timeline.series() == [
+            {"start": 0, "peak": 5, "resolved": 1},
+            {"start": 10, "peak": 1, "resolved": 0},
+            {"start": 20, "peak": 1, "resolved": 1},
+        ]
+        clock.now = 1000
+        timeline.record(4)
+        assert [slot["start"] for slot in timeline.series()] == [980, 990, 1000]
+
+    def test_shared_registry(self):
+        registry = MetricsRegistry()
+        metrics = DecisionMetrics(registry)
+        metrics.record_request(auto_approved=False, pending=1)
+        metrics.record_resolution(approved=True, waited=3.0, pending=0)
+
+        text = registry.render()
+        assert sample(text, "shannon_decisions_requested_total") == 1
+        assert sample(text, 'shannon_decision_wait_seconds_bucket{le="5"}') == 1
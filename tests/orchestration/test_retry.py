@@ -0,0 +1,173 @@
+"""
+Tests for task retries, timeouts and speculative re-execution
+
+Requirements:
+- Failed attempts are retried with exponential backoff
+- Attempts exceeding the timeout are abandoned and retried
+- Stragglers get a speculative copy; the first success wins
+- Exhausted retries still fail the run
+"""
+
+import pytest
+import asyncio
+import time
+from collections import Counter
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.executors import AsyncTaskExecutor
+from orchestration.retry import RetryPolicy
+
+
+def flaky(failures: int):
+    """Attempt factory that fails the first N calls"""
+    calls = Counter()
+
+    async def attempt():
+        calls["n"] += 1
+        if calls["n"] <= failures:
+            raise RuntimeError(f"failure {calls['n']}")
+        return "ok"
+    return attempt, calls
+
+
+class TestRetryPolicy:
+    """Test the policy in isolation"""
+
+    def test_backoff_is_exponential_and_capped(self):
+        """Delays grow by multiplier up to max_delay"""
+        policy = RetryPolicy(base_delay=0.1, multiplier=2.0, max_delay=0.3)
+
+        assert [policy.backoff(n) for n in (1, 2, 3, 4)] == pytest.approx([0.1, 0.2, 0.3, 0.3])
+
+    def test_invalid_policy_rejected(self):
+        """Nonsensical settings raise ValueError"""
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+        with pytest.raises(ValueError):
+            RetryPolicy(speculate_percentile=150)
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        """Failures within max_attempts are retried"""
+        attempt, calls = flaky(2)
+        stats = Counter()
+
+        result = await RetryPolicy(max_attempts=3, base_delay=0.001).run(attempt, stats=stats)
+
+        assert result == "ok"
+        assert calls["n"] == 3
+        assert stats["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_exhausted_attempts_raise(self):
+        """The last error propagates once attempts run out"""
+        attempt, calls = flaky(5)
+
+        with pytest.raises(RuntimeError, match="failure 2"):
+            await RetryPolicy(max_attempts=2, base_delay=0.001).run(attempt)
+        assert calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_not_retried(self):
+        """Only exceptions in retry_on are retried"""
+        attempt, calls = flaky(1)
+        policy = RetryPolicy(max_attempts=3, base_delay=0.001, retry_on=(KeyError,))
+
+        with pytest.raises(RuntimeError):
+            await policy.run(attempt)
+        assert calls["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_abandons_slow_attempt(self):
+        """A hung attempt times out and the retry succeeds"""
+        calls = Counter()
+
+        async def attempt():
+            calls["n"] += 1
+            if calls["n"] == 1:
+                await asyncio.sleep(10)
+            return "ok"
+
+        stats = Counter()
+        started = time.perf_counter()
+        result = await RetryPolicy(max_attempts=2, base_delay=0.001, timeout=0.02).run(attempt, stats=stats)
+
+        assert result == "ok"
+        assert time.perf_counter() - started < 1
+        assert stats["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_straggler_speculated_and_loser_cancelled(self):
+        """A copy launched past the peer threshold wins; the straggler is cancelled"""
+        calls = Counter()
+        cancelled = []
+
+        async def attempt():
+            calls["n"] += 1
+            try:
+                await asyncio.sleep(10 if calls["n"] == 1 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(calls["n"])
+                raise
+            return "ok"
+
+        stats = Counter()
+        policy = RetryPolicy(speculate_percentile=90, speculate_factor=2.0, speculate_min_peers=3)
+        started = time.perf_counter()
+        result = await policy.run(attempt, peer_durations=[0.01, 0.01, 0.01], stats=stats)
+
+        assert result == "ok"
+        assert time.perf_counter() - started < 1
+        assert stats["speculative_launches"] == 1
+        assert stats["speculative_wins"] == 1
+        assert cancelled
+
+    @pytest.mark.asyncio
+    async def test_no_speculation_without_enough_peers(self):
+        """Speculation waits for speculate_min_peers samples"""
+        policy = RetryPolicy(speculate_percentile=90, speculate_min_peers=3)
+
+        assert policy.straggler_threshold([0.01, 0.01]) is None
+        assert policy.straggler_threshold([0.01, 0.01, 0.02]) == pytest.approx(0.03)
+
+
+class TestOrchestratorRetries:
+    """Test policies applied to wave tasks"""
+
+    @pytest.mark.asyncio
+    async def test_flaky_task_retried_within_wave(self):
+        """A transiently failing task no longer fails the run"""
+        failures = Counter()
+
+        async def handler(task):
+            if task == "flaky" and failures[task] < 2:
+                failures[task] += 1
+                raise RuntimeError("transient")
+            await asyncio.sleep(0.001)
+
+        orchestrator = Orchestrator(
+            executors={"async": AsyncTaskExecutor(handler)},
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001)
+        )
+        orchestrator.add_wave(Wave("wave1", "agent", ["ok", "flaky", "ok"]))
+
+        result = await orchestrator.execute()
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert result["task_stats"]["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_executor_policy_overrides_default(self):
+        """An executor's own policy takes precedence over the orchestrator default"""
+        async def handler(task):
+            raise RuntimeError("always")
+
+        orchestrator = Orchestrator(
+            executors={"async": AsyncTaskExecutor(handler, retry_policy=RetryPolicy(max_attempts=1))},
+            retry_policy=RetryPolicy(max_attempts=5, base_delay=0.001)
+        )
+        orchestrator.add_wave(Wave("wave1", "agent", ["task"]))
+
+        with pytest.raises(RuntimeError):
+            await orchestrator.execute()
+        assert orchestrator.state == ExecutionState.FAILED
+        assert orchestrator.task_stats["retries"] == 0
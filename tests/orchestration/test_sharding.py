@@ -0,0 +1,118 @@
+"""
+Tests for process-sharded task execution
+
+Requirements:
+- Waves are spread across shard processes
+- Shard progress is merged into the coordinator's waves and snapshots
+- HALT propagates to every shard and drops their queued tasks
+- A dead shard fails its tasks and is replaced
+"""
+
+import pytest
+import asyncio
+import os
+import time
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.sharding import ShardedTaskExecutor
+
+
+def pid_task(task: str) -> int:
+    """Module-level handlers so they can be pickled for the shards"""
+    time.sleep(0.02)
+    return os.getpid()
+
+
+def slow_task(task: str) -> None:
+    time.sleep(0.05)
+
+
+def failing_task(task: str) -> None:
+    raise ValueError(f"bad {task}")
+
+
+def crashing_task(task: str) -> None:
+    os._exit(1)
+
+
+@pytest.fixture
+def sharded():
+    executors = []
+
+    def make(handler, shards=2):
+        executor = ShardedTaskExecutor(handler, shards=shards)
+        executors.append(executor)
+        return executor
+
+    yield make
+    for executor in executors:
+        executor.shutdown()
+
+
+class TestShardedExecution:
+    """Test running waves on shard processes"""
+
+    @pytest.mark.asyncio
+    async def test_waves_spread_across_shards(self, sharded):
+        """Concurrent waves run in separate processes and snapshots see their progress"""
+        executor = sharded(pid_task, shards=2)
+        orchestrator = Orchestrator(max_concurrent_waves=2, executors={"async": executor},
+                                    task_checkpoint_interval=1)
+        orchestrator.add_waves(Wave(f"wave{i}", "agent", ["t1", "t2"], depends_on=[])
+                               for i in range(4))
+
+        result = await orchestrator.execute()
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        stats = executor.stats()
+        assert len({shard["pid"] for shard in stats}) == 2
+        assert os.getpid() not in {shard["pid"] for shard in stats}
+        assert sum(shard["tasks"] for shard in stats) == 8
+        checkpoints = [wave for snapshot in orchestrator.state_manager.snapshots
+                       for wave in snapshot.waves_state if wave["status"] == "running"]
+        assert {wave["wave_id"] for wave in checkpoints if wave["completed_tasks"]} == {
+            f"wave{i}" for i in range(4)}
+
+    @pytest.mark.asyncio
+    async def test_task_errors_propagate(self, sharded):
+        """A handler exception in a shard fails the wave"""
+        orchestrator = Orchestrator(executors={"async": sharded(failing_task)})
+        orchestrator.add_wave(Wave("wave1", "agent", ["t1"]))
+
+        with pytest.raises(ValueError, match="bad t1"):
+            await orchestrator.execute()
+
+    @pytest.mark.asyncio
+    async def test_halt_propagates_to_every_shard(self, sharded):
+        """HALT drops queued shard tasks; every shard acknowledges quickly"""
+        executor = sharded(slow_task, shards=2)
+        orchestrator = Orchestrator(max_concurrent_waves=4, executors={"async": executor})
+        orchestrator.add_waves(Wave(f"wave{i}", "agent", [f"t{j}" for j in range(4)], depends_on=[])
+                               for i in range(4))
+
+        execution = asyncio.create_task(orchestrator.execute())
+        await asyncio.sleep(0.3)  # shards started and busy, with tasks queued
+        orchestrator.halt()
+        await execution
+        for _ in range(100):
+            if executor.halt_acknowledged:
+                break
+            await asyncio.sleep(0.005)
+
+        assert orchestrator.state == ExecutionState.HALTED
+        assert executor.halt_acknowledged
+        assert executor.halt_latencies[-1] < 50
+        assert executor.dropped_on_halt > 0
+
+        result = await orchestrator.resume()
+        assert result["state"] == ExecutionState.COMPLETED.value
+
+    @pytest.mark.asyncio
+    async def test_dead_shard_is_replaced(self, sharded):
+        """Tasks on a crashed shard fail; the next dispatch starts a new shard"""
+        executor = sharded(crashing_task, shards=1)
+        with pytest.raises(RuntimeError, match="exited"):
+            await executor.run("t1")
+        assert executor.stats() == []
+
+        executor.handler = pid_task
+        assert await executor.run("t2") != os.getpid()
@@ -0,0 +1,219 @@
+"""
+Tests for StateManager structural-sharing snapshots
+
+Requirements:
+- Snapshots share unchanged wave records instead of copying them
+- History is referenced by offset, not copied
+- Rollback truncates history and restores only changed waves
+"""
+
+import sys
+import pytest
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.state_manager import StateManager, WaveTable, _record_bytes
+from orchestration.executors import AsyncTaskExecutor
+
+
+def make_waves(count: int):
+    return [Wave(f"wave{i}", "agent", ["task"]) for i in range(count)]
+
+
+def retained_bytes(manager: StateManager) -> int:
+    """Bytes kept alive by the retained snapshots, counting shared objects once"""
+    seen = set()
+    total = 0
+    for snapshot in manager.snapshots:
+        table = snapshot.waves_state
+        total += sys.getsizeof(snapshot) + sys.getsizeof(table._chunks)
+        for chunk in table._chunks:
+            if id(chunk) not in seen:
+                seen.add(id(chunk))
+                total += sys.getsizeof(chunk)
+            for record in chunk:
+                if id(record) not in seen:
+                    seen.add(id(record))
+                    total += _record_bytes(record)
+    return total
+
+
+class TestWaveTable:
+    """Test the persistent wave record table"""
+
+    def test_update_shares_untouched_chunks(self):
+        """Only the chunk containing a changed record is copied"""
+        records = [{"i": i} for i in range(200)]
+        table = WaveTable.from_records(records)
+
+        updated = table.update({130: {"i": "changed"}})
+
+        assert updated[130] == {"i": "changed"}
+        assert table[130] == {"i": 130}
+        assert updated._chunks[0] is table._chunks[0]
+        assert updated._chunks[2] is not table._chunks[2]
+        assert updated.changed_indices(table) == [130]
+
+    def test_update_appends_records(self):
+        """Updates directly after the end extend the table"""
+        table = WaveTable.from_records([{"i": 0}])
+        extended = table.update({1: {"i": 1}, 2: {"i": 2}})
+
+        assert len(extended) == 3
+        assert [r["i"] for r in extended] == [0, 1, 2]
+
+        with pytest.raises(IndexError):
+            table.update({5: {"i": 5}})
+
+
+class TestStructuralSnapshots:
+    """Test StateManager snapshot creation and rollback"""
+
+    def test_snapshot_records_only_changed_waves(self):
+        """Unchanged waves keep the same record object across snapshots"""
+        manager = StateManager()
+        waves = make_waves(100)
+        history = []
+
+        first = manager.create_snapshot(0, history, waves)
+        waves[5].status = "completed"
+        history.append({"wave_index": 5})
+        second = manager.create_snapshot(6, history, waves, changed=[5])
+
+        assert second.waves_state[5]["status"] == "completed"
+        assert first.waves_state[5]["status"] == "pending"
+        assert second.waves_state[99] is first.waves_state[99]
+        assert first.history_length == 0
+        assert second.history_length == 1
+
+    def test_rollback_discards_newer_snapshots(self):
+        """Rolling back makes the target the latest snapshot"""
+        manager = StateManager()
+        waves = make_waves(3)
+        for i in range(3):
+            manager.create_snapshot(i, [], waves, changed=[])
+
+        state = manager.rollback(2)
+
+        assert state["wave_index"] == 1
+        assert manager.get_snapshot_count() == 2
+
+
+class TestOrchestratorRollback:
+    """Test orchestrator rollback over shared snapshots"""
+
+    @pytest.mark.asyncio
+    async def test_rollback_truncates_history_in_place(self):
+        """History is truncated to the snapshot offset, not replaced by a copy"""
+        orchestrator = Orchestrator()
+        for wave in make_waves(4):
+            orchestrator.add_wave(wave)
+        await orchestrator.execute()
+
+        history = orchestrator.execution_history
+        orchestrator.rollback(2)
+
+        assert orchestrator.execution_history is history
+        assert len(history) == 2
+        assert orchestrator.current_wave_index == 2
+        assert [w.status for w in orchestrator.waves] == ["completed", "completed", "pending", "pending"]
+
+        await orchestrator.execute()
+        assert orchestrator.state == ExecutionState.COMPLETED
+        assert len(orchestrator.execution_history) == 4
+
+    @pytest.mark.asyncio
+    async def test_snapshots_share_records_during_execution(self):
+        """Consecutive snapshots share records of waves that did not change"""
+        async def instant(task):
+            return None
+
+        orchestrator = Orchestrator(executors={"async": AsyncTaskExecutor(instant)})
+        for wave in make_waves(100):
+            orchestrator.add_wave(wave)
+        await orchestrator.execute()
+
+        snapshots = orchestrator.state_manager.snapshots
+        assert snapshots[-1].waves_state[0] is snapshots[-2].waves_state[0]
+        assert snapshots[-1].waves_state[99] is snapshots[1].waves_state[99]
+
+
+class TestSnapshotRetention:
+    """Test count/byte budgets and thinning of the snapshot ring buffer"""
+
+    def test_count_limit_evicts_oldest(self):
+        """Oldest snapshots are evicted beyond max_snapshots"""
+        manager = StateManager(max_snapshots=3)
+        waves = make_waves(2)
+        for i in range(5):
+            manager.create_snapshot(i, [], waves, changed=[])
+
+        assert [s["wave_index"] for s in manager.list_snapshots()] == [2, 3, 4]
+
+    def test_byte_budget_evicts_until_within_budget(self):
+        """Retained snapshots stay within max_bytes"""
+        waves = make_waves(50)
+        probe = StateManager()
+        full_size = probe.create_snapshot(0, [], waves).approx_bytes
+
+        manager = StateManager(max_bytes=full_size * 3)
+        for i in range(10):
+            # Fresh waves so every snapshot allocates its own records
+            manager.create_snapshot(i, [], make_waves(50))
+
+        assert manager.get_memory_usage() <= full_size * 3
+        assert manager.get_snapshot_count() == 3
+        assert manager.get_memory_usage() == sum(s["approx_bytes"] for s in manager.list_snapshots())
+
+    @pytest.mark.parametrize("thin_every", [None, 3])
+    def test_byte_budget_counts_memory_shared_with_evicted(self, thin_every):
+        """Evicting or thinning old snapshots keeps the records later snapshots share accounted"""
+        waves = make_waves(2000)
+        probe = StateManager()
+        full_size = probe.create_snapshot(0, [], waves).approx_bytes
+        budget = int(full_size * 1.5)
+
+        manager = StateManager(max_bytes=budget, thin_every=thin_every)
+        manager.create_snapshot(0, [], waves)
+        for i in range(1, 200):
+            changed = [(i * 37 + k) % len(waves) for k in range(20)]
+            for index in changed:
+                waves[index].status = f"step{i}"
+            manager.create_snapshot(i, [], waves, changed=changed)
+            if i % 10:
+                continue
+
+            real = retained_bytes(manager)
+            assert real <= budget
+            assert manager.get_memory_usage() == pytest.approx(real, rel=0.01)
+        assert manager.get_snapshot_count() > 1
+
+    def test_full_snapshot_of_unchanged_waves_shares_records(self):
+        """Cached wave records are shared instead of re-allocated"""
+        manager = StateManager()
+        waves = make_waves(200)
+        first = manager.create_snapshot(0, [], waves)
+        second = manager.create_snapshot(1, [], waves)
+
+        assert second.waves_state[0] is first.waves_state[0]
+        assert second.approx_bytes < first.approx_bytes / 10
+
+    def test_delta_snapshots_are_smaller(self):
+        """A snapshot with one changed wave accounts far fewer bytes than a full one"""
+        manager = StateManager()
+        waves = make_waves(500)
+        full = manager.create_snapshot(0, [], waves)
+        waves[3].status = "completed"
+        delta = manager.create_snapshot(1, [], waves, changed=[3])
+
+        assert delta.approx_bytes * 10 < full.approx_bytes
+
+    def test_thinning_keeps_every_nth_old_snapshot(self):
+        """With thin_every, old snapshots are thinned before the oldest is evicted"""
+        manager = StateManager(max_snapshots=8, thin_every=4)
+        waves = make_waves(2)
+        for i in range(1, 10):
+            manager.create_snapshot(i, [], waves, changed=[])
+
+        sequences = [s["sequence"] for s in manager.list_snapshots()]
+        assert sequences[0] == 4
+        assert sequences[-1] == 9
+        assert len(sequences) <= 8
@@ -0,0 +1,122 @@
+"""
+Tests for versioned incremental status
+
+Requirements:
+- get_status carries a monotonically increasing version
+- get_status(since_version=N) returns only waves and fields changed after N
+- Unreconcilable versions fall back to a full status
+- Polling a running orchestrator without changes neither bumps the version
+  nor recomputes fields
+"""
+
+import pytest
+import asyncio
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.executors import AsyncTaskExecutor
+
+
+def make_orchestrator(count: int = 5) -> Orchestrator:
+    orchestrator = Orchestrator()
+    for i in range(count):
+        orchestrator.add_wave(Wave(f"wave{i}", "agent", ["t"]))
+    return orchestrator
+
+
+class TestStatusVersions:
+    """Test full and incremental status"""
+
+    def test_full_status_has_version(self):
+        """A plain get_status call returns everything plus a version"""
+        orchestrator = make_orchestrator()
+        status = orchestrator.get_status()
+
+        assert status["incremental"] is False
+        assert len(status["waves"]) == 5
+        assert status["version"] > 0
+
+    def test_no_changes_returns_empty_delta(self):
+        """Nothing changed since the version means an empty delta"""
+        orchestrator = make_orchestrator()
+        version = orchestrator.get_status()["version"]
+
+        delta = orchestrator.get_status(since_version=version)
+
+        assert delta["incremental"] is True
+        assert delta["version"] == version
+        assert delta["waves"] == []
+        assert delta["fields"] == {}
+
+    def test_delta_contains_only_changed_waves_and_fields(self):
+        """Only the touched wave and changed scalar fields are returned"""
+        orchestrator = make_orchestrator()
+        version = orchestrator.get_status()["version"]
+
+        orchestrator.waves[3].status = "completed"
+        orchestrator.state = ExecutionState.HALTED
+        delta = orchestrator.get_status(since_version=version)
+
+        assert [w["index"] for w in delta["waves"]] == [3]
+        assert delta["waves"][0]["status"] == "completed"
+        assert delta["fields"] == {"state": "halted"}
+        assert delta["version"] > version
+
+    @pytest.mark.asyncio
+    async def test_versions_increase_across_execution(self):
+        """Deltas applied in order reproduce the final full status"""
+        orchestrator = make_orchestrator(3)
+        mirror = orchestrator.get_status()
+
+        await orchestrator.execute()
+        delta = orchestrator.get_status(since_version=mirror["version"])
+
+        for wave_state in delta["waves"]:
+            index = wave_state.pop("index")
+            mirror["waves"][index] = wave_state
+        mirror.update(delta["fields"])
+
+        full = orchestrator.get_status()
+        assert mirror["waves"] == full["waves"]
+        assert all(mirror[name] == full[name] for name in delta["fields"])
+        assert mirror["state"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_idle_polls_during_run_are_empty(self, monkeypatch):
+        """Time passing while a wave runs changes nothing in the status"""
+        release = asyncio.Event()
+
+        async def handler(task):
+            await release.wait()
+
+        orchestrator = Orchestrator(executors={"async": AsyncTaskExecutor(handler)})
+        orchestrator.add_waves([Wave("done", "agent", ["t"]), Wave("blocked", "agent", ["t"])])
+        release.set()
+        execution = asyncio.create_task(orchestrator.execute())
+        while orchestrator.current_wave_index < 1:
+            await asyncio.sleep(0.001)
+        release.clear()
+        await asyncio.sleep(0.01)
+        version = orchestrator.get_status()["version"]
+
+        computed = []
+        original = orchestrator._status_fields
+        monkeypatch.setattr(orchestrator, "_status_fields", lambda: computed.append(1) or original())
+        await asyncio.sleep(0.02)
+        delta = orchestrator.get_status(since_version=version)
+        release.set()
+        await execution
+
+        assert delta["version"] == version
+        assert delta["fields"] == {} and delta["waves"] == []
+        assert computed == []
+        assert orchestrator.get_status()["agents"]["agent"]["utilization"] > 0
+
+    def test_reset_forces_full_status(self):
+        """After reset, old versions can no longer be reconciled"""
+        orchestrator = make_orchestrator()
+        version = orchestrator.get_status()["version"]
+
+        orchestrator.reset()
+        status = orchestrator.get_status(since_version=version)
+
+        assert status["incremental"] is False
+        assert status["waves"] == []
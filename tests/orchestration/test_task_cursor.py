@@ -0,0 +1,94 @@
+"""
+Tests for task-level progress tracking inside waves
+
+Requirements:
+- RESUME skips tasks that completed before the halt
+- Snapshots capture per-task completion
+- ROLLBACK restores the task cursor of a mid-wave checkpoint
+"""
+
+import pytest
+import asyncio
+from collections import Counter
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.executors import AsyncTaskExecutor
+
+
+def counting_executor(runs: Counter, delay: float = 0.005) -> AsyncTaskExecutor:
+    """Executor that counts completed runs per task"""
+    async def handler(task):
+        await asyncio.sleep(delay)
+        runs[task] += 1
+    return AsyncTaskExecutor(handler, max_concurrency=1)
+
+
+class TestResumeTaskCursor:
+    """Test RESUME continues inside a halted wave"""
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_tasks(self):
+        """Tasks finished before HALT are not executed again"""
+        runs = Counter()
+        tasks = [f"t{i}" for i in range(40)]
+        orchestrator = Orchestrator(executors={"async": counting_executor(runs)})
+        orchestrator.add_wave(Wave("wave1", "agent1", tasks))
+
+        execution_task = asyncio.create_task(orchestrator.execute())
+        await asyncio.sleep(0.05)
+        orchestrator.halt()
+        await execution_task
+
+        wave = orchestrator.waves[0]
+        done_at_halt = set(wave.completed_tasks)
+        assert wave.status == "halted"
+        assert 0 < len(done_at_halt) < len(tasks)
+        assert orchestrator.execution_history[-1]["tasks_completed"] == len(done_at_halt)
+
+        await orchestrator.resume()
+
+        assert orchestrator.state == ExecutionState.COMPLETED
+        assert wave.completed_tasks == set(range(len(tasks)))
+        assert all(runs[task] == 1 for task in tasks)
+
+
+class TestTaskCheckpoints:
+    """Test mid-wave snapshots and task-granular rollback"""
+
+    @pytest.mark.asyncio
+    async def test_checkpoints_capture_completed_tasks(self):
+        """A snapshot is taken every task_checkpoint_interval tasks"""
+        orchestrator = Orchestrator(
+            executors={"async": counting_executor(Counter(), delay=0)},
+            task_checkpoint_interval=2
+        )
+        orchestrator.add_wave(Wave("wave1", "agent1", [f"t{i}" for i in range(6)]))
+
+        await orchestrator.execute()
+
+        # One snapshot at wave start plus checkpoints after tasks 2 and 4
+        assert orchestrator.state_manager.get_snapshot_count() == 3
+        latest = orchestrator.state_manager.get_snapshot(1)
+        assert latest.waves_state[0]["completed_tasks"] == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_rollback_restores_task_cursor(self):
+        """Rolling back to a checkpoint re-runs only tasks after it"""
+        runs = Counter()
+        tasks = [f"t{i}" for i in range(6)]
+        orchestrator = Orchestrator(
+            executors={"async": counting_executor(runs, delay=0)},
+            task_checkpoint_interval=2
+        )
+        orchestrator.add_wave(Wave("wave1", "agent1", tasks))
+        await orchestrator.execute()
+
+        orchestrator.rollback(1)
+
+        wave = orchestrator.waves[0]
+        assert wave.status == "pending"
+        assert wave.completed_tasks == {0, 1, 2, 3}
+
+        await orchestrator.execute()
+
+        assert orchestrator.state == ExecutionState.COMPLETED
+        assert [runs[t] for t in tasks] == [1, 1, 1, 1, 2, 2]
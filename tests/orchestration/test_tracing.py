@@ -0,0 +1,119 @@
+"""
+Tests for span tracing and Chrome trace export
+
+Requirements:
+- Events go to a fixed-size ring buffer
+- Waves, tasks, snapshots, HALT/RESUME/ROLLBACK and decisions are traced
+- Export is valid Chrome trace JSON with named tracks
+"""
+
+import pytest
+import asyncio
+import json
+from orchestration.orchestrator import Orchestrator, Wave
+from orchestration.decision_engine import DecisionOption
+from orchestration.executors import AsyncTaskExecutor
+from orchestration.tracing import TraceRecorder
+
+
+def events(recorder: TraceRecorder, category: str):
+    return [e for e in recorder.to_chrome_trace()["traceEvents"] if e.get("cat") == category]
+
+
+class TestTraceRecorder:
+    """Test the ring buffer and export format"""
+
+    def test_ring_buffer_drops_oldest(self):
+        """Beyond capacity the oldest events are overwritten"""
+        recorder = TraceRecorder(capacity=3)
+        for i in range(5):
+            recorder.instant(f"event{i}", "test", "track", float(i))
+
+        assert len(recorder) == 3
+        assert recorder.dropped == 2
+        names = [e["name"] for e in events(recorder, "test")]
+        assert names == ["event2", "event3", "event4"]
+
+    def test_chrome_trace_format(self):
+        """Spans become complete events in microseconds from the first event"""
+        recorder = TraceRecorder()
+        recorder.complete("span", "test", ("wave1", "worker", 0), 10.0, 10.5, {"k": 1})
+
+        trace = recorder.to_chrome_trace()
+        span = events(recorder, "test")[0]
+
+        assert span["ph"] == "X"
+        assert span["ts"] == 0
+        assert span["dur"] == 500000
+        assert span["args"] == {"k": 1}
+        thread_names = [e["args"]["name"] for e in trace["traceEvents"] if e["name"] == "thread_name"]
+        assert thread_names == ["wave1 worker 0"]
+
+
+class TestOrchestratorTracing:
+    """Test spans emitted during execution"""
+
+    @pytest.mark.asyncio
+    async def test_run_traces_waves_tasks_and_snapshots(self, tmp_path):
+        """Every wave and task gets a span; independent waves overlap"""
+        recorder = TraceRecorder(task_spans=True)
+        orchestrator = Orchestrator(executors={"async": AsyncTaskExecutor(max_concurrency=2)},
+                                    tracer=recorder)
+        orchestrator.add_waves(Wave(f"wave{i}", "agent", ["t1", "t2", "t3"], depends_on=[])
+                               for i in range(2))
+
+        await orchestrator.execute()
+
+        waves = events(recorder, "wave")
+        assert sorted(e["name"] for e in waves) == ["wave0", "wave1"]
+        first, second = sorted(waves, key=lambda e: e["ts"])
+        assert second["ts"] < first["ts"] + first["dur"]
+        assert len(events(recorder, "task")) == 6
+        assert len(events(recorder, "snapshot")) == 2
+
+        path = recorder.export(tmp_path / "trace.json")
+        assert json.loads(path.read_text())["traceEvents"]
+
+    @pytest.mark.asyncio
+    async def test_control_events_traced(self):
+        """HALT, RESUME and ROLLBACK appear on the control track"""
+        recorder = TraceRecorder()
+        orchestrator = Orchestrator(tracer=recorder)
+        orchestrator.add_waves(Wave(f"wave{i}", "agent", ["t1", "t2", "t3"]) for i in range(3))
+
+        execution = asyncio.create_task(orchestrator.execute())
+        await asyncio.sleep(0.025)
+        orchestrator.halt()
+        await execution
+        await orchestrator.resume()
+        orchestrator.rollback(1)
+
+        names = [e["name"] for e in events(recorder, "control")]
+        assert names == ["HALT requested", "HALT", "RESUME", "ROLLBACK"]
+
+    @pytest.mark.asyncio
+    async def test_task_spans_are_opt_in(self):
+        """By default only wave-level events are kept"""
+        recorder = TraceRecorder()
+        orchestrator = Orchestrator(tracer=recorder)
+        orchestrator.add_wave(Wave("wave1", "agent", ["t1", "t2"]))
+
+        await orchestrator.execute()
+
+        assert not events(recorder, "task")
+        assert len(events(recorder, "wave")) == 1
+
+    @pytest.mark.asyncio
+    async def test_decision_traced(self):
+        """Decision requests are traced with their outcome"""
+        recorder = TraceRecorder()
+        orchestrator = Orchestrator(tracer=recorder)
+
+        await orchestrator._request_decision(
+            "Which approach?",
+            [DecisionOption(id="a", label="A", description="", confidence=0.99)]
+        )
+
+        decision = events(recorder, "decision")[0]
+        assert decision["name"] == "Which approach?"
+        assert decision["args"]["auto_approved"] is True
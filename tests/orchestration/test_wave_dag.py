@@ -0,0 +1,129 @@
+"""
+Tests for dependency-aware parallel wave scheduling
+
+Requirements:
+- Independent waves execute concurrently
+- Dependent waves start only after their dependencies complete
+- Concurrency cap is respected
+- Invalid graphs (unknown dependency, cycle) are rejected
+- HALT/RESUME work across a concurrent frontier
+"""
+
+import pytest
+import asyncio
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.scheduler import WaveScheduler
+
+
+class TestWaveScheduler:
+    """Test DAG construction and ready ordering"""
+
+    def test_implicit_sequential_dependencies(self):
+        """Waves without depends_on depend on the preceding wave"""
+        waves = [Wave("w1", "a", ["t"]), Wave("w2", "a", ["t"]), Wave("w3", "a", ["t"])]
+        scheduler = WaveScheduler()
+        scheduler.build(waves)
+
+        assert scheduler.pop_ready() == 0
+        assert not scheduler.has_ready()
+        assert scheduler.complete(0) == [1]
+
+    def test_independent_waves_ready_together(self):
+        """Waves with empty depends_on are all ready immediately"""
+        waves = [Wave(f"w{i}", "a", ["t"], depends_on=[]) for i in range(3)]
+        scheduler = WaveScheduler()
+        scheduler.build(waves)
+
+        assert [scheduler.pop_ready() for _ in range(3)] == [0, 1, 2]
+
+    def test_unknown_dependency_rejected(self):
+        """Depending on a missing wave raises ValueError"""
+        scheduler = WaveScheduler()
+        with pytest.raises(ValueError, match="unknown wave"):
+            scheduler.build([Wave("w1", "a", ["t"], depends_on=["missing"])])
+
+    def test_cycle_rejected(self):
+        """Dependency cycles raise ValueError"""
+        waves = [
+            Wave("w1", "a", ["t"], depends_on=["w2"]),
+            Wave("w2", "a", ["t"], depends_on=["w1"]),
+        ]
+        scheduler = WaveScheduler()
+        with pytest.raises(ValueError, match="cycle"):
+            scheduler.build(waves)
+
+
+class TestParallelExecution:
+    """Test concurrent execution of the wave DAG"""
+
+    @pytest.mark.asyncio
+    async def test_independent_waves_overlap(self):
+        """Independent waves run concurrently"""
+        orchestrator = Orchestrator(max_concurrent_waves=4)
+        for i in range(4):
+            orchestrator.add_wave(Wave(f"w{i}", f"agent{i}", ["t1", "t2", "t3"], depends_on=[]))
+
+        result = await orchestrator.execute()
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        waves = orchestrator.waves
+        latest_start = max(w.started_at for w in waves)
+        earliest_end = min(w.completed_at for w in waves)
+        assert latest_start < earliest_end
+
+    @pytest.mark.asyncio
+    async def test_dependencies_respected(self):
+        """A wave starts only after all of its dependencies completed"""
+        orchestrator = Orchestrator()
+        orchestrator.add_wave(Wave("build_a", "a", ["t1"], depends_on=[]))
+        orchestrator.add_wave(Wave("build_b", "b", ["t1", "t2"], depends_on=[]))
+        orchestrator.add_wave(Wave("integrate", "c", ["t1"], depends_on=["build_a", "build_b"]))
+
+        await orchestrator.execute()
+
+        a, b, integrate = orchestrator.waves
+        assert integrate.started_at >= max(a.completed_at, b.completed_at)
+        assert orchestrator.current_wave_index == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """No more than max_concurrent_waves run at once"""
+        orchestrator = Orchestrator(max_concurrent_waves=2)
+        for i in range(6):
+            orchestrator.add_wave(Wave(f"w{i}", "a", ["t1", "t2"], depends_on=[]))
+
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            while orchestrator.state != ExecutionState.COMPLETED:
+                running = sum(1 for w in orchestrator.waves if w.status == "running")
+                peak = max(peak, running)
+                await asyncio.sleep(0.001)
+
+        watcher = asyncio.create_task(watch())
+        await orchestrator.execute()
+        await watcher
+
+        assert 1 <= peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_halt_and_resume_concurrent_frontier(self):
+        """HALT stops the whole frontier and RESUME finishes the remaining waves"""
+        orchestrator = Orchestrator(max_concurrent_waves=2)
+        for i in range(4):
+            orchestrator.add_wave(Wave(f"w{i}", "a", [f"t{j}" for j in range(10)], depends_on=[]))
+
+        execution_task = asyncio.create_task(orchestrator.execute())
+        await asyncio.sleep(0.03)
+        orchestrator.halt()
+        await execution_task
+
+        assert orchestrator.state == ExecutionState.HALTED
+        assert not any(w.status == "running" for w in orchestrator.waves)
+        assert orchestrator.current_wave_index < len(orchestrator.waves)
+
+        result = await orchestrator.resume()
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert all(w.status == "completed" for w in orchestrator.waves)
@@ -0,0 +1,153 @@
+"""
+Tests for streaming wave intake and bulk wave registration
+
+Requirements:
+- execute() runs waves from an async iterator as they are produced
+- The intake queue applies backpressure to the wave source
+- Streamed waves survive HALT/RESUME
+- add_waves validates every wave before adding any
+"""
+
+import pytest
+import asyncio
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
+from orchestration.scheduler import WaveScheduler
+
+
+async def wave_source(count: int, produced=None, independent: bool = False):
+    for i in range(count):
+        if produced is not None:
+            produced.append(i)
+        yield Wave(f"wave{i}", "agent", ["task"], depends_on=[] if independent else None)
+
+
+class TestSchedulerAdd:
+    """Test registering waves after build()"""
+
+    def test_added_wave_waits_for_dependency(self):
+        """An appended wave is ready only once its dependency completes"""
+        waves = [Wave("w1", "a", ["t"])]
+        scheduler = WaveScheduler()
+        scheduler.build(waves)
+        assert scheduler.pop_ready() == 0
+
+        wave = Wave("w2", "a", ["t"])
+        scheduler.add(1, wave)
+        waves.append(wave)
+
+        assert not scheduler.has_ready()
+        assert scheduler.complete(0) == [1]
+
+    def test_add_rejects_forward_dependency(self):
+        """Streamed waves may only depend on waves already in the plan"""
+        scheduler = WaveScheduler()
+        scheduler.build([])
+
+        with pytest.raises(ValueError, match="unknown wave"):
+            scheduler.add(0, Wave("w1", "a", ["t"], depends_on=["w2"]))
+        assert scheduler.pending_count() == 0
+
+
+class TestStreamingExecution:
+    """Test execute() with an async wave source"""
+
+    @pytest.mark.asyncio
+    async def test_streamed_waves_all_complete(self):
+        """Every produced wave runs, after the waves already added"""
+        orchestrator = Orchestrator()
+        orchestrator.add_wave(Wave("first", "agent", ["task"]))
+
+        result = await orchestrator.execute(wave_source(20))
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert result["total_waves"] == 21
+        assert not result["streaming"]
+        assert [entry["wave_id"] for entry in orchestrator.execution_history][:2] == ["first", "wave0"]
+        assert all(w.status == "completed" for w in orchestrator.waves)
+
+    @pytest.mark.asyncio
+    async def test_intake_applies_backpressure(self):
+        """The source is not drained far ahead of execution"""
+        produced = []
+        orchestrator = Orchestrator(max_concurrent_waves=2, intake_queue_size=3)
+        execution = asyncio.create_task(orchestrator.execute(wave_source(100, produced)))
+
+        await asyncio.sleep(0.05)
+        in_plan = len(orchestrator.waves)
+        completed = sum(w.status == "completed" for w in orchestrator.waves)
+
+        # queue + producer's pending put + admitted-but-unstarted + running
+        assert len(produced) <= completed + 3 + 1 + 2 + 2
+        assert in_plan < 100
+
+        orchestrator.halt()
+        await execution
+
+    @pytest.mark.asyncio
+    async def test_halt_and_resume_keep_stream(self):
+        """RESUME continues the attached source without losing waves"""
+        orchestrator = Orchestrator(max_concurrent_waves=2, intake_queue_size=2)
+        execution = asyncio.create_task(orchestrator.execute(wave_source(30, independent=True)))
+
+        await asyncio.sleep(0.03)
+        orchestrator.halt()
+        await execution
+        assert orchestrator.state == ExecutionState.HALTED
+        assert orchestrator.streaming
+
+        result = await orchestrator.resume()
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert [w.wave_id for w in orchestrator.waves] == [f"wave{i}" for i in range(30)]
+        assert all(w.status == "completed" for w in orchestrator.waves)
+
+    @pytest.mark.asyncio
+    async def test_source_error_fails_execution(self):
+        """An exception raised by the source fails the run"""
+        async def broken_source():
+            yield Wave("wave0", "agent", ["task"])
+            raise RuntimeError("planner crashed")
+
+        orchestrator = Orchestrator()
+
+        with pytest.raises(RuntimeError, match="planner crashed"):
+            await orchestrator.execute(broken_source())
+        assert orchestrator.state == ExecutionState.FAILED
+        assert not orchestrator.streaming
+
+    @pytest.mark.asyncio
+    async def test_second_source_rejected(self):
+        """Only one wave source can be attached at a time"""
+        orchestrator = Orchestrator(intake_queue_size=1)
+        execution = asyncio.create_task(orchestrator.execute(wave_source(10)))
+        await asyncio.sleep(0.01)
+        orchestrator.halt()
+        await execution
+
+        with pytest.raises(ValueError, match="already attached"):
+            await orchestrator.execute(wave_source(1))
+        orchestrator.reset()
+        assert not orchestrator.streaming
+
+
+class TestAddWaves:
+    """Test bulk wave registration"""
+
+    def test_add_waves_registers_all(self):
+        """add_waves appends every wave in order"""
+        orchestrator = Orchestrator()
+
+        added = orchestrator.add_waves(Wave(f"wave{i}", "agent", ["task"]) for i in range(5))
+
+        assert added == 5
+        assert [w.wave_id for w in orchestrator.waves] == [f"wave{i}" for i in range(5)]
+        assert orchestrator.get_status()["total_waves"] == 5
+
+    def test_add_waves_is_all_or_nothing(self):
+        """A wave with an unknown executor rejects the whole batch"""
+        orchestrator = Orchestrator()
+        waves = [Wave("wave0", "agent", ["task"]), Wave("wave1", "agent", ["task"], executor="gpu")]
+
+        with pytest.raises(ValueError, match="unknown executor"):
+            orchestrator.add_waves(waves)
+        assert orchestrator.waves == []
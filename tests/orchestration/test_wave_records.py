@@ -0,0 +1,66 @@
+"""
+Tests for the compact Wave representation
+
+Requirements:
+- Waves are slotted (no per-instance __dict__)
+- to_dict() records are cached until the wave changes
+- Status deltas do not mutate cached records
+"""
+
+from orchestration.orchestrator import Orchestrator, Wave
+
+
+class TestWaveRecords:
+    """Test slotted waves and cached records"""
+
+    def test_wave_is_slotted(self):
+        """Waves carry no per-instance __dict__"""
+        wave = Wave("wave1", "agent1", ["task1"])
+
+        assert not hasattr(wave, "__dict__")
+
+    def test_to_dict_is_cached_until_change(self):
+        """Unchanged waves return the same record object"""
+        wave = Wave("wave1", "agent1", ["task1", "task2"])
+        record = wave.to_dict()
+
+        assert wave.to_dict() is record
+
+        wave.status = "running"
+        updated = wave.to_dict()
+        assert updated is not record
+        assert updated["status"] == "running"
+        assert record["status"] == "pending"
+
+    def test_task_completion_invalidates_record(self):
+        """Completing a task refreshes the cached record"""
+        wave = Wave("wave1", "agent1", ["task1", "task2"])
+        record = wave.to_dict()
+
+        wave.mark_task_completed(1)
+
+        assert record["completed_tasks"] == []
+        assert wave.to_dict()["completed_tasks"] == [1]
+
+    def test_empty_cursor_is_not_shared_after_completion(self):
+        """Marking a task on one wave leaves other waves untouched"""
+        first = Wave("wave1", "agent1", ["task1"])
+        second = Wave("wave2", "agent2", ["task2"])
+
+        first.mark_task_completed(0)
+
+        assert first.completed_tasks == {0}
+        assert second.completed_tasks == set()
+
+    def test_status_delta_does_not_mutate_record(self):
+        """Incremental status adds the index without touching the cached record"""
+        orchestrator = Orchestrator()
+        wave = Wave("wave1", "agent1", ["task1"])
+        orchestrator.add_wave(wave)
+        version = orchestrator.get_status()["version"]
+
+        wave.status = "completed"
+        delta = orchestrator.get_status(since_version=version)
+
+        assert delta["waves"][0]["index"] == 0
+        assert "index" not in wave.to_dict()
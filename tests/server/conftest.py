@@ -0,0 +1,21 @@
+"""Shared fixtures for server tests"""
+import pytest
+from unittest.mock import AsyncMock
+from server.websocket import sio
+
+
+@pytest.fixture
+async def mock_emit():
+    """Mock socketio emit function"""
+    original_emit = sio.emit
+    sio.emit = AsyncMock()
+    yield sio.emit
+    sio.emit = original_emit
+
+
+@pytest.fixture
+def emitted(mock_emit):
+    """Payloads emitted so far for an event, in order"""
+    def payloads(event):
+        return [call[0][1] for call in mock_emit.call_args_list if call[0][0] == event]
+    return payloads
@@ -0,0 +1,102 @@
+"""
+Tests for the /metrics endpoint
+
+Tests the Prometheus exposition served next to the Socket.IO server.
+"""
+import pytest
+from unittest.mock import AsyncMock
+from server import metrics, websocket
+from server.metrics import metrics_app
+from server.websocket import sio, connect, disconnect, set_orchestrator
+from orchestration.orchestrator import Orchestrator, Wave
+from tests.metrics_helpers import sample
+
+
+async def request(app, path, method='GET'):
+    """Call an ASGI app with an HTTP request; returns (status, headers, body)"""
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({'type': 'http', 'method': method, 'path': path, 'headers': [],
+               'query_string': b''}, receive, send)
+    start, body = messages
+    return start['status'], dict(start['headers']), body['body'].decode()
+
+
+class TestMetricsEndpoint:
+    """Test serving and contents of /metrics"""
+
+    @pytest.mark.asyncio
+    async def test_serves_prometheus_text(self):
+        """GET /metrics returns the text exposition format"""
+        status, headers, body = await request(metrics_app, '/metrics')
+
+        assert status == 200
+        assert headers[b'content-type'].startswith(b'text/plain; version=0.0.4')
+        assert '# TYPE shannon_task_latency_seconds histogram' in body
+        assert '# TYPE shannon_connected_clients gauge' in body
+
+    @pytest.mark.asyncio
+    async def test_head_sends_headers_only(self):
+        """HEAD /metrics advertises the GET body's length but sends no body"""
+        _, get_headers, _ = await request(metrics_app, '/metrics')
+        status, headers, body = await request(metrics_app, '/metrics', method='HEAD')
+
+        assert status == 200
+        assert headers[b'content-type'] == get_headers[b'content-type']
+        assert int(headers[b'content-length']) > 0
+        assert body == ''
+
+    @pytest.mark.asyncio
+    async def test_other_paths_not_found(self):
+        """Only /metrics is served"""
+        status, _, _ = await request(metrics_app, '/other')
+        assert status == 404
+
+    @pytest.mark.asyncio
+    async def test_mounted_on_socketio_app(self):
+        """The server's ASGI app routes /metrics past Socket.IO"""
+        status, _, body = await request(websocket.app, '/metrics')
+        assert status == 200
+        assert 'shannon_socketio_emits_total' in body
+
+    @pytest.mark.asyncio
+    async def test_clients_and_emits_counted(self):
+        """Connections move the client gauge and emits are counted"""
+        send = AsyncMock()
+        original = sio._send_packet
+        sio._send_packet = send
+        clients = metrics.connected_clients.get()
+        emits = metrics.emits_total.value
+        try:
+            await connect('metrics-sid', {})
+            assert metrics.connected_clients.get() == clients + 1
+            assert metrics.emits_total.value == emits + 1
+            await disconnect('metrics-sid')
+        finally:
+            sio._send_packet = original
+
+        assert metrics.connected_clients.get() == clients
+
+    @pytest.mark.asyncio
+    async def test_orchestrator_metrics_attached(self):
+        """The registered orchestrator reports wave metrics on /metrics"""
+        orch = Orchestrator()
+        orch.add_wave(Wave("wave1", "agent1", ["task1"]))
+        set_orchestrator(orch)
+        try:
+            completed = metrics.orchestrator_metrics.waves_completed.value
+            await orch.execute()
+            _, _, body = await request(metrics_app, '/metrics')
+        finally:
+            set_orchestrator(None)
+
+        assert orch.metrics is metrics.orchestrator_metrics
+        assert sample(body, 'shannon_waves_completed_total') == completed + 1
+        assert sample(body, 'shannon_pending_decisions') == len(
+            websocket.decision_engine.pending_decisions)
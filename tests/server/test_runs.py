@@ -0,0 +1,190 @@
+"""
+Tests for the multi-run registry
+
+Tests run registration, per-run limits and control events targeting runs.
+"""
+import pytest
+import asyncio
+from unittest.mock import AsyncMock
+from server import websocket
+from server.runs import RunLimits, RunRegistry, DEFAULT_RUN_ID
+from server.websocket import (
+    sio, set_orchestrator, halt_execution, get_execution_status, broadcast_status, join_run, leave_run,
+    list_runs
+)
+from orchestration.orchestrator import Orchestrator, Wave
+
+
+@pytest.fixture
+def two_runs():
+    """Register the default run and a second run"""
+    default, other = Orchestrator(), Orchestrator()
+    default.add_wave(Wave("wave1", "agent1", ["task1"]))
+    other.add_waves(Wave(f"wave{i}", "agent1", ["task1"]) for i in range(3))
+    set_orchestrator(default)
+    set_orchestrator(other, run_id="run-b")
+    yield default, other
+    set_orchestrator(None)
+    set_orchestrator(None, run_id="run-b")
+
+
+def orchestrator_with_waves(count):
+    orchestrator = Orchestrator()
+    orchestrator.add_waves(Wave(f"wave{i}", "agent", ["t1", "t2"], depends_on=[]) for i in range(count))
+    return orchestrator
+
+
+class TestRunRegistry:
+    """Test registration, limits and concurrent execution"""
+
+    def test_register_and_remove(self):
+        """Runs are keyed by id; duplicate ids and a full registry are rejected"""
+        registry = RunRegistry(max_runs=2)
+        registry.register("a", Orchestrator())
+        registry.register("b", Orchestrator())
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register("a", Orchestrator())
+        with pytest.raises(ValueError, match="Run limit"):
+            registry.register("c", Orchestrator())
+
+        registry.remove("a")
+        assert "a" not in registry
+        assert len(registry) == 1
+
+    def test_limits_tighten_orchestrator_settings(self):
+        """Per-run limits cap concurrency and snapshot retention"""
+        orchestrator = Orchestrator(max_concurrent_waves=8)
+        RunRegistry().register("a", orchestrator,
+                               RunLimits(max_concurrent_waves=2, max_snapshots=5,
+                                         max_snapshot_bytes=1024))
+
+        assert orchestrator.max_concurrent_waves == 2
+        assert orchestrator.state_manager.max_snapshots == 5
+        assert orchestrator.state_manager.max_bytes == 1024
+
+        with pytest.raises(ValueError, match="at least 1"):
+            RunLimits(max_snapshots=0)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_share_loop(self):
+        """Started runs execute concurrently on the running loop"""
+        registry = RunRegistry()
+        for run_id in ("a", "b", "c"):
+            registry.register(run_id, orchestrator_with_waves(2))
+
+        tasks = [registry.start(run_id) for run_id in ("a", "b", "c")]
+        assert registry.active_count == 3
+        await asyncio.gather(*tasks)
+
+        assert all(run.orchestrator.state.value == "completed" for run in registry)
+        with pytest.raises(ValueError, match="Unknown run"):
+            registry.start("missing")
+
+    @pytest.mark.asyncio
+    async def test_max_active_runs_queues_extra_runs(self):
+        """Runs beyond max_active_runs wait for a slot"""
+        registry = RunRegistry(max_active_runs=1)
+        first = registry.register("a", orchestrator_with_waves(3))
+        second = registry.register("b", orchestrator_with_waves(3))
+
+        tasks = [registry.start("a"), registry.start("b")]
+        await asyncio.sleep(0.02)
+        assert first.orchestrator.state.value == "running"
+        assert second.orchestrator.state.value == "idle"
+
+        await asyncio.gather(*tasks)
+        assert second.orchestrator.state.value == "completed"
+
+
+class TestRunControlEvents:
+    """Test control events routed by run_id"""
+
+    @pytest.mark.asyncio
+    async def test_status_targets_run(self, emitted, two_runs):
+        """get_execution_status reports the requested run"""
+        await get_execution_status('sid', {'run_id': 'run-b'})
+        await get_execution_status('sid', {})
+
+        run_b, default = emitted('execution:status')
+        assert run_b['run_id'] == 'run-b'
+        assert run_b['status']['total_waves'] == 3
+        assert default['run_id'] == DEFAULT_RUN_ID
+        assert default['status']['total_waves'] == 1
+
+    @pytest.mark.asyncio
+    async def test_halt_targets_only_its_run(self, mock_emit, two_runs):
+        """HALT on one run leaves the others untouched"""
+        default, other = two_runs
+        await halt_execution('sid', {'run_id': 'run-b'})
+
+        assert other.halt_requested
+        assert not default.halt_requested
+
+    @pytest.mark.asyncio
+    async def test_unknown_run_is_an_error(self, emitted, two_runs):
+        """Control events for unregistered runs emit UNKNOWN_RUN"""
+        await halt_execution('sid', {'run_id': 'missing'})
+
+        error = emitted('error')[0]
+        assert error['code'] == 'UNKNOWN_RUN'
+        assert error['run_id'] == 'missing'
+
+    @pytest.mark.asyncio
+    async def test_join_run_validates_payload(self, emitted, two_runs):
+        """join_run emits errors for malformed payloads and unknown runs"""
+        await join_run('sid', 'run-b')
+        await join_run('sid', {'run_id': ['run-b']})
+        await join_run('sid', {'run_id': 'missing'})
+
+        codes = [error['code'] for error in emitted('error')]
+        assert codes == ['INVALID_REQUEST', 'INVALID_REQUEST', 'UNKNOWN_RUN']
+        assert not emitted('run:joined')
+
+    @pytest.mark.asyncio
+    async def test_leave_run_leaves_joined_room(self, mock_emit, two_runs):
+        """leave_run leaves the same room join_run entered"""
+        original_enter, original_leave = sio.enter_room, sio.leave_room
+        sio.enter_room, sio.leave_room = AsyncMock(), AsyncMock()
+        try:
+            await join_run('sid', {'run_id': 'run-b'})
+            await leave_run('sid', {'run_id': 'run-b'})
+            entered, left = sio.enter_room.call_args, sio.leave_room.call_args
+        finally:
+            sio.enter_room, sio.leave_room = original_enter, original_leave
+
+        assert left == entered == (('sid', websocket.runs.get('run-b').room),)
+
+    @pytest.mark.asyncio
+    async def test_status_rejects_non_integer_since_version(self, emitted, two_runs):
+        """A since_version that is not an integer is an INVALID_REQUEST"""
+        for since_version in ('3', 1.5, True):
+            await get_execution_status('sid', {'since_version': since_version})
+
+        assert [error['code'] for error in emitted('error')] == ['INVALID_REQUEST'] * 3
+        assert not emitted('execution:status')
+
+    @pytest.mark.asyncio
+    async def test_run_broadcasts_go_to_joined_clients(self, mock_emit, two_runs):
+        """Non-default runs broadcast to their room; the default run to everyone"""
+        original_enter = sio.enter_room
+        sio.enter_room = AsyncMock()
+        try:
+            await join_run('sid', {'run_id': 'run-b'})
+        finally:
+            sio.enter_room = original_enter
+        await broadcast_status('run-b')
+        await broadcast_status()
+
+        run_b, default = [call for call in mock_emit.call_args_list if call[0][0] == 'execution:status_update']
+        assert run_b[1]['room'] == 'run:run-b'
+        assert 'room' not in default[1]
+        assert websocket.runs.get('run-b').last_broadcast_version == run_b[0][1]['status']['version']
+
+    @pytest.mark.asyncio
+    async def test_list_runs(self, emitted, two_runs):
+        """list_runs reports every registered run"""
+        await list_runs('sid')
+
+        payload = emitted('runs:list')[0]
+        assert sorted(run['run_id'] for run in payload['runs']) == [DEFAULT_RUN_ID, 'run-b']
@@ -0,0 +1,52 @@
+"""
+Tests for WebSocket execution control handlers
+
+Tests status requests and broadcasts for the orchestrator.
+"""
+import pytest
+from server import websocket
+from server.websocket import get_execution_status, broadcast_status, set_orchestrator
+from orchestration.orchestrator import Orchestrator, Wave
+
+
+@pytest.fixture
+def orchestrator():
+    """Install a fresh orchestrator with two waves"""
+    orch = Orchestrator()
+    orch.add_wave(Wave("wave1", "agent1", ["task1"]))
+    orch.add_wave(Wave("wave2", "agent2", ["task2"]))
+    set_orchestrator(orch)
+    yield orch
+    set_orchestrator(None)
+
+
+class TestStatusHandlers:
+    """Test full and incremental status delivery"""
+
+    @pytest.mark.asyncio
+    async def test_get_status_since_version(self, emitted, orchestrator):
+        """Clients can request only changes since a known version"""
+        await get_execution_status('test-sid', {})
+        full = emitted('execution:status')[0]['status']
+
+        orchestrator.waves[1].status = "completed"
+        await get_execution_status('test-sid', {'since_version': full['version']})
+        delta = emitted('execution:status')[1]['status']
+
+        assert full['incremental'] is False
+        assert delta['incremental'] is True
+        assert [w['index'] for w in delta['waves']] == [1]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_deltas_after_first(self, emitted, orchestrator):
+        """Only the first broadcast carries the full wave list"""
+        await broadcast_status()
+        orchestrator.waves[0].status = "completed"
+        await broadcast_status()
+
+        first, second = [payload['status'] for payload in emitted('execution:status_update')]
+        assert first['incremental'] is False
+        assert len(first['waves']) == 2
+        assert second['incremental'] is True
+        assert [w['index'] for w in second['waves']] == [0]
+        assert websocket.last_broadcast_version == second['version']
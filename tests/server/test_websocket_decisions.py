@@ -4,9 +4,16 @@ Tests for WebSocket decision approval handler
 Tests the approve_decision handler functionality.
 """
 import pytest
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
-from server.websocket import sio, decision_engine, approve_decision, get_decision_engine
-from orchestration.decision_engine import DecisionOption
+from server.websocket import (
+    sio, decision_engine, approve_decision, approve_decisions, emit_decision_requests,
+    request_decision_metrics, request_pending_decisions, get_decision_engine, set_orchestrator
+)
+from orchestration.decision_engine import DecisionEngine, DecisionOption
+from orchestration.decision_cache import DecisionCache
+from orchestration.executors import AsyncTaskExecutor
+from orchestration.orchestrator import Orchestrator, Wave, ExecutionState
 
 
 @pytest.fixture
@@ -112,6 +119,97 @@ class TestApproveDecisionHandler:
         assert len(resumed_calls) > 0
 
 
+class TestApproveDecisionsHandler:
+    """Test approve_decisions batch WebSocket handler"""
+
+    @staticmethod
+    async def make_pending(engine, count):
+        options = [
+            DecisionOption(id="yes", label="Yes", description="Y", confidence=0.5),
+            DecisionOption(id="no", label="No", description="N", confidence=0.4)
+        ]
+        return await engine.request_decisions([(f"Question {i}?", options) for i in range(count)])
+
+    @pytest.mark.asyncio
+    async def test_batch_approval_single_confirmation(self, mock_emit, clean_decision_engine):
+        """A batch is confirmed with one decisions:approved and one execution:resumed"""
+        decisions = await self.make_pending(clean_decision_engine, 20)
+
+        await approve_decisions('test-sid', {'approvals': [
+            {'decision_id': d.id, 'selected_option_id': 'yes'} for d in decisions
+        ]})
+
+        events = [call[0][0] for call in mock_emit.call_args_list]
+        assert events == ['decisions:approved', 'execution:resumed']
+        payload = mock_emit.call_args_list[0][0][1]
+        assert payload['count'] == 20
+        assert mock_emit.call_args_list[0][1]['room'] == 'test-sid'
+        assert all(d.status == "approved" for d in decisions)
+        assert not clean_decision_engine.get_pending_decisions()
+
+    @pytest.mark.asyncio
+    async def test_batch_is_all_or_nothing(self, mock_emit, clean_decision_engine):
+        """One invalid approval leaves every decision pending"""
+        first, second = await self.make_pending(clean_decision_engine, 2)
+
+        await approve_decisions('test-sid', {'approvals': [
+            {'decision_id': first.id, 'selected_option_id': 'yes'},
+            {'decision_id': second.id, 'selected_option_id': 'maybe'}
+        ]})
+
+        error_calls = [call for call in mock_emit.call_args_list if call[0][0] == 'error']
+        assert error_calls[0][0][1]['code'] == 'DECISION_ERROR'
+        assert first.status == "pending" and second.status == "pending"
+
+    @pytest.mark.asyncio
+    async def test_batch_rejects_malformed_and_duplicate(self, mock_emit, clean_decision_engine):
+        first, = await self.make_pending(clean_decision_engine, 1)
+
+        await approve_decisions('test-sid', {})
+        await approve_decisions('test-sid', {'approvals': [{'decision_id': first.id}]})
+        await approve_decisions('test-sid', {'approvals': [
+            {'decision_id': first.id, 'selected_option_id': 'yes'},
+            {'decision_id': first.id, 'selected_option_id': 'no'}
+        ]})
+
+        codes = [call[0][1]['code'] for call in mock_emit.call_args_list if call[0][0] == 'error']
+        assert codes == ['INVALID_REQUEST'] * 3
+        assert first.status == "pending"
+
+    @pytest.mark.asyncio
+    async def test_emit_decision_requests_aggregates(self, mock_emit, clean_decision_engine):
+        decisions = await self.make_pending(clean_decision_engine, 3)
+
+        await emit_decision_requests([d.id for d in decisions] + ['missing'])
+
+        assert mock_emit.call_count == 1
+        event, payload = mock_emit.call_args_list[0][0]
+        assert event == 'decisions:requested'
+        assert [d['id'] for d in payload['decisions']] == [d.id for d in decisions]
+
+
+class TestDecisionMetricsHandler:
+    """Test request_decision_metrics WebSocket handler"""
+
+    @pytest.mark.asyncio
+    async def test_emits_metrics_to_requester(self, mock_emit, clean_decision_engine):
+        decision = await clean_decision_engine.request_decision(
+            question="Metrics?",
+            options=[DecisionOption(id="yes", label="Yes", description="Y", confidence=0.5)]
+        )
+        await approve_decision('test-sid', {'decision_id': decision.id, 'selected_option_id': 'yes'})
+        mock_emit.reset_mock()
+
+        await request_decision_metrics('test-sid')
+
+        event, payload = mock_emit.call_args_list[0][0]
+        assert event == 'decisions:metrics'
+        assert mock_emit.call_args_list[0][1]['room'] == 'test-sid'
+        assert payload['approved'] >= 1
+        assert payload['pending'] == 0
+        assert payload['time_to_decision']['count'] >= 1
+
+
 class TestDecisionEngineIntegration:
     """Test that WebSocket uses the decision engine correctly"""
 
@@ -121,3 +219,78 @@ class TestDecisionEngineIntegration:
         assert engine is not None
         assert hasattr(engine, 'request_decision')
         assert hasattr(engine, 'approve_decision')
+
+
+def waiting_orchestrator(selected, **kwargs):
+    """Orchestrator whose single wave waits for a decision, recording the selection"""
+    orchestrator = None
+
+    async def handler(task):
+        decision = await orchestrator._request_decision("Deploy?", [
+            DecisionOption(id="safe", label="Safe", description="Low risk", confidence=0.8),
+            DecisionOption(id="fast", label="Fast", description="Quick", confidence=0.5)
+        ])
+        selected.append(decision.selected_option_id)
+
+    orchestrator = Orchestrator(executors={"async": AsyncTaskExecutor(handler)},
+                                wait_for_decisions=True, **kwargs)
+    orchestrator.add_wave(Wave("deploy", "agent1", ["ask"]))
+    return orchestrator
+
+
+class TestOrchestratorDecisions:
+    """Test dashboard approvals of decisions a registered orchestrator waits on"""
+
+    @pytest.mark.asyncio
+    async def test_socket_approval_unblocks_waiting_wave(self, mock_emit, clean_decision_engine):
+        """A wave waiting on a decision completes once the dashboard approves it"""
+        selected = []
+        orchestrator = waiting_orchestrator(selected)
+        set_orchestrator(orchestrator)
+        try:
+            execution = asyncio.create_task(orchestrator.execute())
+            await asyncio.sleep(0.05)
+            pending = clean_decision_engine.get_pending_decisions()
+            assert len(pending) == 1 and not execution.done()
+
+            await approve_decision('test-sid', {'decision_id': pending[0].id,
+                                                'selected_option_id': 'fast'})
+            result = await asyncio.wait_for(execution, 1)
+        finally:
+            set_orchestrator(None)
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert selected == ["fast"]
+        assert clean_decision_engine.decision_metrics()["approved"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_configured_engine_is_kept_and_routed(self, mock_emit, clean_decision_engine):
+        """A run's own engine survives registration and receives its approvals"""
+        own_engine = DecisionEngine(max_resolved=10, cache=DecisionCache())
+        selected = []
+        orchestrator = waiting_orchestrator(selected, decision_engine=own_engine)
+        set_orchestrator(orchestrator, run_id="custom")
+        try:
+            assert orchestrator.decision_engine is own_engine
+            server_decision = await clean_decision_engine.request_decision("Other?", [
+                DecisionOption(id="yes", label="Yes", description="Y", confidence=0.5)])
+            execution = asyncio.create_task(orchestrator.execute())
+            await asyncio.sleep(0.05)
+
+            await request_pending_decisions('test-sid')
+            listed = mock_emit.call_args_list[-1][0][1]['decisions']
+            run_decision = own_engine.get_pending_decisions()[0]
+            assert {d['id'] for d in listed} == {server_decision.id, run_decision.id}
+
+            await approve_decisions('test-sid', {'approvals': [
+                {'decision_id': server_decision.id, 'selected_option_id': 'yes'},
+                {'decision_id': run_decision.id, 'selected_option_id': 'safe'}
+            ]})
+            result = await asyncio.wait_for(execution, 1)
+        finally:
+            set_orchestrator(None, run_id="custom")
+
+        assert result["state"] == ExecutionState.COMPLETED.value
+        assert selected == ["safe"]
+        assert server_decision.status == "approved"
+        assert len(own_engine.cache) == 1